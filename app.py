@@ -1,64 +1,138 @@
-"""Flask web app: crawl job sites, run JobScan comparisons, and render a reviewable report."""
+"""Flask web app: crawl job sites, run JobScan comparisons, and render a reviewable report.
+
+Runs execute in the background (run_queue.py); the UI polls their progress and opens
+the finished report by run ID.
+"""
 
 from __future__ import annotations
 
 import io
 import html
+import threading
+from contextlib import nullcontext
 from datetime import datetime
-from typing import List
+from typing import Dict, Iterator, List, Optional
 
-from flask import Flask, render_template, request, send_file
+from flask import (
+    Flask,
+    Response,
+    jsonify,
+    render_template,
+    request,
+    send_file,
+    stream_with_context,
+    url_for,
+)
 
-from config import RESUME_TEXT
-from orchestrator import crawl_all_sites, run_comparisons, ReportRow
+from blob_store import BLOB_STORE
+from browser_pool import warm_up as warm_browser_pool
+from config import BROWSER_POOL_WARMUP, PROFILE_RUNS, RESUME_TEXT
+import metrics
+from orchestrator import (
+    iter_report_rows,
+    merge_duplicate_rows,
+    stats_since,
+    stats_snapshot,
+    ReportRow,
+    RunProgress,
+)
+from profiling import BREAKDOWN_COLUMNS, RunProfile
+from run_queue import RUN_QUEUE, QueueFull
 
 
 app = Flask(__name__)
 app.config["MAX_CONTENT_LENGTH"] = 2 * 1024 * 1024  # 2MB max for any uploads (future-proofing)
 
+_warm_up_lock = threading.Lock()
+_warm_up_started = False
 
-def report_to_html(rows: List[ReportRow], resume_preview: str) -> str:
-    """Generate an HTML document suitable for human review."""
 
-    def esc(s: str) -> str:
-        return html.escape(str(s)) if s else ""
-
-    rows_html = []
-    for r in rows:
-        res = r.comparison_result
-        if res:
-            score = f"{res.match_score}%" if res.match_score is not None else "N/A"
-            summary = res.summary or ""
-            details = (res.details or "")[:3000]
-            if len((res.details or "")) > 3000:
-                details += "... [truncated]"
-            err = res.error or ""
-            job_link = f"<a href=\"{r.job_url}\">Link text</a>"
-        else:
-            score = "N/A"
-            summary = ""
-            details = ""
-            err = "No result"
-        rows_html.append(
-            f"""
-            <tr>
-                <td>{esc(r.job_title)}</td>
-                <td>{esc(r.company)}</td>
-                <td>{esc(r.source)}</td>
-                <td><a href="{{ job_link }}" target="_blank" rel="noopener noreferrer">{r.job_title}</a></td>
-                <td>{esc(score)}</td>
-                <td>{esc(summary)}</td>
-                <td><pre style="white-space:pre-wrap;max-height:200px;overflow:auto;">{esc(details)}</pre></td>
-                <td>{esc(err)}</td>
-            </tr>
-            """
+@app.before_request
+def warm_up_browser_pool() -> None:
+    """Start the browser pool in the background on the first request (BROWSER_POOL_WARMUP).
+
+    Done here rather than at import so it works under any server, while the debug
+    reloader's watcher process, which never serves requests, launches no browsers.
+    """
+
+    global _warm_up_started
+    if not BROWSER_POOL_WARMUP or _warm_up_started:
+        return
+    with _warm_up_lock:
+        if _warm_up_started:
+            return
+        _warm_up_started = True
+    threading.Thread(target=warm_browser_pool, name="browser-pool-warmup", daemon=True).start()
+
+
+def stats_to_html(stats: Dict[str, Dict[str, float]]) -> str:
+    """Render grouped run counters (cache hits, etc.) as small tables."""
+
+    parts = []
+    for group, values in stats.items():
+        cells = "".join(
+            f"<tr><td>{html.escape(str(k))}</td>"
+            f"<td>{round(v, 2) if isinstance(v, float) else html.escape(str(v))}</td></tr>"
+            for k, v in values.items()
         )
-    table_body = "\n".join(rows_html)
+        parts.append(f"<h3>{html.escape(group)}</h3><table class=\"stats\"><tbody>{cells}</tbody></table>")
+    return "\n".join(parts)
+
+
+def profile_to_html(profile: RunProfile) -> str:
+    """Render a profiled run: per-source seconds, hottest functions and hottest call paths."""
+
+    busy = max(1, sum(profile.busy.values()))
+    head = "".join(f"<th>{html.escape(c)} (s)</th>" for c in BREAKDOWN_COLUMNS)
+    sources = "".join(
+        f"<tr><td>{html.escape(source)}</td>"
+        + "".join(f"<td>{seconds[c]:.2f}</td>" for c in BREAKDOWN_COLUMNS)
+        + "</tr>"
+        for source, seconds in profile.breakdown().items()
+    )
+    hot = "".join(
+        f"<tr><td><code>{html.escape(name)}</code></td>"
+        f"<td>{own / busy:.1%}</td><td>{total / busy:.1%}</td></tr>"
+        for name, own, total in profile.hot_functions()
+    )
+    paths = "".join(
+        f"<li><code>{html.escape(path)}</code> ({n / busy:.1%})</li>" for path, n in profile.hot_stacks()
+    )
+    saved = (
+        f"Raw samples (folded stacks): <code>{html.escape(profile.path)}</code>"
+        if profile.path
+        else "Raw samples could not be saved."
+    )
+    return f"""<p class="meta">Wall time {profile.wall_seconds:.1f}s; {sum(profile.samples.values())} samples,
+    {profile.idle} idle. {saved}</p>
+    <h3>Time per source (seconds summed across threads)</h3>
+    <p class="meta">Process-wide: measured from the app's metrics while this run was going, so runs that
+    overlapped it are included.</p>
+    <table class="stats"><thead><tr><th>source</th>{head}</tr></thead><tbody>{sources}</tbody></table>
+    <h3>Hot functions (share of busy samples)</h3>
+    <table class="stats"><thead><tr><th>function</th><th>self</th><th>total</th></tr></thead>
+    <tbody>{hot}</tbody></table>
+    <h3>Hot call paths</h3>
+    <ul>{paths}</ul>"""
+
+
+def _esc(s) -> str:
+    return html.escape(str(s)) if s else ""
+
+
+def report_header_html(resume_preview: str, job_count: Optional[int] = None) -> str:
+    """Document head, resume preview and the opening of the results table.
+
+    ``job_count`` is omitted when streaming, where it is only known at the end.
+    """
+
+    generated = datetime.now().strftime('%Y-%m-%d %H:%M')
+    count = f" | Jobs analyzed: {job_count}" if job_count is not None else ""
     return f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
-    <title>Job Scan Report - {datetime.now().strftime('%Y-%m-%d %H:%M')}</title>
+    <title>Job Scan Report - {generated}</title>
     <style>
         body {{ font-family: system-ui, -apple-system, BlinkMacSystemFont, sans-serif; margin: 24px; background: #0f0f14; color: #e8e8ed; }}
         h1 {{ color: #e8e8ed; }}
@@ -68,12 +142,13 @@ def report_to_html(rows: List[ReportRow], resume_preview: str) -> str:
         th {{ background: #11111a; color: #8888a0; }}
         tr:nth-child(even) {{ background: #14141f; }}
         pre {{ font-size: 12px; margin: 0; color: #e8e8ed; }}
+        table.stats {{ width: auto; margin-bottom: 16px; }}
         .resume-preview {{ background: #11111a; padding: 16px; margin-bottom: 24px; max-height: 200px; overflow: auto; border: 1px solid #2a2a3a; }}
     </style>
 </head>
 <body>
     <h1>Job Scan Comparison Report</h1>
-    <p class="meta">Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')} | Jobs analyzed: {len(rows)}</p>
+    <p class="meta">Generated: {generated}{count}</p>
     <h2>Resume used for comparison</h2>
     <div class="resume-preview"><pre>{html.escape(resume_preview[:2000])}</pre></div>
     <h2>Results</h2>
@@ -91,48 +166,221 @@ def report_to_html(rows: List[ReportRow], resume_preview: str) -> str:
             </tr>
         </thead>
         <tbody>
-            {table_body}
+"""
+
+
+def report_row_html(r: ReportRow) -> str:
+    """One results-table row."""
+
+    res = r.comparison_result
+    capture = ""
+    also = "".join(
+        f'<br><a href="{html.escape(url, quote=True)}" target="_blank" rel="noopener noreferrer">'
+        f"also on {_esc(source)}</a>"
+        for source, url in r.also_listed
+    )
+    if res:
+        score = f"{res.match_score}%" if res.match_score is not None else "N/A"
+        summary = res.summary or ""
+        details = (res.details or "")[:3000]
+        if len((res.details or "")) > 3000:
+            details += "... [truncated]"
+        err = res.error or ""
+        # Raw JobScan page, served lazily from the blob store (keys are hex, safe to inline).
+        if res.raw_html_key:
+            capture = f' <a href="/debug/blobs/{res.raw_html_key}" target="_blank">(page capture)</a>'
+    else:
+        score = "N/A"
+        summary = ""
+        details = ""
+        err = "No result"
+    return f"""
+            <tr>
+                <td>{_esc(r.job_title)}</td>
+                <td>{_esc(r.company)}</td>
+                <td>{_esc(r.source)}{also}</td>
+                <td><a href="{html.escape(r.job_url, quote=True)}" target="_blank" rel="noopener noreferrer">{_esc(r.job_title)}</a></td>
+                <td>{_esc(score)}</td>
+                <td>{_esc(summary)}</td>
+                <td><pre style="white-space:pre-wrap;max-height:200px;overflow:auto;">{_esc(details)}</pre></td>
+                <td>{_esc(err)}{capture}</td>
+            </tr>
+            """
+
+
+def report_footer_html(
+    stats: Optional[Dict[str, Dict[str, float]]] = None,
+    job_count: Optional[int] = None,
+    message: str = "",
+    profile: Optional[RunProfile] = None,
+) -> str:
+    """Close the results table, then the optional job count, message, statistics and profile."""
+
+    count = f'<p class="meta">Jobs analyzed: {job_count}</p>' if job_count is not None else ""
+    note = f"<p>{html.escape(message)}</p>" if message else ""
+    stats_section = f"<h2>Run statistics</h2>\n{stats_to_html(stats)}" if stats else ""
+    profile_section = f"<h2>Profile</h2>\n{profile_to_html(profile)}" if profile else ""
+    return f"""
         </tbody>
     </table>
+    {count}
+    {note}
+    {stats_section}
+    {profile_section}
 </body>
 </html>
 """
 
 
+def report_to_html(
+    rows: List[ReportRow],
+    resume_preview: str,
+    stats: Optional[Dict[str, Dict[str, float]]] = None,
+    profile: Optional[RunProfile] = None,
+) -> str:
+    """Generate an HTML document suitable for human review."""
+
+    return (
+        report_header_html(resume_preview, job_count=len(rows))
+        + "\n".join(report_row_html(r) for r in rows)
+        + report_footer_html(stats, profile=profile)
+    )
+
+
 @app.route("/")
 def index():
     # UI uses the fixed resume text; user can override inline if desired.
     return render_template("index.html")
 
 
+NO_JOBS_MESSAGE = "No jobs found (sites may block automated requests). Try again later."
+
+
+def build_report(resume: str, progress: RunProgress, profile: bool = False) -> str:
+    """Crawl, compare and render the report; runs on a background run-queue worker."""
+
+    before = stats_snapshot()
+    with (RunProfile("run") if profile else nullcontext()) as run_profile:
+        rows = merge_duplicate_rows(list(iter_report_rows(resume, progress)))
+    if not rows:
+        return NO_JOBS_MESSAGE
+    progress.set_stage("report")
+    return report_to_html(
+        rows, resume_preview=resume[:3000], stats=stats_since(before), profile=run_profile
+    )
+
+
+def _profile_requested() -> bool:
+    """Profile every run (PROFILE_RUNS=1) or just this one (``profile=1`` in the request)."""
+
+    return PROFILE_RUNS or request.values.get("profile") == "1"
+
+
+def _enqueue(resume: str, profile: bool = False):
+    """Submit a run and answer 202 with its ID and polling URLs."""
+
+    try:
+        run = RUN_QUEUE.submit(lambda progress: build_report(resume, progress, profile))
+    except QueueFull as e:
+        return jsonify({"error": f"Too many runs queued: {e}"}), 429
+    body = run.to_dict()
+    body.update(
+        status_url=url_for("run_status", run_id=run.id),
+        report_url=url_for("run_report", run_id=run.id),
+        download_url=url_for("run_download", run_id=run.id),
+        cancel_url=url_for("run_cancel", run_id=run.id),
+    )
+    return jsonify(body), 202
+
+
+def _finished_report(run_id: str):
+    """The run's report HTML, or an error response if it is unknown or not done yet."""
+
+    run = RUN_QUEUE.get(run_id)
+    if run is None:
+        return None, (jsonify({"error": "Unknown run"}), 404)
+    if run.status != "done":
+        return None, (jsonify(run.to_dict()), 409)
+    return run.report_html, None
+
+
 @app.route("/run", methods=["POST"])
 def run_scan():
-    """Trigger crawl + JobScan and return an HTML report for human review."""
+    """Queue a crawl + compare run; returns its ID immediately (poll /runs/<id>)."""
 
     # Optional override of resume text from the form; fall back to fixed config.
     resume = (request.form.get("resume_text") or RESUME_TEXT).strip() or RESUME_TEXT
+    return _enqueue(resume, _profile_requested())
+
+
+def stream_report(resume: str, profile: bool = False) -> Iterator[str]:
+    """Yield the report in pieces: header first, then each row as its comparison finishes.
+
+    Rows are rendered and sent one at a time and never collected, so memory stays flat
+    however many jobs there are. Closing the generator (client disconnect) stops the run.
+    """
+
+    before = stats_snapshot()
+    progress = RunProgress()
+    yield report_header_html(resume[:3000])
+    count = 0
+    with (RunProfile("stream") if profile else nullcontext()) as run_profile:
+        for row in iter_report_rows(resume, progress):
+            count += not row.duplicate_of
+            yield report_row_html(row)
+    yield report_footer_html(
+        stats_since(before),
+        job_count=count,
+        message="" if count else NO_JOBS_MESSAGE,
+        profile=run_profile,
+    )
 
-    listings = crawl_all_sites()
-    if not listings:
-        return "No jobs found (sites may block automated requests). Try again later.", 200
 
-    rows = run_comparisons(listings, resume_text=resume)
+@app.route("/run/stream", methods=["GET", "POST"])
+def run_stream():
+    """Crawl + compare in this request, streaming the report as rows complete."""
 
-    html_doc = report_to_html(rows, resume_preview=resume[:3000])
-    return html_doc
+    resume = (request.values.get("resume_text") or RESUME_TEXT).strip() or RESUME_TEXT
+    return Response(
+        stream_with_context(stream_report(resume, _profile_requested())),
+        mimetype="text/html",
+        # Ask reverse proxies not to buffer, so each row reaches the browser immediately.
+        headers={"X-Accel-Buffering": "no", "Cache-Control": "no-cache"},
+    )
 
 
 @app.route("/download")
 def download_report():
-    """Run the scan and return an HTML file attachment."""
+    """Queue a run with the fixed resume; fetch the file from its download_url when done."""
+
+    return _enqueue(RESUME_TEXT, _profile_requested())
+
+
+@app.route("/runs/<run_id>")
+def run_status(run_id: str):
+    """Run status and per-stage progress (queries, descriptions, scans)."""
+
+    run = RUN_QUEUE.get(run_id)
+    if run is None:
+        return jsonify({"error": "Unknown run"}), 404
+    return jsonify(run.to_dict())
+
+
+@app.route("/runs/<run_id>/report")
+def run_report(run_id: str):
+    """HTML report of a finished run."""
+
+    html_doc, error = _finished_report(run_id)
+    return error or html_doc
 
-    resume = RESUME_TEXT
-    listings = crawl_all_sites()
-    if not listings:
-        return "No jobs found (sites may block automated requests). Try again later.", 200
-    rows = run_comparisons(listings, resume_text=resume)
 
-    html_doc = report_to_html(rows, resume_preview=resume[:3000])
+@app.route("/runs/<run_id>/download")
+def run_download(run_id: str):
+    """HTML report of a finished run as a file attachment."""
+
+    html_doc, error = _finished_report(run_id)
+    if error:
+        return error
     buf = io.BytesIO(html_doc.encode("utf-8"))
     return send_file(
         buf,
@@ -142,6 +390,34 @@ def download_report():
     )
 
 
+@app.route("/debug/blobs/<key>")
+def debug_blob(key: str):
+    """A stored page capture (e.g. a JobScan results page), as plain text for inspection."""
+
+    text = BLOB_STORE.get(key)
+    if text is None:
+        return jsonify({"error": "Unknown capture"}), 404
+    # Served as text so the captured third-party page never runs in this origin.
+    return Response(text, mimetype="text/plain")
+
+
+@app.route("/metrics")
+def metrics_endpoint():
+    """Crawl, browser and comparison metrics in Prometheus text format (for scraping)."""
+
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+
+@app.route("/runs/<run_id>/cancel", methods=["POST"])
+def run_cancel(run_id: str):
+    """Cancel a queued or running run; it stops at its next progress checkpoint."""
+
+    run = RUN_QUEUE.cancel(run_id)
+    if run is None:
+        return jsonify({"error": "Unknown run"}), 404
+    return jsonify(run.to_dict())
+
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000, debug=True)
 
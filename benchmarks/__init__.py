@@ -0,0 +1 @@
+"""Offline benchmarks against local stub servers; run ``python -m benchmarks.run``."""
@@ -0,0 +1,202 @@
+"""Offline benchmarks: crawler parsing, crawl_all_sites() and the pipelined run.
+
+Everything runs against the local stub servers (benchmarks/stub_server.py), so results
+are repeatable and no real site is contacted. Usage::
+
+    python -m benchmarks.run                        # print results
+    python -m benchmarks.run --save baseline.json   # store them as a baseline
+    python -m benchmarks.run --baseline baseline.json --fail-on-regression
+
+Metrics (lower is better unless noted):
+
+- ``parse.<Source>.<search|detail>_ms``: mean parse time per fixture page, including
+  ``--page-state-kb`` of generated inline page state (see benchmarks/stub_server.py)
+- ``crawl.seconds`` / ``crawl.listings_per_sec`` (higher is better) / ``crawl.peak_mb``
+- ``pipeline.seconds`` / ``pipeline.first_row_seconds`` / ``pipeline.rows_per_sec`` (higher
+  is better), with the local comparison backend
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict
+
+from benchmarks.stub_server import PAGE_STATE_KB
+
+HIGHER_IS_BETTER = ("listings_per_sec", "rows_per_sec")
+_SEARCH_PATHS = {
+    "indeed": "/jobs",
+    "linkedin": "/jobs/search-results/",
+    "builtin": "/jobs",
+    "google": "/search",
+}
+
+
+def _configure(args: argparse.Namespace) -> None:
+    """Isolate the run from local caches and politeness delays (before config is imported)."""
+
+    os.environ.update(
+        JOBSCAN_DATA_DIR=tempfile.mkdtemp(prefix="jobscan-bench-"),
+        CRAWL_RATE=str(args.rate),
+        HTTP_CACHE_ENABLED="0",
+        RESULT_CACHE_ENABLED="0",
+        JOB_INDEX_ENABLED="0",
+        BLOB_STORE_ENABLED="0",
+        BROWSER_POOL_WARMUP="0",
+        COMPARISON_BACKEND="local",
+        MAX_JOBS_TOTAL=str(args.max_jobs),
+        MAX_JOBS_PER_CATEGORY_PER_SITE=str(args.per_category),
+    )
+
+
+def bench_parse(repeat: int, page_state_kb: int) -> Dict[str, float]:
+    """Mean milliseconds to parse one fixture search / detail page per crawler."""
+
+    from benchmarks.stub_server import SITES, StubSite
+    from crawlers import CRAWLERS
+    from crawlers.base import JobListing
+
+    results = {}
+    for name in SITES:
+        crawler = CRAWLERS[name]
+        site = StubSite(name, pages=1, cards_per_page=15, page_state_kb=page_state_kb)
+        path = _SEARCH_PATHS[name]
+        _, search_html = site.render(path, "")
+        start = time.perf_counter()
+        for _ in range(repeat):
+            crawler._parse_page(search_html, "bench", path)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        results[f"parse.{crawler.source_name}.search_ms"] = elapsed_ms / repeat
+
+        if site.detail is None:
+            continue
+        _, detail_html = site.render("/viewjob" if name == "indeed" else "/job/x/1", "jk=1")
+        listing = JobListing("t", "c", "", "", crawler.source_name)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            crawler._parse_description(detail_html, listing)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        results[f"parse.{crawler.source_name}.detail_ms"] = elapsed_ms / repeat
+    return results
+
+
+def bench_crawl(memory: bool) -> Dict[str, float]:
+    """End-to-end crawl_all_sites(): wall time, throughput and (optionally) peak memory."""
+
+    from orchestrator import crawl_all_sites
+
+    start = time.perf_counter()
+    listings = crawl_all_sites()
+    seconds = time.perf_counter() - start
+    results = {
+        "crawl.seconds": seconds,
+        "crawl.listings": len(listings),
+        "crawl.listings_per_sec": len(listings) / seconds if seconds else 0.0,
+    }
+    if memory:
+        # Separate pass: tracemalloc slows allocation-heavy code, so it must not skew timing.
+        tracemalloc.start()
+        crawl_all_sites()
+        results["crawl.peak_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    return results
+
+
+def bench_pipeline() -> Dict[str, float]:
+    """Pipelined crawl + local comparisons: time to first row, total time, rows/sec."""
+
+    from config import RESUME_TEXT
+    from orchestrator import iter_pipeline
+
+    start = time.perf_counter()
+    first = None
+    rows = 0
+    for _ in iter_pipeline(RESUME_TEXT):
+        rows += 1
+        if first is None:
+            first = time.perf_counter() - start
+    seconds = time.perf_counter() - start
+    return {
+        "pipeline.seconds": seconds,
+        "pipeline.first_row_seconds": first or 0.0,
+        "pipeline.rows": rows,
+        "pipeline.rows_per_sec": rows / seconds if seconds else 0.0,
+    }
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], tolerance: float) -> bool:
+    """Print current vs. baseline; return True if any metric regressed beyond ``tolerance``."""
+
+    regressed = False
+    print(f"\n{'metric':40s} {'baseline':>12s} {'current':>12s} {'change':>9s}")
+    for key, value in results.items():
+        if key not in baseline or key.endswith((".listings", ".rows")):
+            continue
+        base = baseline[key]
+        change = (value - base) / base if base else 0.0
+        worse = -change if key.endswith(HIGHER_IS_BETTER) else change
+        flag = "  REGRESSION" if worse > tolerance else ""
+        regressed = regressed or bool(flag)
+        print(f"{key:40s} {base:12.3f} {value:12.3f} {change:+8.1%}{flag}")
+    return regressed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline crawler / orchestrator benchmarks.")
+    parser.add_argument("--latency", type=float, default=0.05, help="stub response delay (s)")
+    parser.add_argument("--pages", type=int, default=3, help="result pages per stub query")
+    parser.add_argument("--max-jobs", type=int, default=200, help="MAX_JOBS_TOTAL for the run")
+    parser.add_argument("--per-category", type=int, default=30,
+                        help="MAX_JOBS_PER_CATEGORY_PER_SITE")
+    parser.add_argument("--rate", type=float, default=0,
+                        help="CRAWL_RATE per stub host (0 = unlimited)")
+    parser.add_argument("--repeat", type=int, default=50, help="iterations per parse benchmark")
+    parser.add_argument("--page-state-kb", type=int, default=PAGE_STATE_KB,
+                        help="generated inline page state per stub page (KB, 0 = none)")
+    parser.add_argument("--skip", action="append", default=[],
+                        choices=["parse", "crawl", "pipeline"])
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--save", metavar="PATH", help="write results as JSON (e.g. a new baseline)")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved results file")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="allowed regression (0.15 = 15%%)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit 1 on any regression")
+    args = parser.parse_args(argv)
+    _configure(args)
+
+    from benchmarks.stub_server import StubServers
+    from crawlers import CRAWLERS
+
+    results: Dict[str, float] = {}
+    if "parse" not in args.skip:
+        results.update(bench_parse(args.repeat, args.page_state_kb))
+    with StubServers(latency=args.latency, pages=args.pages, page_state_kb=args.page_state_kb) as stubs:
+        for name, url in stubs.urls.items():
+            CRAWLERS[name].base_url = url
+        if "crawl" not in args.skip:
+            results.update(bench_crawl(memory=not args.no_memory))
+        if "pipeline" not in args.skip:
+            results.update(bench_pipeline())
+        results.update({f"requests.{name}": n for name, n in sorted(stubs.requests.items())})
+
+    for key, value in results.items():
+        print(f"{key:40s} {value:12.3f}")
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressed = compare(results, json.load(f), args.tolerance)
+        if regressed and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""Local stand-ins for Indeed, LinkedIn, BuiltIn and Google, rendered from saved fixtures.
+
+Each site gets its own ``ThreadingHTTPServer`` on 127.0.0.1 (so per-host pooling and
+rate limiting behave as in production) and answers the same URL shapes the crawlers
+request: paginated search pages filled with generated job cards, and detail pages with
+a generated description. Every response is delayed by ``latency`` seconds to mimic a
+remote site. Run this module directly to browse the stubs by hand.
+
+The fixtures are trimmed page skeletons: only the markup the crawlers read is kept.
+Real job-board pages also ship a large inline JSON bootstrap (``window.mosaic``,
+``__NEXT_DATA__`` and the like) that parsers must skip over, so each page's
+``$page_state`` placeholder is filled with ``page_state_kb`` kilobytes of generated,
+job-shaped JSON (see ``_page_state``). The padding is synthetic; parse times track
+how the crawlers scale with page weight, not what a specific live page costs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from string import Template
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+SITES = ("indeed", "linkedin", "builtin", "google")
+
+_WORDS = (
+    "python java go rust typescript react django flask fastapi aws gcp azure docker kubernetes "
+    "terraform postgres mysql redis kafka spark airflow graphql rest grpc microservices ci cd "
+    "observability latency scale reliability security testing mentoring design architecture "
+    "customers product roadmap ownership distributed systems data pipelines backend frontend"
+).split()
+_COMPANIES = ("Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Wonka", "Tyrell")
+
+# Default size of the generated inline page state, roughly what the real sites embed.
+PAGE_STATE_KB = 12
+
+
+def fixture(name: str) -> Template:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return Template(f.read())
+
+
+def _rng(*parts: object) -> random.Random:
+    seed = hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()
+    return random.Random(seed)
+
+
+def _job(job_id: str) -> Dict[str, str]:
+    """Deterministic fake posting for ``job_id``."""
+
+    rng = _rng(job_id)
+    level = rng.choice(["Senior ", "Staff ", "Lead ", ""])
+    title = f"{level}{rng.choice(['Backend', 'Python', 'Platform', 'Software'])} Engineer"
+    words = [rng.choice(_WORDS) for _ in range(320)]
+    return {
+        "id": job_id,
+        "slug": title.lower().replace(" ", "-"),
+        "title": title,
+        "company": rng.choice(_COMPANIES),
+        "snippet": " ".join(words[:25]),
+        "description": " ".join(words),
+    }
+
+
+def _page_state(site: str, path: str, kb: int) -> str:
+    """Inline ``<script>`` body of about ``kb`` kilobytes standing in for a site's bootstrap JSON."""
+
+    rng = _rng(site, path)
+    entries: List[Dict[str, object]] = []
+    size = 0
+    while size < kb * 1024:
+        entry = {
+            "id": f"{rng.getrandbits(48):012x}",
+            "company": rng.choice(_COMPANIES),
+            "tags": [rng.choice(_WORDS) for _ in range(8)],
+            "impressions": rng.randrange(10_000),
+            "tracking": {"pos": len(entries), "src": site, "exp": rng.random() < 0.5},
+        }
+        entries.append(entry)
+        size += len(json.dumps(entry))
+    return f"window.__PAGE_STATE__ = {json.dumps({'site': site, 'results': entries})};"
+
+
+class StubSite:
+    """Renders one site's search and detail pages from its fixtures."""
+
+    def __init__(self, site: str, pages: int, cards_per_page: int, page_state_kb: int = PAGE_STATE_KB):
+        self.site = site
+        self.pages = pages
+        self.cards_per_page = cards_per_page
+        self.page_state_kb = page_state_kb
+        self.search = fixture(f"{site}_search.html")
+        self.card = fixture(f"{site}_card.html")
+        detail = os.path.join(FIXTURES_DIR, f"{site}_detail.html")
+        self.detail = fixture(f"{site}_detail.html") if os.path.exists(detail) else None
+        self.base = ""
+
+    def _page(self, q: Dict[str, List[str]]) -> Tuple[str, int]:
+        """(search term, 0-based page number) of a search request."""
+
+        def first(key: str, default: str = "") -> str:
+            return q.get(key, [default])[0]
+
+        if self.site == "linkedin":
+            return first("keywords"), int(first("pageNum", "0"))
+        if self.site == "builtin":
+            return first("search"), int(first("page", "1")) - 1
+        return first("q"), int(first("start", "0")) // 10  # Indeed and Google
+
+    def render(self, path: str, query: str) -> Tuple[int, str]:
+        q = parse_qs(query)
+        state = _page_state(self.site, path, self.page_state_kb)
+        if self.site == "indeed" and path == "/viewjob":
+            return 200, self.detail.safe_substitute(_job(q.get("jk", [""])[0]), page_state=state)
+        if self.site == "builtin" and path.startswith("/job/"):
+            return 200, self.detail.safe_substitute(_job(path.rsplit("/", 1)[-1]), page_state=state)
+        if path in ("/jobs", "/jobs/search-results/", "/search"):
+            term, page = self._page(q)
+            cards = ""
+            if page < self.pages:
+                prefix = hashlib.sha1(f"{self.site}|{term}".encode()).hexdigest()[:8]
+                cards = "\n".join(
+                    self.card.safe_substitute(_job(f"{prefix}{page:03d}{i:03d}"), base=self.base)
+                    for i in range(self.cards_per_page)
+                )
+            return 200, self.search.safe_substitute(query=term, cards=cards, page_state=state)
+        return 404, "not found"
+
+
+def _handler(site: StubSite, latency: float, requests: Dict[str, int], lock: threading.Lock):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real sites
+
+        def do_GET(self):  # noqa: N802
+            time.sleep(latency)
+            parts = urlsplit(self.path)
+            status, body = site.render(parts.path, parts.query)
+            data = body.encode("utf-8")
+            with lock:
+                requests[site.site] = requests.get(site.site, 0) + 1
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):  # quiet
+            pass
+
+    return Handler
+
+
+class StubServers:
+    """One threaded stub server per site; use as a context manager."""
+
+    def __init__(self, latency: float = 0.05, pages: int = 3, cards_per_page: int = 15,
+                 page_state_kb: int = PAGE_STATE_KB):
+        self.latency = latency
+        self.pages = pages
+        self.cards_per_page = cards_per_page
+        self.page_state_kb = page_state_kb
+        self.urls: Dict[str, str] = {}
+        self.requests: Dict[str, int] = {}
+        self._servers: List[ThreadingHTTPServer] = []
+
+    def start(self) -> Dict[str, str]:
+        lock = threading.Lock()
+        for name in SITES:
+            site = StubSite(name, self.pages, self.cards_per_page, self.page_state_kb)
+            handler = _handler(site, self.latency, self.requests, lock)
+            server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+            server.daemon_threads = True
+            site.base = self.urls[name] = f"http://127.0.0.1:{server.server_address[1]}"
+            threading.Thread(target=server.serve_forever, daemon=True, name=f"stub-{name}").start()
+            self._servers.append(server)
+        return self.urls
+
+    def stop(self) -> None:
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+
+    def __enter__(self) -> "StubServers":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds added to every response")
+    parser.add_argument("--pages", type=int, default=3, help="result pages per query")
+    parser.add_argument("--cards", type=int, default=15, help="job cards per result page")
+    parser.add_argument("--page-state-kb", type=int, default=PAGE_STATE_KB,
+                        help="generated inline page state per page (KB, 0 = none)")
+    args = parser.parse_args()
+    with StubServers(args.latency, args.pages, args.cards, args.page_state_kb) as stubs:
+        for name, url in stubs.urls.items():
+            print(f"{name:9s} {url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Content-addressed, compressed on-disk store for large page captures.
+
+JobScan result pages can be hundreds of KB each. Instead of keeping them in memory on
+every result, they are written here once (key = SHA-256 of the text, body
+zlib-compressed) and loaded only when someone asks for them, e.g. via the
+``/debug/blobs/<key>`` endpoint. Identical captures share one file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import zlib
+from typing import Dict, Optional
+
+from config import BLOB_STORE_ENABLED, BLOB_STORE_PATH
+
+_KEY_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class BlobStore:
+    """Directory of ``<key[:2]>/<key>.z`` files, one per distinct capture."""
+
+    def __init__(self, path: str = BLOB_STORE_PATH, enabled: bool = BLOB_STORE_ENABLED):
+        self.path = path
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stats = {"stored": 0, "deduplicated": 0, "bytes_in": 0, "bytes_written": 0, "loaded": 0}
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], f"{key}.z")
+
+    def put(self, text: str) -> str:
+        """Store ``text`` and return its key ("" when empty or the store is disabled)."""
+
+        if not text or not self.enabled:
+            return ""
+        data = text.encode("utf-8")
+        key = hashlib.sha256(data).hexdigest()
+        path = self._file(key)
+        if os.path.exists(path):
+            with self._lock:
+                self._stats["deduplicated"] += 1
+            return key
+        body = zlib.compress(data, 6)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file and rename, so a concurrent reader never sees a partial blob.
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)
+        except OSError:
+            # Captures are for debugging only; never fail a scan because one can't be saved.
+            return ""
+        with self._lock:
+            self._stats["stored"] += 1
+            self._stats["bytes_in"] += len(data)
+            self._stats["bytes_written"] += len(body)
+        return key
+
+    def get(self, key: str) -> Optional[str]:
+        """The text stored under ``key``, or None if it is malformed or missing."""
+
+        if not _KEY_RE.match(key or ""):
+            return None
+        try:
+            with open(self._file(key), "rb") as f:
+                body = f.read()
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self._stats["loaded"] += 1
+        return zlib.decompress(body).decode("utf-8")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+
+BLOB_STORE = BlobStore()
@@ -0,0 +1,230 @@
+"""Long-lived Playwright browser pool shared by the LinkedIn crawler and JobScan client.
+
+Launching Chromium costs seconds, so instead of ``sync_playwright()`` per job we keep
+a small pool of browsers running. Playwright's sync API is bound to the thread that
+started it, so each pool slot is a worker thread owning one browser and its contexts/pages.
+Callers hand a function to :meth:`BrowserPool.run`; the next free slot runs it
+against its page (the "lease"), resets the page and takes the next task.
+
+A slot whose page crashed, closed or failed to reset gets a fresh context; a slot
+whose browser disconnected relaunches it. Every context routes its requests through a
+page_blocking.RequestBlocker, so pages skip images, fonts, media and trackers.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List, Optional, Set, TypeVar
+
+from config import BROWSER_HEADLESS, BROWSER_LEASE_TIMEOUT, BROWSER_POOL_SIZE
+from metrics import BROWSER_LAUNCH_SECONDS
+from page_blocking import RequestBlocker
+
+
+T = TypeVar("T")
+
+
+class _Slot:
+    """Browser plus one context/page per storage-state profile, owned by a worker thread.
+
+    Pages leased with a ``storage_state`` path start from the cookies and local storage
+    saved there, so logged-in sessions survive across jobs and runs.
+    """
+
+    def __init__(self, playwright, headless: bool):
+        self.playwright = playwright
+        self.headless = headless
+        self.browser = None
+        self.pages: Dict[Optional[str], Any] = {}
+        self.crashed: Set[Optional[str]] = set()
+        self.blocker = RequestBlocker()
+
+    def page_for_lease(self, storage_state: Optional[str] = None):
+        if self.browser is None or not self.browser.is_connected():
+            with BROWSER_LAUNCH_SECONDS.time():
+                self.browser = self.playwright.chromium.launch(headless=self.headless)
+            self.pages = {}
+            self.crashed = set()
+        page = self.pages.get(storage_state)
+        if storage_state in self.crashed or page is None or page.is_closed():
+            self.recycle_context(storage_state)
+            state = storage_state if storage_state and os.path.exists(storage_state) else None
+            context = self.browser.new_context(storage_state=state)
+            self.blocker.install(context)
+            page = context.new_page()
+            page.on("crash", lambda _page: self.crashed.add(storage_state))
+            self.pages[storage_state] = page
+        return page
+
+    def reset(self, storage_state: Optional[str] = None) -> None:
+        """Return the page to a blank state, or drop its context if that fails."""
+
+        page = self.pages.get(storage_state)
+        if storage_state in self.crashed or page is None or page.is_closed():
+            self.recycle_context(storage_state)
+            return
+        try:
+            page.goto("about:blank")
+        except Exception:
+            self.recycle_context(storage_state)
+
+    def recycle_context(self, storage_state: Optional[str] = None) -> None:
+        page = self.pages.pop(storage_state, None)
+        self.crashed.discard(storage_state)
+        if page is not None:
+            try:
+                page.context.close()
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        for storage_state in list(self.pages):
+            self.recycle_context(storage_state)
+        if self.browser is not None:
+            try:
+                self.browser.close()
+            except Exception:
+                pass
+        self.browser = None
+
+
+class BrowserPool:
+    """Bounded pool of Playwright pages, each driven by its own worker thread."""
+
+    def __init__(self, size: int = BROWSER_POOL_SIZE, headless: bool = BROWSER_HEADLESS):
+        self.size = max(1, size)
+        self.headless = headless
+        self._tasks: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._workers: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Launch every worker's browser and page (warm-up); safe to call repeatedly.
+
+        Raises ImportError when Playwright is not installed.
+        """
+
+        import playwright.sync_api  # noqa: F401
+
+        with self._lock:
+            if self._workers:
+                return
+            ready = []
+            for i in range(self.size):
+                started = threading.Event()
+                t = threading.Thread(
+                    target=self._worker, args=(started,), name=f"browser-pool-{i}", daemon=True
+                )
+                t.start()
+                self._workers.append(t)
+                ready.append(started)
+        for started in ready:
+            started.wait()
+
+    def run(
+        self,
+        fn: Callable[[Any], T],
+        timeout: Optional[float] = BROWSER_LEASE_TIMEOUT,
+        storage_state: Optional[str] = None,
+    ) -> T:
+        """Run ``fn(page)`` on a leased pool page and return its result.
+
+        ``storage_state`` selects a context seeded from that Playwright storage-state
+        file (when it exists). Exceptions raised by ``fn`` propagate to the caller.
+        """
+
+        self.start()
+        future: Future = Future()
+        self._tasks.put((fn, future, storage_state))
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            # Drop the task if no slot picked it up in time.
+            future.cancel()
+            raise
+
+    def shutdown(self) -> None:
+        """Close all browsers and stop the worker threads."""
+
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for _ in workers:
+            self._tasks.put(None)
+        for t in workers:
+            t.join(timeout=10)
+
+    def _worker(self, started: threading.Event) -> None:
+        from playwright.sync_api import sync_playwright
+
+        try:
+            with sync_playwright() as p:
+                slot = _Slot(p, self.headless)
+                try:
+                    slot.page_for_lease()
+                except Exception:
+                    # Warm-up failed (e.g. browsers not installed); retry on first lease.
+                    slot.close()
+                started.set()
+                try:
+                    self._serve(slot)
+                finally:
+                    slot.close()
+        except Exception as e:
+            # Playwright itself could not start: fail this slot's tasks instead of hanging.
+            started.set()
+            self._fail_tasks(e)
+
+    def _serve(self, slot: _Slot) -> None:
+        while True:
+            item = self._tasks.get()
+            if item is None:
+                return
+            fn, future, storage_state = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                slot.blocker.start_lease()
+                result = fn(slot.page_for_lease(storage_state))
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            slot.reset(storage_state)
+
+    def _fail_tasks(self, error: Exception) -> None:
+        while True:
+            item = self._tasks.get()
+            if item is None:
+                return
+            future = item[1]
+            if future.set_running_or_notify_cancel():
+                future.set_exception(error)
+
+
+_POOL: Optional[BrowserPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Process-wide browser pool, created on first use."""
+
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = BrowserPool()
+            atexit.register(_POOL.shutdown)
+        return _POOL
+
+
+def warm_up() -> bool:
+    """Start the shared pool's browsers ahead of the first job; False if unavailable."""
+
+    try:
+        get_browser_pool().start()
+        return True
+    except Exception:
+        return False
@@ -106,13 +106,162 @@ MAX_JOBS_PER_CATEGORY_PER_SITE = int(os.environ.get("MAX_JOBS_PER_CATEGORY_PER_S
 #MAX_JOBS_PER_CATEGORY_PER_SITE = int(os.environ.get("MAX_JOBS_PER_CATEGORY_PER_SITE", 5))
 MAX_JOBS_TOTAL = int(os.environ.get("MAX_JOBS_TOTAL", 100))
 #MAX_JOBS_TOTAL = int(os.environ.get("MAX_JOBS_TOTAL", 50))
+# Result pages followed per search; pages are only fetched while the caps above need more jobs.
+MAX_PAGES_PER_QUERY = int(os.environ.get("MAX_PAGES_PER_QUERY", 10))
+# Query planner: fold overlapping categories into fewer searches per site (OR-ing up to
+# QUERY_MERGE_MAX of them where the site supports boolean queries), skipping queries that
+# keep finding nothing new. 0 searches every category separately.
+QUERY_PLANNER_ENABLED = os.environ.get("QUERY_PLANNER_ENABLED", "1") == "1"
+QUERY_MERGE_MAX = int(os.environ.get("QUERY_MERGE_MAX", 3))
+# Identical search-page requests share one fetch; the page is reused for SEARCH_MEMO_TTL
+# seconds (0 = only coalesce concurrent requests), keeping at most SEARCH_MEMO_MAX_ENTRIES.
+SEARCH_MEMO_TTL = float(os.environ.get("SEARCH_MEMO_TTL", 300))
+SEARCH_MEMO_MAX_ENTRIES = int(os.environ.get("SEARCH_MEMO_MAX_ENTRIES", 64))
+
+# Number of sources crawled concurrently (1 = one site after another).
+CRAWL_WORKERS = int(os.environ.get("CRAWL_WORKERS", 4))
+
+# Threads fetching full descriptions for the deduped, capped listings.
+HYDRATE_WORKERS = int(os.environ.get("HYDRATE_WORKERS", 8))
+# Crawl engine: "threads" (requests, one worker per site) or "async" (httpx/HTTP2 on one event loop).
+CRAWL_ENGINE = os.environ.get("CRAWL_ENGINE", "threads").lower()
+# Max simultaneous connections held by the async HTTP client across all hosts.
+ASYNC_MAX_CONNECTIONS = int(os.environ.get("ASYNC_MAX_CONNECTIONS", 20))
+# Pipelined runs: search, hydration and comparison stages run at once, joined by bounded
+# queues. Searches use CRAWL_WORKERS and hydration HYDRATE_WORKERS threads.
+PIPELINE_ENABLED = os.environ.get("PIPELINE_ENABLED", "1") == "1"
+PIPELINE_QUEUE_SIZE = int(os.environ.get("PIPELINE_QUEUE_SIZE", 50))
+# Comparison workers (JobScan scans are also bounded by BROWSER_POOL_SIZE).
+COMPARE_WORKERS = int(os.environ.get("COMPARE_WORKERS", 2))
+# Descriptions scored together by the local backend when several are queued.
+COMPARE_BATCH_SIZE = int(os.environ.get("COMPARE_BATCH_SIZE", 25))
 
 # HTTP settings for crawlers.
 REQUEST_TIMEOUT = int(os.environ.get("REQUEST_TIMEOUT", 15))
 CRAWL_DELAY = float(os.environ.get("CRAWL_DELAY", 2.0))
+# Per-host token bucket: requests/second (defaults to one per CRAWL_DELAY; 0 = unlimited)
+# and how many requests may go out back-to-back before the rate applies.
+CRAWL_RATE = float(os.environ.get("CRAWL_RATE", 1.0 / CRAWL_DELAY if CRAWL_DELAY > 0 else 0))
+CRAWL_BURST = int(os.environ.get("CRAWL_BURST", 1))
+# Per-source overrides, e.g. CRAWL_RATE_INDEED=0.25 for one request every 4 seconds.
+CRAWL_RATE_PER_SOURCE = {
+    source: float(os.environ.get(f"CRAWL_RATE_{source.upper()}", CRAWL_RATE))
+    for source in ("indeed", "linkedin", "builtin", "google")
+}
+# Retries of crawler requests that hit a connection error, 429 or 5xx: exponential backoff
+# with jitter starting at FETCH_BACKOFF seconds, capped at FETCH_BACKOFF_MAX (Retry-After
+# headers are honoured up to the cap).
+FETCH_RETRIES = int(os.environ.get("FETCH_RETRIES", 2))
+FETCH_BACKOFF = float(os.environ.get("FETCH_BACKOFF", 1.0))
+FETCH_BACKOFF_MAX = float(os.environ.get("FETCH_BACKOFF_MAX", 30.0))
+# Per-source circuit breaker: after BREAKER_FAILURES consecutive failed or blocked requests
+# the source is skipped for BREAKER_COOLDOWN seconds, then probed with one request; each
+# failed probe doubles the cool-down, up to BREAKER_MAX_COOLDOWN.
+BREAKER_FAILURES = int(os.environ.get("BREAKER_FAILURES", 3))
+BREAKER_COOLDOWN = float(os.environ.get("BREAKER_COOLDOWN", 300))
+BREAKER_MAX_COOLDOWN = float(os.environ.get("BREAKER_MAX_COOLDOWN", 3600))
+# Max keep-alive connections held open per host by the shared crawler sessions.
+HTTP_POOL_MAXSIZE = int(os.environ.get("HTTP_POOL_MAXSIZE", 10))
+
+
+# Shared Playwright browser pool (LinkedIn descriptions and JobScan scans).
+# Each slot is one Chromium browser with a reusable page; slots are launched on the first request.
+BROWSER_POOL_SIZE = int(os.environ.get("BROWSER_POOL_SIZE", 2))
+BROWSER_POOL_WARMUP = os.environ.get("BROWSER_POOL_WARMUP", "1") == "1"
+BROWSER_HEADLESS = os.environ.get("BROWSER_HEADLESS", "1") == "1"
+# Seconds a caller waits for a free browser slot plus the work itself.
+BROWSER_LEASE_TIMEOUT = float(os.environ.get("BROWSER_LEASE_TIMEOUT", 180))
+# Request interception on pool pages: abort these resource types and requests to the deny-listed
+# (tracker) domains. BROWSER_BLOCK_THIRD_PARTY_SCRIPTS=1 (opt-in; it can break sign-in and
+# captcha providers) also aborts scripts from other sites than the page's unless their domain
+# is allow-listed. BROWSER_BLOCKING=0 loads everything.
+BROWSER_BLOCKING = os.environ.get("BROWSER_BLOCKING", "1") == "1"
+BROWSER_BLOCK_TYPES = [
+    t.strip()
+    for t in os.environ.get("BROWSER_BLOCK_TYPES", "image,media,font").split(",")
+    if t.strip()
+]
+BROWSER_BLOCK_THIRD_PARTY_SCRIPTS = os.environ.get("BROWSER_BLOCK_THIRD_PARTY_SCRIPTS", "0") == "1"
+BROWSER_DENY_DOMAINS = [
+    d.strip().lower()
+    for d in os.environ.get(
+        "BROWSER_DENY_DOMAINS",
+        "google-analytics.com,googletagmanager.com,doubleclick.net,googlesyndication.com,"
+        "facebook.net,hotjar.com,segment.io,segment.com,mixpanel.com,fullstory.com,"
+        "clarity.ms,bat.bing.com,ads.linkedin.com,snap.licdn.com,hs-analytics.net,intercom.io",
+    ).split(",")
+    if d.strip()
+]
+BROWSER_ALLOW_DOMAINS = [
+    d.strip().lower()
+    for d in os.environ.get("BROWSER_ALLOW_DOMAINS", "licdn.com,linkedin.com,jobscan.co").split(",")
+    if d.strip()
+]
+# Fraction of leases that run with nothing blocked, as a baseline for page-ready times.
+BROWSER_BLOCK_CONTROL = float(os.environ.get("BROWSER_BLOCK_CONTROL", 0))
+
+
+# Comparison engine: "local" (offline keyword scoring), "jobscan" (app.jobscan.co
+# via Playwright) or "none" (skip comparisons).
+COMPARISON_BACKEND = os.environ.get("COMPARISON_BACKEND", "local").lower()
+# Local scorer: vocabulary cap per description, and keywords listed in the match/gap details.
+LOCAL_SCORER_MAX_VOCAB = int(os.environ.get("LOCAL_SCORER_MAX_VOCAB", 5000))
+LOCAL_SCORER_TOP_KEYWORDS = int(os.environ.get("LOCAL_SCORER_TOP_KEYWORDS", 25))
 
 
 # Optional JobScan login (if required by the site).
 JOBSCAN_EMAIL = os.environ.get("JOBSCAN_EMAIL", "")
 JOBSCAN_PASSWORD = os.environ.get("JOBSCAN_PASSWORD", "")
 
+
+# Background runs: how many execute at once, how many may wait, and how many finished
+# runs (with their reports) are kept for polling.
+RUN_CONCURRENCY = int(os.environ.get("RUN_CONCURRENCY", 1))
+RUN_MAX_QUEUED = int(os.environ.get("RUN_MAX_QUEUED", 5))
+RUN_HISTORY = int(os.environ.get("RUN_HISTORY", 20))
+
+
+# Collapse the same posting found on several sites (MinHash similarity of descriptions).
+NEAR_DUP_ENABLED = os.environ.get("NEAR_DUP_ENABLED", "1") == "1"
+NEAR_DUP_THRESHOLD = float(os.environ.get("NEAR_DUP_THRESHOLD", 0.8))
+
+# HTML parser backend: "auto" (lxml if installed, else html.parser), "lxml" or "html.parser".
+HTML_PARSER = os.environ.get("HTML_PARSER", "auto")
+
+
+# Local state (saved sessions, caches) lives here.
+DATA_DIR = os.environ.get(
+    "JOBSCAN_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data")
+)
+# On-disk cache for job detail pages (fresh for HTTP_CACHE_TTL seconds, then revalidated).
+HTTP_CACHE_ENABLED = os.environ.get("HTTP_CACHE_ENABLED", "1") == "1"
+HTTP_CACHE_PATH = os.environ.get("HTTP_CACHE_PATH", os.path.join(DATA_DIR, "http_cache.sqlite3"))
+HTTP_CACHE_TTL = float(os.environ.get("HTTP_CACHE_TTL", 24 * 3600))
+HTTP_CACHE_MAX_BYTES = int(os.environ.get("HTTP_CACHE_MAX_BYTES", 200 * 1024 * 1024))
+# Comparison results keyed by hash(backend, resume, description); reruns skip unchanged pairs.
+RESULT_CACHE_ENABLED = os.environ.get("RESULT_CACHE_ENABLED", "1") == "1"
+RESULT_CACHE_PATH = os.environ.get("RESULT_CACHE_PATH", os.path.join(DATA_DIR, "results.sqlite3"))
+RESULT_CACHE_TTL = float(os.environ.get("RESULT_CACHE_TTL", 7 * 24 * 3600))
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get("RESULT_CACHE_MAX_ENTRIES", 5000))
+# Compressed, content-addressed page captures (JobScan result pages), loaded only on demand.
+BLOB_STORE_ENABLED = os.environ.get("BLOB_STORE_ENABLED", "1") == "1"
+BLOB_STORE_PATH = os.environ.get("BLOB_STORE_PATH", os.path.join(DATA_DIR, "blobs"))
+# Index of every posting seen, keyed by (source, job ID). Known postings reuse their stored
+# description for JOB_INDEX_DESCRIPTION_TTL seconds instead of refetching the detail page.
+JOB_INDEX_ENABLED = os.environ.get("JOB_INDEX_ENABLED", "1") == "1"
+JOB_INDEX_PATH = os.environ.get("JOB_INDEX_PATH", os.path.join(DATA_DIR, "job_index.sqlite3"))
+JOB_INDEX_DESCRIPTION_TTL = float(os.environ.get("JOB_INDEX_DESCRIPTION_TTL", 7 * 24 * 3600))
+# Only compare and report postings not seen in an earlier run.
+INCREMENTAL_NEW_ONLY = os.environ.get("INCREMENTAL_NEW_ONLY", "0") == "1"
+# Saved JobScan login (Playwright storage state: cookies + local storage), reused across runs.
+JOBSCAN_STORAGE_STATE = os.environ.get(
+    "JOBSCAN_STORAGE_STATE", os.path.join(DATA_DIR, "jobscan_storage_state.json")
+)
+
+# Profiled runs (PROFILE_RUNS=1 for every run, or profile=1 on a single request): stacks of
+# the run's threads are sampled every PROFILE_INTERVAL_MS and saved in folded format under
+# PROFILE_DIR; the PROFILE_TOP hottest functions are appended to the report.
+PROFILE_RUNS = os.environ.get("PROFILE_RUNS", "0") == "1"
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", 5))
+PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(DATA_DIR, "profiles"))
+PROFILE_TOP = int(os.environ.get("PROFILE_TOP", 20))
@@ -2,18 +2,50 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
+import random
+import threading
 import time
+import weakref
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 
-from config import REQUEST_TIMEOUT, CRAWL_DELAY
+from config import (
+    ASYNC_MAX_CONNECTIONS,
+    FETCH_BACKOFF,
+    FETCH_BACKOFF_MAX,
+    FETCH_RETRIES,
+    HTTP_CACHE_ENABLED,
+    HTTP_POOL_MAXSIZE,
+    JOB_INDEX_ENABLED,
+    MAX_PAGES_PER_QUERY,
+    REQUEST_TIMEOUT,
+)
+from crawlers.circuit_breaker import CIRCUIT_BREAKERS, CircuitOpen
+from crawlers.http_cache import HTTP_CACHE, CacheEntry
+from crawlers.parsing import Subtrees, parse
+from crawlers.query_planner import SEARCH_FLIGHTS, request_key
+from crawlers.rate_limit import RATE_LIMITER
+from job_index import JOB_INDEX
+from metrics import (
+    FETCH_BACKOFF_SECONDS,
+    HTTP_FETCH_SECONDS,
+    LISTINGS_FAILED,
+    RATE_LIMIT_WAIT_SECONDS,
+)
 
 
-@dataclass
+log = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
 class JobListing:
     """Single job listing with fields needed for JobScan and reporting."""
 
@@ -22,28 +54,327 @@ class JobListing:
     description: str
     url: str
     source: str  # indeed, linkedin, builtin, google
+    # False for placeholders ("unavailable", "no results") and stubs with nothing to fetch.
+    needs_description: bool = True
+    # True once the full description came from a detail page (or the job index), not a
+    # fallback to the search-card snippet.
+    described: bool = False
+    # True for the "unavailable" / "no results" stand-ins a search yields instead of jobs.
+    placeholder: bool = False
+    # (source, url) of near-duplicate postings on other sites (see near_duplicates.py).
+    also_listed: List[Tuple[str, str]] = field(default_factory=list)
+
+
+_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# One keep-alive session per host, shared by every crawler and thread in the process.
+_SESSIONS: Dict[str, requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def _session(url: str) -> requests.Session:
+    """Shared requests session for the host of ``url``, with browser-like headers.
+
+    Sessions are created once per host and reused, so repeated search and detail
+    requests to the same site ride on already-open TCP/TLS connections.
+    """
+
+    host = _host(url)
+    with _SESSIONS_LOCK:
+        s = _SESSIONS.get(host)
+        if s is None:
+            s = requests.Session()
+            s.headers.update(_HEADERS)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_MAXSIZE)
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            _SESSIONS[host] = s
+    return s
+
+
+def _throttle(url: str, source: str = "") -> float:
+    """Wait until the host of ``url`` has rate-limit budget; return seconds waited."""
+
+    host = _host(url)
+    waited = RATE_LIMITER.acquire(host, source)
+    RATE_LIMIT_WAIT_SECONDS.observe(waited, source=source or "other", host=host)
+    return waited
+
+
+def _observe_fetch(source: str, start: float, outcome: str) -> None:
+    HTTP_FETCH_SECONDS.observe(time.perf_counter() - start, source=source or "other", outcome=outcome)
+
+
+class Blocked(Exception):
+    """The site answered with a block status or a bot-challenge page."""
+
+
+# Worth retrying after a pause; 403 and challenge pages are not (retrying a block
+# only makes it stick), but they do count against the source's circuit breaker.
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+_BLOCK_STATUSES = {403, 999}  # 999: LinkedIn's "request denied"
+# Bot-challenge interstitials served with a 200 (Cloudflare, PerimeterX, DataDome, Google).
+_CHALLENGE_MARKERS = ("cf-chl-", "px-captcha", "captcha-delivery.com", "/sorry/index")
+
+
+def _outcome(resp) -> str:
+    """"ok", "retry" (429 / 5xx) or "blocked" for a requests or httpx response."""
+
+    status = resp.status_code
+    if status in _RETRY_STATUSES:
+        return "retry"
+    if status in _BLOCK_STATUSES:
+        return "blocked"
+    if status == 200:
+        # Interstitials are small; only the start of a real page needs checking.
+        head = f"{resp.url} {resp.text[:65536]}".lower()
+        if any(marker in head for marker in _CHALLENGE_MARKERS):
+            return "blocked"
+    return "ok"
+
+
+def _backoff(attempt: int, resp, source: str = "") -> float:
+    """Seconds before retry ``attempt`` + 1: exponential with jitter, or the server's Retry-After.
+
+    The delay is recorded in FETCH_BACKOFF_SECONDS, since the caller sleeps for all of it.
+    """
+
+    delay = min(FETCH_BACKOFF_MAX, FETCH_BACKOFF * 2**attempt)
+    delay = delay / 2 + random.uniform(0, delay / 2)
+    retry_after = resp.headers.get("Retry-After", "") if resp is not None else ""
+    if retry_after.isdigit():
+        delay = max(delay, min(FETCH_BACKOFF_MAX, float(retry_after)))
+    FETCH_BACKOFF_SECONDS.observe(delay, source=source or "other")
+    return delay
+
+
+def _settle(url: str, cache: bool, entry: Optional[CacheEntry], resp, outcome: str) -> str:
+    if outcome == "blocked":
+        raise Blocked(f"{_host(url)} answered {resp.status_code} with a block or challenge page")
+    return _cache_response(url, cache, entry, resp)
+
+
+def _fetch(
+    url: str, params: Optional[dict] = None, source: str = "", cache: bool = False
+) -> str:
+    """GET ``url`` on the shared session for its host and return the body text.
+
+    With ``cache=True`` (detail pages) the on-disk HTTP cache is consulted first:
+    fresh entries skip the network, stale ones are revalidated conditionally.
+    Connection errors, 429 and 5xx are retried up to FETCH_RETRIES times with
+    backoff. Blocks and exhausted retries count against the source's circuit breaker;
+    while it is open, requests fail at once with CircuitOpen.
+    """
+
+    entry = _cached(url, cache)
+    if entry is not None and entry.fresh:
+        HTTP_CACHE.record_hit()
+        return entry.body
+    headers = entry.conditional_headers() if entry is not None else None
+
+    breaker = CIRCUIT_BREAKERS.get(source or _host(url))
+    breaker.before_request()
+    outcome = "retry"
+    resp = None
+    error: Optional[Exception] = None
+    try:
+        for attempt in range(FETCH_RETRIES + 1):
+            if attempt:
+                breaker.record_retry()
+                time.sleep(_backoff(attempt - 1, resp, source))
+            _throttle(url, source)
+            start = time.perf_counter()
+            try:
+                resp = _session(url).get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
+            except Exception as e:
+                _observe_fetch(source, start, "error")
+                resp, error = None, e
+                continue
+            _observe_fetch(source, start, str(resp.status_code))
+            outcome = _outcome(resp)
+            if outcome != "retry":
+                break
+    finally:
+        breaker.record(ok=outcome == "ok")
+    if resp is None:
+        raise error
+    return _settle(url, cache, entry, resp, outcome)
+
+
+def _cached(url: str, cache: bool) -> Optional[CacheEntry]:
+    if not (cache and HTTP_CACHE_ENABLED):
+        return None
+    entry = HTTP_CACHE.get(url)
+    if entry is None:
+        HTTP_CACHE.record_miss()
+    return entry
+
+
+def _cache_response(url: str, cache: bool, entry: Optional[CacheEntry], resp) -> str:
+    """Handle a 304 or store the body; ``resp`` is a requests or httpx response."""
+
+    if resp.status_code == 304 and entry is not None:
+        HTTP_CACHE.revalidated(url)
+        return entry.body
+    resp.raise_for_status()
+    if cache and HTTP_CACHE_ENABLED:
+        if entry is not None:
+            # Stale entry whose page changed: counts as a miss.
+            HTTP_CACHE.record_miss()
+        HTTP_CACHE.store(url, resp.text, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+    return resp.text
+
 
+# One async client per event loop; httpx clients cannot be shared across loops.
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, object]" = (
+    weakref.WeakKeyDictionary()
+)
 
-def _session() -> requests.Session:
-    """Requests session with browser-like headers to reduce blocking."""
 
-    s = requests.Session()
-    s.headers.update(
-        {
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
+def _async_client():
+    """HTTP/2-capable httpx client for the running event loop, or None without httpx."""
+
+    try:
+        import httpx
+    except ImportError:
+        return None
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None:
+        try:
+            import h2  # noqa: F401
+
+            http2 = True
+        except ImportError:
+            http2 = False
+        client = httpx.AsyncClient(
+            headers=_HEADERS,
+            http2=http2,
+            timeout=REQUEST_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=ASYNC_MAX_CONNECTIONS,
             ),
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
+        )
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+
+async def _afetch(
+    url: str, params: Optional[dict] = None, source: str = "", cache: bool = False
+) -> str:
+    """Async counterpart of :func:`_fetch`; requests to one host share an HTTP/2 connection."""
+
+    client = _async_client()
+    if client is None:
+        # httpx not installed; run the blocking fetch off the event loop instead.
+        return await asyncio.to_thread(_fetch, url, params, source, cache)
+
+    entry = _cached(url, cache)
+    if entry is not None and entry.fresh:
+        HTTP_CACHE.record_hit()
+        return entry.body
+    headers = entry.conditional_headers() if entry is not None else None
+
+    host = _host(url)
+    breaker = CIRCUIT_BREAKERS.get(source or host)
+    breaker.before_request()
+    outcome = "retry"
+    resp = None
+    error: Optional[Exception] = None
+    try:
+        for attempt in range(FETCH_RETRIES + 1):
+            if attempt:
+                breaker.record_retry()
+                await asyncio.sleep(_backoff(attempt - 1, resp, source))
+            waited = await RATE_LIMITER.acquire_async(host, source)
+            RATE_LIMIT_WAIT_SECONDS.observe(waited, source=source or "other", host=host)
+            start = time.perf_counter()
+            try:
+                resp = await client.get(url, params=params, headers=headers)
+            except Exception as e:
+                _observe_fetch(source, start, "error")
+                resp, error = None, e
+                continue
+            _observe_fetch(source, start, str(resp.status_code))
+            outcome = _outcome(resp)
+            if outcome != "retry":
+                break
+    finally:
+        breaker.record(ok=outcome == "ok")
+    if resp is None:
+        raise error
+    return _settle(url, cache, entry, resp, outcome)
+
+
+async def close_async_client() -> None:
+    """Close the httpx client bound to the running event loop, if one was created."""
+
+    client = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def session_stats() -> Dict[str, Dict[str, int]]:
+    """Per-host counters: requests sent, connections opened, and connections reused."""
+
+    with _SESSIONS_LOCK:
+        sessions = list(_SESSIONS.items())
+    stats: Dict[str, Dict[str, int]] = {}
+    for host, s in sessions:
+        pools = s.get_adapter("https://").poolmanager.pools
+        requests_sent = 0
+        connections = 0
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            requests_sent += pool.num_requests
+            connections += pool.num_connections
+        stats[host] = {
+            "requests": requests_sent,
+            "connections": connections,
+            "reused": max(0, requests_sent - connections),
         }
-    )
-    return s
+    return stats
+
+
+def _record_failure(source: str, stage: str, what: str, e: Exception) -> None:
+    """Count and log a crawler error that is handled by falling back (placeholder, snippet).
+
+    Requests skipped by an open circuit breaker are expected and logged at debug level.
+    """
+
+    LISTINGS_FAILED.inc(source=source, stage=stage)
+    level = logging.DEBUG if isinstance(e, CircuitOpen) else logging.WARNING
+    log.log(level, "%s %s failed: %s", source, what, e)
+
+
+def _placeholders(listings: List[JobListing]) -> List[JobListing]:
+    """Mark a search's stand-in listings so callers can tell them from real results."""
+
+    for job in listings:
+        job.placeholder = True
+    return listings
 
 
-def _soup(html: str) -> BeautifulSoup:
-    return BeautifulSoup(html, "html.parser")
+def _soup(html: str, label: str = "", only: Optional[Subtrees] = None) -> BeautifulSoup:
+    """Parse a page (see crawlers.parsing); ``only`` limits the tree to the needed subtrees."""
+
+    return parse(html, label, only)
 
 
 def _text(elem) -> str:
@@ -52,22 +383,154 @@ def _text(elem) -> str:
     return " ".join(elem.get_text(strip=True).split())
 
 
-def _delay():
-    time.sleep(CRAWL_DELAY)
-
-
 class BaseCrawler(ABC):
-    """Abstract base for site-specific crawlers."""
+    """Abstract base for site-specific crawlers.
+
+    Sites implement :meth:`_page_request` and :meth:`_parse_page`; :meth:`search` and
+    :meth:`async_search` turn them into lazy, paginated listing streams.
+    """
 
     source_name: str = "base"
+    # Scheme and host requests go to; override per instance to point a crawler at a
+    # local stub server (see benchmarks/).
+    base_url: str = ""
+    # The site's search understands `"a" OR "b"`, so the query planner may merge queries.
+    boolean_or: bool = False
+
+    def combined_query(self, queries: List[str]) -> str:
+        """One search matching any of ``queries`` (only used when ``boolean_or`` is set)."""
+        return " OR ".join(f'"{q}"' for q in queries)
 
     @abstractmethod
-    def search(self, query: str, max_results: int) -> List[JobListing]:
-        """Search for jobs and return a list of JobListing."""
+    def _page_request(self, query: str, page: int) -> Tuple[str, Optional[Dict[str, str]]]:
+        """URL and query params of result page ``page`` (0-based) for ``query``."""
         raise NotImplementedError
 
+    @abstractmethod
+    def _parse_page(self, html: str, query: str, url: str) -> List[JobListing]:
+        """Listing stubs on one result page."""
+        raise NotImplementedError
+
+    def _unavailable(self, url: str, e: Exception) -> List[JobListing]:
+        """Placeholder listings when the first result page cannot be fetched."""
+        return []
+
+    def _no_results(self, query: str, url: str) -> List[JobListing]:
+        """Placeholder listings when the first result page has no jobs."""
+        return []
+
+    def _fresh(self, listings: List[JobListing], seen: Set[str]) -> List[JobListing]:
+        """Listings whose job ID has not been yielded for this query yet."""
+        fresh = []
+        for job in listings:
+            key = self.job_id(job)
+            if key not in seen:
+                seen.add(key)
+                fresh.append(job)
+        return fresh
+
+    def search(self, query: str, max_results: int) -> Iterator[JobListing]:
+        """Lazily yield up to ``max_results`` JobListing stubs for ``query``.
+
+        The next result page (up to MAX_PAGES_PER_QUERY) is requested only once the
+        caller has consumed the current one, so a caller that stops early never
+        over-fetches. Paging stops at the first page with nothing new. Stubs carry the
+        search-card snippet only; full descriptions are hydrated later.
+        """
+        seen: Set[str] = set()
+        remaining = max_results
+        for page in range(MAX_PAGES_PER_QUERY):
+            if remaining <= 0:
+                return
+            url, params = self._page_request(query, page)
+            try:
+                html = SEARCH_FLIGHTS.fetch(
+                    request_key(url, params),
+                    self.source_name,
+                    lambda: _fetch(url, params=params, source=self.source_name),
+                )
+            except Exception as e:
+                _record_failure(self.source_name, "search", f"search {query!r} page {page + 1}", e)
+                if page == 0:
+                    yield from _placeholders(self._unavailable(url, e))
+                return
+            fresh = self._fresh(self._parse_page(html, query, url), seen)
+            if not fresh:
+                if page == 0:
+                    yield from _placeholders(self._no_results(query, url))
+                return
+            yield from fresh[:remaining]
+            remaining -= len(fresh)
+
     @abstractmethod
     def fetch_description(self, listing: JobListing) -> str:
         """Fetch full job description for a listing (if not already in listing)."""
         raise NotImplementedError
 
+    def job_id(self, listing: JobListing) -> str:
+        """Stable identifier for a posting within this source (defaults to its URL)."""
+        return listing.url
+
+    def _known_description(self, listing: JobListing) -> Optional[str]:
+        if not JOB_INDEX_ENABLED:
+            return None
+        return JOB_INDEX.description(self.source_name, self.job_id(listing))
+
+    def hydrate(self, listing: JobListing) -> None:
+        """Fill in the full description, reusing the job index instead of refetching."""
+        if not listing.needs_description:
+            return
+        known = self._known_description(listing)
+        self._set_description(listing, known, known or self.fetch_description(listing))
+
+    @staticmethod
+    def _set_description(listing: JobListing, known: Optional[str], full_desc: str) -> None:
+        # Fetchers fall back to the snippet on failure; that must not count as described.
+        if known or (full_desc and full_desc != listing.description):
+            listing.described = True
+        if full_desc:
+            listing.description = full_desc
+
+    async def async_hydrate(self, listing: JobListing) -> None:
+        """Async variant of :meth:`hydrate`."""
+        if not listing.needs_description:
+            return
+        known = self._known_description(listing)
+        self._set_description(
+            listing, known, known or await self.async_fetch_description(listing)
+        )
+
+    async def async_search(self, query: str, max_results: int) -> AsyncIterator[JobListing]:
+        """Async variant of :meth:`search`; pages are fetched with the shared httpx client."""
+        seen: Set[str] = set()
+        remaining = max_results
+        for page in range(MAX_PAGES_PER_QUERY):
+            if remaining <= 0:
+                return
+            url, params = self._page_request(query, page)
+            try:
+                html = await SEARCH_FLIGHTS.afetch(
+                    request_key(url, params),
+                    self.source_name,
+                    lambda: _afetch(url, params=params, source=self.source_name),
+                )
+            except Exception as e:
+                _record_failure(self.source_name, "search", f"search {query!r} page {page + 1}", e)
+                if page == 0:
+                    for job in _placeholders(self._unavailable(url, e)):
+                        yield job
+                return
+            fresh = self._fresh(self._parse_page(html, query, url), seen)
+            if not fresh:
+                if page == 0:
+                    for job in _placeholders(self._no_results(query, url)):
+                        yield job
+                return
+            for job in fresh[:remaining]:
+                yield job
+            remaining -= len(fresh)
+
+    async def async_fetch_description(self, listing: JobListing) -> str:
+        """Async description fetch. Defaults to fetch_description() in a worker thread."""
+        return await asyncio.to_thread(self.fetch_description, listing)
+
@@ -1,39 +1,62 @@
 """BuiltIn.com job crawler."""
 
+from typing import List
 from urllib.parse import urljoin
 
-from crawlers.base import BaseCrawler, JobListing, _session, _soup, _text, _delay
-from config import REQUEST_TIMEOUT
+from crawlers.base import BaseCrawler, JobListing, _afetch, _fetch, _record_failure, _soup, _text
+from crawlers.parsing import Subtrees, class_contains
+
+
+# BuiltIn has regional sites, but the main /jobs search is usually enough.
+BASE_URL = "https://builtin.com/jobs"
+
+# Superset of the card / description fallback selectors below.
+_CARDS = Subtrees(
+    lambda name, attrs: class_contains(attrs, "job")
+    or (name == "a" and "/job/" in (attrs.get("href") or ""))
+)
+_DESCRIPTION = Subtrees(
+    lambda name, attrs: class_contains(attrs, "description") or name == "main"
+)
 
 
 class BuiltInCrawler(BaseCrawler):
     source_name = "BuiltIn"
+    base_url = "https://builtin.com"
 
-    def search(self, query: str, max_results: int):
-        # BuiltIn has regional sites, but the main /jobs search is usually enough.
-        base_url = "https://builtin.com/jobs"
-        listings = []
-        session = _session()
-        try:
-            resp = session.get(
-                base_url,
-                params={"search": query},
-                timeout=REQUEST_TIMEOUT,
+    def _page_request(self, query: str, page: int):
+        params = {"search": query}
+        if page:
+            params["page"] = str(page + 1)  # BuiltIn pages are 1-based
+        return f"{self.base_url}/jobs", params
+
+    def _unavailable(self, url: str, e: Exception) -> List[JobListing]:
+        return [
+            JobListing(
+                title="(BuiltIn unavailable)",
+                company="",
+                description=f"Error: {e}",
+                url=BASE_URL,
+                source=self.source_name,
+                needs_description=False,
             )
-            resp.raise_for_status()
-            _delay()
-        except Exception as e:
-            return [
-                JobListing(
-                    title="(BuiltIn unavailable)",
-                    company="",
-                    description=f"Error: {e}",
-                    url=base_url,
-                    source=self.source_name,
-                )
-            ]
+        ]
+
+    def _no_results(self, query: str, url: str) -> List[JobListing]:
+        return [
+            JobListing(
+                title=f"BuiltIn: {query}",
+                company="",
+                description="No results or page structure changed. Visit builtin.com/jobs.",
+                url=BASE_URL,
+                source=self.source_name,
+                needs_description=False,
+            )
+        ]
 
-        soup = _soup(resp.text)
+    def _parse_page(self, html: str, query: str, url: str) -> List[JobListing]:
+        listings = []
+        soup = _soup(html, "BuiltIn.search", _CARDS)
         cards = (
             soup.select(".job-row")
             or soup.select("article.job")
@@ -41,7 +64,7 @@ class BuiltInCrawler(BaseCrawler):
             or soup.select("a[href*='/job/']")
         )
         seen_urls = set()
-        for card in cards[: max_results * 2]:
+        for card in cards:
             link = card if card.name == "a" else card.select_one(
                 "a[href*='/job/'], a[href*='/jobs/']"
             )
@@ -51,49 +74,26 @@ class BuiltInCrawler(BaseCrawler):
             if href in seen_urls:
                 continue
             seen_urls.add(href)
-            full_url = urljoin("https://builtin.com/", href)
+            full_url = urljoin(self.base_url + "/", href)
             title_el = card.select_one("h2, .title, .job-title, [class*='title']")
             company_el = card.select_one(".company, .company-name, [class*='company']")
             title = _text(title_el) or "Job"
             company = _text(company_el) or "Company"
             desc_el = card.select_one(".description, .snippet, [class*='description']")
             desc = _text(desc_el)
-            listing = JobListing(
-                title=title,
-                company=company,
-                description=desc,
-                url=full_url,
-                source=self.source_name,
-            )
-            if len(listings) < max_results:
-                full_desc = self.fetch_description(listing)
-                if full_desc:
-                    listing.description = full_desc
-                listings.append(listing)
-
-        if not listings:
             listings.append(
                 JobListing(
-                    title=f"BuiltIn: {query}",
-                    company="",
-                    description="No results or page structure changed. Visit builtin.com/jobs.",
-                    url=base_url,
+                    title=title,
+                    company=company,
+                    description=desc,
+                    url=full_url,
                     source=self.source_name,
                 )
             )
         return listings
 
-    def fetch_description(self, listing: JobListing) -> str:
-        if not listing.url:
-            return listing.description
-        session = _session()
-        try:
-            resp = session.get(listing.url, timeout=REQUEST_TIMEOUT)
-            resp.raise_for_status()
-            _delay()
-        except Exception:
-            return listing.description
-        soup = _soup(resp.text)
+    def _parse_description(self, html: str, listing: JobListing) -> str:
+        soup = _soup(html, "BuiltIn.detail", _DESCRIPTION)
         desc_el = (
             soup.select_one(".job-description")
             or soup.select_one("[class*='description']")
@@ -103,3 +103,22 @@ class BuiltInCrawler(BaseCrawler):
             return _text(desc_el)
         return listing.description
 
+    def fetch_description(self, listing: JobListing) -> str:
+        if not listing.url:
+            return listing.description
+        try:
+            html = _fetch(listing.url, source=self.source_name, cache=True)
+        except Exception as e:
+            _record_failure(self.source_name, "description", listing.url, e)
+            return listing.description
+        return self._parse_description(html, listing)
+
+    async def async_fetch_description(self, listing: JobListing) -> str:
+        if not listing.url:
+            return listing.description
+        try:
+            html = await _afetch(listing.url, source=self.source_name, cache=True)
+        except Exception as e:
+            _record_failure(self.source_name, "description", listing.url, e)
+            return listing.description
+        return self._parse_description(html, listing)
@@ -0,0 +1,131 @@
+"""Per-source circuit breakers for crawler requests.
+
+A site that blocks us (403, 429, a CAPTCHA page) or keeps timing out fails every
+request the same way, so each further request only costs time. After
+BREAKER_FAILURES consecutive failures a source's breaker opens: its requests fail
+immediately with :class:`CircuitOpen` for a cool-down period. Then it goes half-open
+and lets a single probe request through. A successful probe closes the breaker; a
+failed one reopens it with the cool-down doubled (up to BREAKER_MAX_COOLDOWN).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Dict
+
+from config import BREAKER_COOLDOWN, BREAKER_FAILURES, BREAKER_MAX_COOLDOWN
+from metrics import CIRCUIT_OPENED, CIRCUIT_REJECTED, FETCH_RETRIES
+
+log = logging.getLogger(__name__)
+
+
+class CircuitOpen(Exception):
+    """Raised instead of sending a request to a source whose breaker is open."""
+
+
+class CircuitBreaker:
+    """Closed -> open after ``failures`` consecutive failures -> half-open after the cool-down."""
+
+    def __init__(
+        self,
+        source: str,
+        failures: int = BREAKER_FAILURES,
+        cooldown: float = BREAKER_COOLDOWN,
+        max_cooldown: float = BREAKER_MAX_COOLDOWN,
+    ):
+        self.source = source
+        self.threshold = max(1, failures)
+        self.base_cooldown = cooldown
+        self.max_cooldown = max(cooldown, max_cooldown)
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.consecutive = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.counts = {"failures": 0, "opened": 0, "skipped": 0, "retries": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """True while requests are being skipped (open and still cooling down)."""
+
+        with self._lock:
+            return self.state == "open" and time.monotonic() - self.opened_at < self.cooldown
+
+    def before_request(self) -> None:
+        """Admit one request, or raise :class:`CircuitOpen`."""
+
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = "half-open"
+            if self.state == "closed" or (self.state == "half-open" and not self.probing):
+                self.probing = self.state == "half-open"
+                return
+            self.counts["skipped"] += 1
+            remaining = max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+        CIRCUIT_REJECTED.inc(source=self.source)
+        raise CircuitOpen(f"{self.source} is failing; skipped for another {remaining:.0f}s")
+
+    def record(self, ok: bool) -> None:
+        """Outcome of an admitted request (after its retries)."""
+
+        with self._lock:
+            was_probe, self.probing = self.probing, False
+            if ok:
+                if self.state != "closed":
+                    log.info("%s recovered; circuit closed", self.source)
+                self.state = "closed"
+                self.consecutive = 0
+                self.cooldown = self.base_cooldown
+                return
+            self.counts["failures"] += 1
+            self.consecutive += 1
+            if was_probe:
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+            elif self.state != "closed" or self.consecutive < self.threshold:
+                return
+            self.state = "open"
+            self.opened_at = time.monotonic()
+            self.counts["opened"] += 1
+            consecutive, cooldown = self.consecutive, self.cooldown
+        CIRCUIT_OPENED.inc(source=self.source)
+        log.warning(
+            "%s failed %d requests in a row; skipping it for %.0fs",
+            self.source, consecutive, cooldown,
+        )
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.counts["retries"] += 1
+        FETCH_RETRIES.inc(source=self.source)
+
+
+class CircuitBreakers:
+    """One breaker per source, created on first use."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, source: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(source)
+            if breaker is None:
+                breaker = self._breakers[source] = CircuitBreaker(source)
+            return breaker
+
+    def stats(self) -> Dict[str, int]:
+        """Flat ``"<source> failures|opened|skipped|retries"`` counters for the run statistics."""
+
+        with self._lock:
+            breakers = sorted(self._breakers.items())
+        return {
+            f"{source} {name}": value
+            for source, breaker in breakers
+            for name, value in breaker.counts.items()
+        }
+
+
+CIRCUIT_BREAKERS = CircuitBreakers()
@@ -3,37 +3,40 @@
 Uses standard Google search results as a very rough job signal.
 """
 
+from typing import List
 from urllib.parse import quote_plus
 
-from crawlers.base import BaseCrawler, JobListing, _session, _soup, _text, _delay
-from config import REQUEST_TIMEOUT
+from crawlers.base import BaseCrawler, JobListing, _soup, _text
+from crawlers.parsing import Subtrees, has_class
+
+_RESULTS = Subtrees(lambda name, attrs: has_class(attrs, "g"))
 
 
 class GoogleJobsCrawler(BaseCrawler):
     source_name = "Google"
+    base_url = "https://www.google.com"
+    boolean_or = True
 
-    def search(self, query: str, max_results: int):
-        url = f"https://www.google.com/search?q={quote_plus(query + ' jobs')}"
-        listings = []
-        session = _session()
-        try:
-            resp = session.get(url, timeout=REQUEST_TIMEOUT)
-            resp.raise_for_status()
-            _delay()
-        except Exception as e:
-            return [
-                JobListing(
-                    title="(Google unavailable)",
-                    company="",
-                    description=f"Error: {e}",
-                    url=url,
-                    source=self.source_name,
-                )
-            ]
+    def _page_request(self, query: str, page: int):
+        return f"{self.base_url}/search?q={quote_plus(query + ' jobs')}&start={page * 10}", None
+
+    def _unavailable(self, url: str, e: Exception) -> List[JobListing]:
+        return [
+            JobListing(
+                title="(Google unavailable)",
+                company="",
+                description=f"Error: {e}",
+                url=url,
+                source=self.source_name,
+                needs_description=False,
+            )
+        ]
 
-        soup = _soup(resp.text)
+    def _parse_page(self, html: str, query: str, url: str) -> List[JobListing]:
+        listings = []
+        soup = _soup(html, "Google.search", _RESULTS)
         divs = soup.select(".g")
-        for g in divs[: max_results + 5]:
+        for g in divs:
             link = g.select_one("a[href^='http']")
             if not link:
                 continue
@@ -61,25 +64,26 @@ class GoogleJobsCrawler(BaseCrawler):
                     source=self.source_name,
                 )
             )
-            if len(listings) >= max_results:
-                break
+        return listings
 
-        if not listings:
-            listings.append(
-                JobListing(
-                    title=f"Google: {query} jobs",
-                    company="",
-                    description=(
-                        "Run a Google search for job listings. "
-                        "Google often requires JavaScript for the Jobs carousel."
-                    ),
-                    url=url,
-                    source=self.source_name,
-                )
+    def _no_results(self, query: str, url: str) -> List[JobListing]:
+        return [
+            JobListing(
+                title=f"Google: {query} jobs",
+                company="",
+                description=(
+                    "Run a Google search for job listings. "
+                    "Google often requires JavaScript for the Jobs carousel."
+                ),
+                url=url,
+                source=self.source_name,
+                needs_description=False,
             )
-        return listings
+        ]
 
     def fetch_description(self, listing: JobListing) -> str:
         # For Google results we usually only have the snippet.
         return listing.description
 
+    async def async_fetch_description(self, listing: JobListing) -> str:
+        return listing.description
@@ -0,0 +1,137 @@
+"""Persistent SQLite cache for job detail pages.
+
+Entries are keyed by URL and hold the (compressed) body with its ETag and
+Last-Modified headers. Fresh entries (younger than HTTP_CACHE_TTL) are served with
+no network call; stale ones are revalidated with a conditional GET, and a 304 just
+refreshes the entry. When the cache outgrows HTTP_CACHE_MAX_BYTES the least
+recently used entries are evicted.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from config import HTTP_CACHE_MAX_BYTES, HTTP_CACHE_PATH, HTTP_CACHE_TTL
+
+
+@dataclass
+class CacheEntry:
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() - self.fetched_at < HTTP_CACHE_TTL
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """URL -> response body cache with TTL, conditional revalidation and LRU eviction."""
+
+    def __init__(self, path: str = HTTP_CACHE_PATH, max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "stored": 0, "evicted": 0}
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                " url TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT, last_modified TEXT,"
+                " fetched_at REAL NOT NULL, accessed_at REAL NOT NULL, size INTEGER NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _count(self, name: str) -> None:
+        self._stats[name] += 1
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Cached entry for ``url`` (fresh or stale), or None."""
+
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            db.commit()
+        body, etag, last_modified, fetched_at = row
+        return CacheEntry(zlib.decompress(body).decode("utf-8"), etag, last_modified, fetched_at)
+
+    def record_hit(self) -> None:
+        with self._lock:
+            self._count("hits")
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self._count("misses")
+
+    def revalidated(self, url: str) -> None:
+        """Mark a stale entry fresh again after a 304 Not Modified."""
+
+        with self._lock:
+            self._count("revalidated")
+            db = self._db()
+            db.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            db.commit()
+
+    def store(self, url: str, body: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        data = zlib.compress(body.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._count("stored")
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO pages"
+                " (url, body, etag, last_modified, fetched_at, accessed_at, size)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, data, etag, last_modified, now, now, len(data)),
+            )
+            self._evict(db)
+            db.commit()
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        (total,) = db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()
+        if total <= self.max_bytes:
+            return
+        for url, size in db.execute(
+            "SELECT url, size FROM pages ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            db.execute("DELETE FROM pages WHERE url = ?", (url,))
+            total -= size
+            self._count("evicted")
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/revalidation/store/eviction counters since process start."""
+
+        with self._lock:
+            return dict(self._stats)
+
+
+HTTP_CACHE = HttpCache()
@@ -1,41 +1,57 @@
 """Indeed.com crawler."""
 
-from urllib.parse import quote_plus, urljoin
+from typing import List
+from urllib.parse import parse_qs, quote_plus, urljoin, urlsplit
 
-from crawlers.base import BaseCrawler, JobListing, _session, _soup, _text, _delay
-from config import REQUEST_TIMEOUT
+from crawlers.base import BaseCrawler, JobListing, _afetch, _fetch, _record_failure, _soup, _text
+from crawlers.parsing import Subtrees, has_class
+
+# Build only the job cards / the description block instead of the whole page.
+_CARDS = Subtrees(lambda name, attrs: "data-jk" in attrs)
+_DESCRIPTION = Subtrees(
+    lambda name, attrs: attrs.get("id") == "jobDescriptionText"
+    or attrs.get("data-testid") == "job-description"
+    or has_class(attrs, "jobsearch-JobComponent-description")
+)
 
 
 class IndeedCrawler(BaseCrawler):
     source_name = "Indeed"
+    base_url = "https://www.indeed.com"
+    boolean_or = True
+    # Indeed shows 10-15 cards per page and pages with start=0, 10, 20, ...
+    page_size = 10
 
-    def search(self, query: str, max_results: int):
-        listings = []
-        session = _session()
+    def _page_request(self, query: str, page: int):
         url = (
-            "https://www.indeed.com/jobs"
+            f"{self.base_url}/jobs"
             f"?q={quote_plus(query)}"
             "&l="
-            "&start=0"
+            f"&start={page * self.page_size}"
         )
-        try:
-            resp = session.get(url, timeout=REQUEST_TIMEOUT)
-            resp.raise_for_status()
-            _delay()
-        except Exception as e:
-            return [
-                JobListing(
-                    title="(Indeed unavailable)",
-                    company="",
-                    description=f"Error: {e}. Indeed may block automated requests.",
-                    url=url,
-                    source=self.source_name,
-                )
-            ]
+        return url, None
 
-        soup = _soup(resp.text)
+    def job_id(self, listing: JobListing) -> str:
+        jk = parse_qs(urlsplit(listing.url).query).get("jk")
+        return jk[0] if jk else listing.url
+
+    def _unavailable(self, url: str, e: Exception) -> List[JobListing]:
+        return [
+            JobListing(
+                title="(Indeed unavailable)",
+                company="",
+                description=f"Error: {e}. Indeed may block automated requests.",
+                url=url,
+                source=self.source_name,
+                needs_description=False,
+            )
+        ]
+
+    def _parse_page(self, html: str, query: str, url: str) -> List[JobListing]:
+        listings = []
+        soup = _soup(html, "Indeed.search", _CARDS)
         cards = soup.select('[data-jk]')
-        for card in cards[:max_results]:
+        for card in cards:
             jk = card.get("data-jk")
             if not jk:
                 continue
@@ -43,32 +59,21 @@ class IndeedCrawler(BaseCrawler):
             company_el = card.select_one('[data-testid="companyName"]') or card.select_one(".companyName")
             title = _text(title_el) or "Unknown Title"
             company = _text(company_el) or "Unknown Company"
-            detail_url = urljoin("https://www.indeed.com/", f"/viewjob?jk={jk}")
+            detail_url = urljoin(self.base_url + "/", f"/viewjob?jk={jk}")
             desc = _text(card.select_one(".job-snippet") or card.select_one(".jobSummary"))
-            listing = JobListing(
-                title=title,
-                company=company,
-                description=desc,
-                url=detail_url,
-                source=self.source_name,
+            listings.append(
+                JobListing(
+                    title=title,
+                    company=company,
+                    description=desc,
+                    url=detail_url,
+                    source=self.source_name,
+                )
             )
-            full_desc = self.fetch_description(listing)
-            if full_desc:
-                listing.description = full_desc
-            listings.append(listing)
         return listings
 
-    def fetch_description(self, listing: JobListing) -> str:
-        if not listing.url or "viewjob" not in listing.url:
-            return listing.description
-        session = _session()
-        try:
-            resp = session.get(listing.url, timeout=REQUEST_TIMEOUT)
-            resp.raise_for_status()
-            _delay()
-        except Exception:
-            return listing.description
-        soup = _soup(resp.text)
+    def _parse_description(self, html: str, listing: JobListing) -> str:
+        soup = _soup(html, "Indeed.detail", _DESCRIPTION)
         desc_el = (
             soup.select_one("#jobDescriptionText")
             or soup.select_one('[data-testid="job-description"]')
@@ -78,3 +83,22 @@ class IndeedCrawler(BaseCrawler):
             return _text(desc_el)
         return listing.description
 
+    def fetch_description(self, listing: JobListing) -> str:
+        if not listing.url or "viewjob" not in listing.url:
+            return listing.description
+        try:
+            html = _fetch(listing.url, source=self.source_name, cache=True)
+        except Exception as e:
+            _record_failure(self.source_name, "description", listing.url, e)
+            return listing.description
+        return self._parse_description(html, listing)
+
+    async def async_fetch_description(self, listing: JobListing) -> str:
+        if not listing.url or "viewjob" not in listing.url:
+            return listing.description
+        try:
+            html = await _afetch(listing.url, source=self.source_name, cache=True)
+        except Exception as e:
+            _record_failure(self.source_name, "description", listing.url, e)
+            return listing.description
+        return self._parse_description(html, listing)
@@ -4,58 +4,112 @@ LinkedIn heavily restricts scraping and may require login/JavaScript. This crawl
 uses a best-effort approach and is intended for personal experimentation only.
 
 To extract the full job description we:
-- Open the job detail page with Playwright
+- Open the job detail page on a page leased from the shared Playwright browser pool
 - Click a "more" button under the "About the job" section
-- Wait ~1 second for the full text to load
+- Wait for the expanded text to settle (condition-based, see page_waits.py)
 """
 
+import re
+from typing import List
 from urllib.parse import quote_plus
 
-from crawlers.base import BaseCrawler, JobListing, _session, _soup, _text, _delay
+from browser_pool import get_browser_pool
+from crawlers.base import BaseCrawler, JobListing, _record_failure, _soup, _text, _throttle
+from crawlers.parsing import Subtrees, has_class
 from config import REQUEST_TIMEOUT
+from page_blocking import timed_navigation
+from page_waits import wait_for_any_selector, wait_for_text_stable
+
+
+# Search result cards (superset of the card selectors in search()).
+_CARDS = Subtrees(
+    lambda name, attrs: has_class(attrs, "base-card", "job-search-card") or "data-job-id" in attrs
+)
+# "more" button under "About the job".
+_MORE_SELECTORS = [
+    "button:has-text('Show more')",
+    "button:has-text('more')",
+    "span:has-text('Show more')",
+    "a:has-text('Show more')",
+    "[aria-label*='more']",
+    ".show-more-less-html__button--more",
+    ".show-more-less-html__button",
+]
+# Containers holding the "About the job" description text.
+_DESC_SELECTORS = [
+    "section.jobs-description",
+    ".jobs-description__content",
+    ".jobs-box__html-content",
+    "[class*='description__content']",
+    "[class*='job-details']",
+    ".show-more-less-html__full-content",
+    "main .jobs-description",
+]
+# /jobs/view/<id> or /jobs/view/<slug>-<id>
+_JOB_ID_RE = re.compile(r"/jobs/view/(?:[^/?#]*-)?(\d+)")
+# Per-step deadlines for the condition-based waits.
+_RENDER_DEADLINE_MS = 5000
+_EXPAND_DEADLINE_MS = 3000
 
 
 class LinkedInCrawler(BaseCrawler):
     source_name = "LinkedIn"
+    base_url = "https://www.linkedin.com"
+    # LinkedIn keyword search accepts quoted phrases joined by OR.
+    boolean_or = True
 
-    def search(self, query: str, max_results: int):
+    def job_id(self, listing: JobListing) -> str:
+        m = _JOB_ID_RE.search(listing.url)
+        return m.group(1) if m else listing.url
+
+    def _page_request(self, query: str, page: int):
         # Public job search URL; LinkedIn may change this frequently.
         url = (
-            "https://www.linkedin.com/jobs/search-results/"
-            #f"?keywords={quote_plus(query)}"
-            f"?keywords=software engineer"
+            f"{self.base_url}/jobs/search-results/"
+            f"?keywords={quote_plus(query)}"
             #"&location="
             "&origin=JOB_SEARCH_PAGE_JOB_FILTER"
             "&geoId=102571732"
             "&distance=5"
             "&position=1"
-            "&pageNum=0"
+            f"&pageNum={page}"
             "&f_TPR=r86400"
         )
-        listings = []
-        session = _session()
-        try:
-            resp = session.get(url, timeout=REQUEST_TIMEOUT)
-            resp.raise_for_status()
-            _delay()
-        except Exception as e:
-            return [
-                JobListing(
-                    title="(LinkedIn unavailable)",
-                    company="",
-                    description=f"Error: {e}. LinkedIn often blocks or requires login.",
-                    url=url,
-                    source=self.source_name,
-                )
-            ]
+        return url, None
+
+    def _unavailable(self, url: str, e: Exception) -> List[JobListing]:
+        return [
+            JobListing(
+                title="(LinkedIn unavailable)",
+                company="",
+                description=f"Error: {e}. LinkedIn often blocks or requires login.",
+                url=url,
+                source=self.source_name,
+                needs_description=False,
+            )
+        ]
+
+    def _no_results(self, query: str, url: str) -> List[JobListing]:
+        return [
+            JobListing(
+                title=f"LinkedIn jobs: {query}",
+                company="(search manually for more details)",
+                description="LinkedIn limits automated access. Open the URL to see jobs.",
+                url=url,
+                source=self.source_name,
+                needs_description=False,
+            )
+        ]
 
-        soup = _soup(resp.text)
+    def _parse_page(self, html: str, query: str, url: str) -> List[JobListing]:
+        listings = []
+        soup = _soup(html, "LinkedIn.search", _CARDS)
         cards = (
             soup.select(".base-card")
             or soup.select('[data-job-id]')
             or soup.select(".job-search-card")
         )
-        for card in cards[:max_results]:
+        for card in cards:
             link = card.select_one("a.base-card__full-link") or card.select_one(
                 "a[href*='/jobs/view/']"
             )
@@ -71,28 +125,14 @@ class LinkedInCrawler(BaseCrawler):
             snippet = card.select_one(".base-search-card__snippet") or card.select_one(".job-snippet")
             desc = _text(snippet)
             job_url = href.split("?")[0] if href else ""
-            listing = JobListing(
-                title=title,
-                company=company,
-                description=desc,
-                url=job_url,
-                source=self.source_name,
-            )
-            if job_url:
-                full_desc = self.fetch_description(listing)
-                if full_desc:
-                    listing.description = full_desc
-                _delay()
-            listings.append(listing)
-
-        if not listings:
             listings.append(
                 JobListing(
-                    title=f"LinkedIn jobs: {query}",
-                    company="(search manually for more details)",
-                    description="LinkedIn limits automated access. Open the URL to see jobs.",
-                    url=url,
+                    title=title,
+                    company=company,
+                    description=desc,
+                    url=job_url,
                     source=self.source_name,
+                    needs_description=bool(job_url),
                 )
             )
         return listings
@@ -103,71 +143,62 @@ class LinkedInCrawler(BaseCrawler):
         if not listing.url or "linkedin.com" not in listing.url:
             return listing.description
 
+        _throttle(listing.url, self.source_name)
         try:
-            from playwright.sync_api import sync_playwright
+            full_text = get_browser_pool().run(
+                lambda page: self._extract_description(page, listing.url)
+            )
         except ImportError:
             # Playwright not installed; fall back to snippet.
             return listing.description
+        except Exception as e:
+            _record_failure(self.source_name, "description", listing.url, e)
+            full_text = ""
+
+        return full_text or listing.description
+
+    def _extract_description(self, page, url: str) -> str:
+        """Runs on a leased browser-pool page; returns the expanded description text."""
 
         full_text = ""
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            try:
-                page = browser.new_page()
-                page.set_default_timeout(REQUEST_TIMEOUT * 1000)
-                page.goto(listing.url, wait_until="domcontentloaded")
-
-                # Give the page a moment to render.
-                page.wait_for_timeout(2000)
-
-                # Click "more" under "About the job"
-                more_selectors = [
-                    "button:has-text('Show more')",
-                    "button:has-text('more')",
-                    "span:has-text('Show more')",
-                    "a:has-text('Show more')",
-                    "[aria-label*='more']",
-                    ".show-more-less-html__button--more",
-                    ".show-more-less-html__button",
-                ]
-                for sel in more_selectors:
-                    try:
-                        el = page.query_selector(sel)
-                        if el and el.is_visible():
-                            el.click()
-                            # Wait ~1 second for content to expand as requested.
-                            page.wait_for_timeout(1000)
-                            break
-                    except Exception:
-                        continue
-
-                # Extract text under "About the job" / main description container.
-                desc_selectors = [
-                    "section.jobs-description",
-                    ".jobs-description__content",
-                    ".jobs-box__html-content",
-                    "[class*='description__content']",
-                    "[class*='job-details']",
-                    ".show-more-less-html__full-content",
-                    "main .jobs-description",
-                ]
-                for sel in desc_selectors:
-                    el = page.query_selector(sel)
-                    if el:
-                        text = el.inner_text()
-                        if text:
-                            full_text = " ".join(text.split())
-                        if len(full_text) > 100:
-                            break
-
-                if not full_text:
-                    main = page.query_selector("main")
-                    if main:
-                        full_text = " ".join(main.inner_text().split())
-            except Exception:
-                pass
-            finally:
-                browser.close()
+        try:
+            page.set_default_timeout(REQUEST_TIMEOUT * 1000)
+            with timed_navigation("LinkedIn"):
+                page.goto(url, wait_until="domcontentloaded")
 
-        return full_text or listing.description
+            # Wait until the description container (or its "more" button) renders.
+            wait_for_any_selector(
+                page, _DESC_SELECTORS + _MORE_SELECTORS, "linkedin.render", _RENDER_DEADLINE_MS
+            )
 
+            # Click "more" under "About the job"
+            for sel in _MORE_SELECTORS:
+                try:
+                    el = page.query_selector(sel)
+                    if el and el.is_visible():
+                        el.click()
+                        # Wait for the expanded text to stop changing.
+                        wait_for_text_stable(
+                            page, ", ".join(_DESC_SELECTORS), "linkedin.expand", _EXPAND_DEADLINE_MS
+                        )
+                        break
+                except Exception:
+                    continue
+
+            # Extract text under "About the job" / main description container.
+            for sel in _DESC_SELECTORS:
+                el = page.query_selector(sel)
+                if el:
+                    text = el.inner_text()
+                    if text:
+                        full_text = " ".join(text.split())
+                    if len(full_text) > 100:
+                        break
+
+            if not full_text:
+                main = page.query_selector("main")
+                if main:
+                    full_text = " ".join(main.inner_text().split())
+        except Exception:
+            pass
+        return full_text
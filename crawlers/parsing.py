@@ -0,0 +1,109 @@
+"""HTML parsing for the crawlers: fast parser backend, partial parsing and timing.
+
+``parse()`` returns a BeautifulSoup tree so crawlers keep using ``select()``, but:
+
+- the tree builder is lxml when it is installed (HTML_PARSER=auto), several times
+  faster than the pure-Python "html.parser", which remains the fallback;
+- an optional :class:`Subtrees` filter builds only the elements a crawler reads
+  (job cards, the description block) instead of the whole page;
+- every parse is timed per label (e.g. "Indeed.search") for the run statistics and
+  the ``jobscan_parse_seconds`` histogram.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Dict, Mapping, Optional
+
+from bs4 import BeautifulSoup
+from bs4.filter import ElementFilter
+
+from config import HTML_PARSER
+from metrics import PARSE_SECONDS
+
+try:
+    import lxml  # noqa: F401
+
+    _HAS_LXML = True
+except ImportError:
+    _HAS_LXML = False
+
+
+def _backend() -> str:
+    if HTML_PARSER == "auto":
+        return "lxml" if _HAS_LXML else "html.parser"
+    return HTML_PARSER
+
+
+BACKEND = _backend()
+
+TagPredicate = Callable[[str, Mapping[str, str]], bool]
+
+
+def _classes(attrs: Mapping[str, str]) -> str:
+    classes = attrs.get("class") or ""
+    return classes if isinstance(classes, str) else " ".join(classes)
+
+
+def has_class(attrs: Mapping[str, str], *names: str) -> bool:
+    """True if the raw ``class`` attribute contains any of ``names`` as a whole class."""
+
+    classes = _classes(attrs).split()
+    return any(n in classes for n in names)
+
+
+def class_contains(attrs: Mapping[str, str], fragment: str) -> bool:
+    """Equivalent of the ``[class*='fragment']`` selector on raw attributes."""
+
+    return fragment in _classes(attrs)
+
+
+class Subtrees(ElementFilter):
+    """Keep only top-level elements for which ``predicate(name, attrs)`` holds.
+
+    Once an element is kept its whole subtree is built, so selectors that run inside a
+    kept card or description block behave as on the full page. The predicate must
+    accept every element a crawler's root ``select()`` fallbacks could match.
+    """
+
+    def __init__(self, predicate: TagPredicate):
+        super().__init__()
+        self.predicate = predicate
+
+    def allow_tag_creation(self, nsprefix, name, attrs) -> bool:
+        return self.predicate(name, attrs or {})
+
+    def allow_string_creation(self, string: str) -> bool:
+        return False
+
+
+_stats: Dict[str, Dict[str, float]] = {}
+_stats_lock = threading.Lock()
+
+
+def parse(html: str, label: str = "", only: Optional[Subtrees] = None) -> BeautifulSoup:
+    """Parse ``html`` with the configured backend, optionally only the ``only`` subtrees."""
+
+    start = time.perf_counter()
+    soup = BeautifulSoup(html, BACKEND, parse_only=only)
+    elapsed = time.perf_counter() - start
+    elapsed_ms = elapsed * 1000
+    PARSE_SECONDS.observe(elapsed, page=label or "other")
+    with _stats_lock:
+        s = _stats.setdefault(label or "other", {"pages": 0, "ms": 0.0, "kb": 0.0})
+        s["pages"] += 1
+        s["ms"] += elapsed_ms
+        s["kb"] += len(html) / 1024
+    return soup
+
+
+def parse_stats() -> Dict[str, float]:
+    """Flat ``"<label> pages|ms|kb"`` counters, in the shape the run statistics expect."""
+
+    with _stats_lock:
+        return {
+            f"{label} {field}": value
+            for label, values in sorted(_stats.items())
+            for field, value in values.items()
+        }
@@ -0,0 +1,295 @@
+"""Query planning and request coalescing for site searches.
+
+Searching every site once per JOB_CATEGORIES entry wastes requests. The categories
+overlap ("python developer" also finds "senior python developer"), and a crawler whose
+URL ignores part of the query can fetch the same page for several of them.
+:meth:`QueryPlanner.plan` turns the categories into fewer upstream queries per crawler:
+
+1. a category whose words include all of a broader category's words is folded into
+   that category's query;
+2. on sites with boolean search (``BaseCrawler.boolean_or``) up to QUERY_MERGE_MAX
+   queries are OR-ed into one;
+3. queries whose first result page has the same URL are collapsed into one;
+4. a query whose last few successful runs found nothing new for its site (every result
+   was a duplicate of an earlier query's) is skipped for a while. Failed or blocked
+   searches, and ones that returned only placeholders, do not count.
+
+A merged query asks for as many results as its categories did together.
+:class:`SingleFlight` collapses identical search-page requests at fetch time: callers
+of a URL that is already in flight wait for that fetch, and a fetched page is reused
+for SEARCH_MEMO_TTL seconds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import (
+    JOB_CATEGORIES,
+    MAX_JOBS_PER_CATEGORY_PER_SITE,
+    QUERY_MERGE_MAX,
+    QUERY_PLANNER_ENABLED,
+    SEARCH_MEMO_MAX_ENTRIES,
+    SEARCH_MEMO_TTL,
+)
+from metrics import REQUESTS_SAVED
+
+# A query with no new listings in this many consecutive runs is skipped for _SKIP_SECONDS.
+_ZERO_RUNS_TO_SKIP = 3
+_SKIP_SECONDS = 6 * 3600
+
+
+@dataclass(frozen=True)
+class PlannedQuery:
+    """One upstream search standing in for one or more categories."""
+
+    query: str
+    categories: Tuple[str, ...]
+    max_results: int
+
+
+def _words(query: str) -> frozenset:
+    return frozenset(query.lower().split())
+
+
+def _fold_subsumed(categories: List[str]) -> Dict[str, List[str]]:
+    """Group categories under the broadest category whose words they all contain."""
+
+    groups: Dict[str, List[str]] = {}
+    for category in categories:
+        words = _words(category)
+        broader = [c for c in categories if c != category and _words(c) < words]
+        # The broader category with the fewest words is never itself subsumed.
+        root = min(broader, key=lambda c: len(_words(c))) if broader else category
+        groups.setdefault(root, []).append(category)
+    return groups
+
+
+def request_key(url: str, params: Optional[dict] = None) -> str:
+    """Identity of a GET request: URL plus sorted query params."""
+
+    return url + "?" + "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+
+
+class QueryPlanner:
+    """Plans each crawler's searches and remembers how many new listings each query yields."""
+
+    def __init__(self, enabled: bool = QUERY_PLANNER_ENABLED, merge_max: int = QUERY_MERGE_MAX):
+        self.enabled = enabled
+        self.merge_max = max(1, merge_max)
+        # (source, query) -> consecutive runs without a new listing, and when that began skipping.
+        self._zero_runs: Dict[Tuple[str, str], int] = {}
+        self._skipped_at: Dict[Tuple[str, str], float] = {}
+        self._stats = {"categories": 0, "queries": 0, "merged": 0, "skipped": 0}
+        self._lock = threading.Lock()
+
+    def plan(
+        self,
+        crawler,
+        categories: List[str] = JOB_CATEGORIES,
+        per_category: int = MAX_JOBS_PER_CATEGORY_PER_SITE,
+    ) -> List[PlannedQuery]:
+        categories = list(dict.fromkeys(c.strip() for c in categories if c.strip()))
+        if not self.enabled:
+            return [PlannedQuery(c, (c,), per_category) for c in categories]
+
+        groups = list(_fold_subsumed(categories).items())
+        if crawler.boolean_or and self.merge_max > 1:
+            merged = []
+            for i in range(0, len(groups), self.merge_max):
+                chunk = groups[i : i + self.merge_max]
+                roots = [root for root, _ in chunk]
+                query = crawler.combined_query(roots) if len(roots) > 1 else roots[0]
+                merged.append((query, [c for _, members in chunk for c in members]))
+            groups = merged
+
+        by_request: "OrderedDict[str, Tuple[str, List[str]]]" = OrderedDict()
+        for query, members in groups:
+            key = request_key(*crawler._page_request(query, 0))
+            if key in by_request:
+                by_request[key][1].extend(members)
+            else:
+                by_request[key] = (query, list(members))
+        planned = [
+            PlannedQuery(query, tuple(members), per_category * len(members))
+            for query, members in by_request.values()
+        ]
+
+        now = time.monotonic()
+        with self._lock:
+            for key, since in list(self._skipped_at.items()):
+                if now - since >= _SKIP_SECONDS:
+                    # Give it another chance; one more empty run skips it again.
+                    del self._skipped_at[key]
+                    self._zero_runs[key] = _ZERO_RUNS_TO_SKIP - 1
+            return [p for p in planned if (crawler.source_name, p.query) not in self._skipped_at]
+
+    def searched(self, source: str, planned: PlannedQuery) -> None:
+        """Count a finished query and the requests its merging saved."""
+
+        saved = len(planned.categories) - 1
+        with self._lock:
+            self._stats["categories"] += len(planned.categories)
+            self._stats["queries"] += 1
+            self._stats["merged"] += saved
+        if saved:
+            REQUESTS_SAVED.inc(saved, source=source, reason="merged")
+
+    def record(self, source: str, planned: PlannedQuery, new_listings: int) -> None:
+        """Note whether a successful query (one that returned real listings) found anything new.
+
+        Failed, blocked and placeholder-only searches must not be recorded: they would
+        count as "nothing new" and get a query skipped after its site recovers.
+        """
+
+        with self._lock:
+            key = (source, planned.query)
+            self._zero_runs[key] = 0 if new_listings else self._zero_runs.get(key, 0) + 1
+            if self._zero_runs[key] >= _ZERO_RUNS_TO_SKIP and key not in self._skipped_at:
+                self._skipped_at[key] = time.monotonic()
+                self._stats["skipped"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+
+class SingleFlight:
+    """At most one upstream fetch per search URL; results are reused for ``ttl`` seconds."""
+
+    def __init__(self, ttl: float = SEARCH_MEMO_TTL, max_entries: int = SEARCH_MEMO_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max(0, max_entries)
+        self._done: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._ainflight: Dict[str, asyncio.Future] = {}
+        self._stats = {"fetched": 0, "memo hits": 0, "joined in flight": 0}
+        self._lock = threading.Lock()
+
+    def _memo(self, key: str, source: str) -> Optional[str]:
+        """Fresh memoized body for ``key`` (caller holds the lock)."""
+
+        hit = self._done.get(key)
+        if hit is None:
+            return None
+        expires, body = hit
+        if expires < time.monotonic():
+            del self._done[key]
+            return None
+        self._done.move_to_end(key)
+        self._stats["memo hits"] += 1
+        REQUESTS_SAVED.inc(source=source, reason="memo")
+        return body
+
+    def _store(self, key: str, body: str) -> None:
+        with self._lock:
+            self._stats["fetched"] += 1
+            if self.ttl <= 0 or self.max_entries == 0:
+                return
+            self._done[key] = (time.monotonic() + self.ttl, body)
+            self._done.move_to_end(key)
+            while len(self._done) > self.max_entries:
+                self._done.popitem(last=False)
+
+    def fetch(self, key: str, source: str, fetch: Callable[[], str]) -> str:
+        """Body for ``key``: memoized, shared with an in-flight fetch, or ``fetch()``-ed."""
+
+        with self._lock:
+            body = self._memo(key, source)
+            if body is not None:
+                return body
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+            else:
+                self._stats["joined in flight"] += 1
+        if not owner:
+            REQUESTS_SAVED.inc(source=source, reason="joined")
+            return future.result()
+
+        try:
+            body = fetch()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self._store(key, body)
+            future.set_result(body)
+            return body
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def afetch(self, key: str, source: str, fetch) -> str:
+        """Async variant of :meth:`fetch`: callers of a key in flight await the same fetch."""
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            body = self._memo(key, source)
+            if body is not None:
+                return body
+            future = self._ainflight.get(key)
+            # A future left by an earlier event loop (one asyncio.run per crawl) is not shared.
+            owner = future is None or future.get_loop() is not loop
+            if owner:
+                future = self._ainflight[key] = loop.create_future()
+            else:
+                self._stats["joined in flight"] += 1
+        if not owner:
+            REQUESTS_SAVED.inc(source=source, reason="joined")
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # this caller was cancelled
+                # The owner was cancelled mid-fetch; fetch for ourselves.
+                return await fetch()
+
+        try:
+            body = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # retrieved here, so an unjoined failure is not logged twice
+            raise
+        else:
+            self._store(key, body)
+            future.set_result(body)
+            return body
+        finally:
+            with self._lock:
+                if self._ainflight.get(key) is future:
+                    del self._ainflight[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+
+QUERY_PLANNER = QueryPlanner()
+SEARCH_FLIGHTS = SingleFlight()
+
+
+def planner_stats() -> Dict[str, int]:
+    """Run statistics: categories searched, upstream queries, queries skipped, and requests saved."""
+
+    plan = QUERY_PLANNER.stats()
+    flights = SEARCH_FLIGHTS.stats()
+    return {
+        "categories": plan["categories"],
+        "queries": plan["queries"],
+        "skipped (nothing new)": plan["skipped"],
+        "saved by merging": plan["merged"],
+        "saved by memo": flights["memo hits"],
+        "saved in flight": flights["joined in flight"],
+        "requests saved": plan["merged"] + flights["memo hits"] + flights["joined in flight"],
+    }
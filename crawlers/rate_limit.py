@@ -0,0 +1,98 @@
+"""Per-host token-bucket rate limiting for crawler requests.
+
+Each host gets its own bucket, so a slow site never throttles the others, and the
+time a crawler spends parsing between requests is credited against its budget.
+Callers only block when a host's tokens are actually spent.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Dict
+
+from config import CRAWL_BURST, CRAWL_RATE, CRAWL_RATE_PER_SOURCE
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens/second, holding at most ``burst`` tokens."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how many seconds the caller must wait to use it.
+
+        Tokens may go negative: concurrent callers queue up behind each other
+        instead of all waking at the same moment.
+        """
+
+        if self.rate <= 0:
+            return 0.0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class RateLimiter:
+    """Registry of per-host token buckets, shared by threads and asyncio tasks."""
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._waits: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str, source: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate = CRAWL_RATE_PER_SOURCE.get(source.lower(), CRAWL_RATE)
+                bucket = TokenBucket(rate, CRAWL_BURST)
+                self._buckets[host] = bucket
+                self._waits[host] = {"requests": 0, "waits": 0, "wait_seconds": 0.0}
+            return bucket
+
+    def _record(self, host: str, delay: float) -> None:
+        with self._lock:
+            stats = self._waits[host]
+            stats["requests"] += 1
+            if delay > 0:
+                stats["waits"] += 1
+                stats["wait_seconds"] += delay
+
+    def acquire(self, host: str, source: str = "") -> float:
+        """Block until ``host`` has budget for one request; return seconds waited."""
+
+        delay = self._bucket(host, source).reserve()
+        self._record(host, delay)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, host: str, source: str = "") -> float:
+        """Async variant of :meth:`acquire` that yields to the event loop while waiting."""
+
+        delay = self._bucket(host, source).reserve()
+        self._record(host, delay)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-host request count, number of blocking waits and total seconds waited."""
+
+        with self._lock:
+            return {host: dict(s) for host, s in self._waits.items()}
+
+
+RATE_LIMITER = RateLimiter()
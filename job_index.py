@@ -0,0 +1,106 @@
+"""Persistent index of every posting the crawlers have seen.
+
+Postings are keyed by (source, stable job ID), e.g. Indeed's ``jk``, LinkedIn's
+``/jobs/view/<id>`` number, or the BuiltIn detail URL. Each row remembers when the
+posting was first and last seen plus its full description, so later runs can skip
+the detail fetch (and, via the result cache, the scan) for postings they already
+have and spend their time on new ones.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from config import JOB_INDEX_DESCRIPTION_TTL, JOB_INDEX_PATH
+
+
+class JobIndex:
+    """SQLite table of (source, job_id) -> first/last seen times and description."""
+
+    def __init__(self, path: str = JOB_INDEX_PATH):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stats = {"known": 0, "new": 0, "descriptions_reused": 0}
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " source TEXT NOT NULL, job_id TEXT NOT NULL,"
+                " title TEXT, company TEXT, url TEXT, description TEXT,"
+                " first_seen REAL NOT NULL, last_seen REAL NOT NULL, described_at REAL,"
+                " PRIMARY KEY (source, job_id))"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def description(self, source: str, job_id: str) -> Optional[str]:
+        """Stored full description for a known posting, if still recent enough to reuse."""
+
+        with self._lock:
+            row = self._db().execute(
+                "SELECT description, described_at FROM jobs WHERE source = ? AND job_id = ?",
+                (source, job_id),
+            ).fetchone()
+            if not row or not row[0] or row[1] is None:
+                return None
+            if time.time() - row[1] >= JOB_INDEX_DESCRIPTION_TTL:
+                return None
+            self._stats["descriptions_reused"] += 1
+            return row[0]
+
+    def record(self, postings: Iterable[Tuple[str, str, object]]) -> Set[Tuple[str, str]]:
+        """Upsert ``(source, job_id, listing)`` entries; return the keys seen for the first time.
+
+        A description is stored only for listings whose detail page was fetched
+        (``listing.described``); a snippet left by a failed or skipped fetch is not, so
+        later runs retry the detail page instead of reusing the snippet.
+        """
+
+        now = time.time()
+        new: Set[Tuple[str, str]] = set()
+        with self._lock:
+            db = self._db()
+            for source, job_id, listing in postings:
+                row = db.execute(
+                    "SELECT description FROM jobs WHERE source = ? AND job_id = ?",
+                    (source, job_id),
+                ).fetchone()
+                description = (listing.description or "") if listing.described else ""
+                if row is None:
+                    new.add((source, job_id))
+                    db.execute(
+                        "INSERT INTO jobs (source, job_id, title, company, url, description,"
+                        " first_seen, last_seen, described_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (source, job_id, listing.title, listing.company, listing.url,
+                         description, now, now, now if description else None),
+                    )
+                    self._stats["new"] += 1
+                else:
+                    changed = description and description != row[0]
+                    db.execute(
+                        "UPDATE jobs SET title = ?, company = ?, url = ?, last_seen = ?"
+                        + (", description = ?, described_at = ?" if changed else "")
+                        + " WHERE source = ? AND job_id = ?",
+                        (listing.title, listing.company, listing.url, now)
+                        + ((description, now) if changed else ())
+                        + (source, job_id),
+                    )
+                    self._stats["known"] += 1
+            db.commit()
+        return new
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+
+JOB_INDEX = JobIndex()
@@ -1,7 +1,7 @@
 """JobScan.co integration via browser automation (Playwright).
 
 Given resume text and a job description, this module:
-- Opens the JobScan resume scanner page
+- Opens the JobScan resume scanner page (logging in only when the saved session expired)
 - Pastes the resume and job description
 - Clicks the scan/compare button
 - Extracts a match score and summary text for human review
@@ -9,27 +9,96 @@ Given resume text and a job description, this module:
 
 from __future__ import annotations
 
+import os
 import re
 from dataclasses import dataclass
 from typing import Optional
 
-from config import JOBSCAN_EMAIL, JOBSCAN_PASSWORD
+from blob_store import BLOB_STORE
+from browser_pool import BrowserPool, get_browser_pool
+from config import JOBSCAN_EMAIL, JOBSCAN_PASSWORD, JOBSCAN_STORAGE_STATE
+from metrics import SCAN_SECONDS
+from page_blocking import timed_navigation
+from page_waits import wait_for_any_selector, wait_for_text_stable
 
 
-@dataclass
+@dataclass(slots=True)
 class JobScanResult:
     match_score: Optional[int]  # 0–100
     summary: str
     details: str
-    raw_html: str
     success: bool
     error: Optional[str] = None
+    # Blob-store key of the captured results page ("" if none); see BLOB_STORE.get().
+    raw_html_key: str = ""
 
 
-def _run_playwright_scan(resume_text: str, job_description: str, headless: bool) -> JobScanResult:
-    """Playwright implementation of JobScan submission and result extraction."""
+_EMAIL_SELECTOR = 'input[type="email"], input[name*="email"], input[placeholder*="email"]'
+_SCORE_SELECTOR = "[class*='score'], [class*='match'], .percentage, [data-testid*='score']"
+_RESULTS_SELECTOR = "[class*='result'], [class*='report']"
+
+# Per-step deadlines for the condition-based waits (milliseconds).
+_LOGIN_DEADLINE_MS = 10000
+_RESULTS_DEADLINE_MS = 30000
+_SETTLE_DEADLINE_MS = 5000
+
+_SIGN_IN_SELECTOR = (
+    "a:has-text('Sign in'), a:has-text('Log in'), "
+    "button:has-text('Sign in'), button:has-text('Log in')"
+)
+
+
+def _session_expired(page) -> bool:
+    """True when the dashboard shows a sign-in form or link instead of a logged-in session."""
 
-    from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+    url = page.url.lower()
+    if "login" in url or "sign-in" in url or "signin" in url:
+        return True
+    if page.query_selector('input[type="password"]'):
+        return True
+    sign_in = page.query_selector(_SIGN_IN_SELECTOR)
+    return bool(sign_in and sign_in.is_visible())
+
+
+def _log_in(page) -> None:
+    """Sign in with JOBSCAN_EMAIL / JOBSCAN_PASSWORD and persist the session to disk."""
+
+    sign_in = page.query_selector(_SIGN_IN_SELECTOR)
+    if sign_in and sign_in.is_visible():
+        sign_in.click()
+        wait_for_any_selector(page, [_EMAIL_SELECTOR], "jobscan.login_form", _LOGIN_DEADLINE_MS)
+    email_el = page.query_selector(_EMAIL_SELECTOR)
+    pass_el = page.query_selector(
+        'input[type="password"], input[name*="password"]'
+    )
+    if not (email_el and pass_el):
+        return
+    email_el.fill(JOBSCAN_EMAIL)
+    pass_el.fill(JOBSCAN_PASSWORD)
+    submit = page.query_selector(
+        'button[type="submit"], input[type="submit"], '
+        "button:has-text('Sign in'), button:has-text('Log in')"
+    )
+    if submit:
+        submit.click()
+    # Wait for the sign-in form to go away instead of sleeping.
+    try:
+        page.wait_for_selector('input[type="password"]', state="detached", timeout=_LOGIN_DEADLINE_MS)
+    except Exception:
+        pass
+    #page.goto("https://www.jobscan.co/resume-scanner", wait_until="networkidle")
+    with timed_navigation("JobScan"):
+        page.goto("https://app.jobscan.co/dashboard", wait_until="networkidle")
+    if not _session_expired(page):
+        # Save cookies + local storage so later scans and runs skip this flow.
+        os.makedirs(os.path.dirname(JOBSCAN_STORAGE_STATE) or ".", exist_ok=True)
+        page.context.storage_state(path=JOBSCAN_STORAGE_STATE)
+
+
+def _scan_on_page(page, resume_text: str, job_description: str) -> JobScanResult:
+    """Submit one scan on a leased browser-pool page and extract the results."""
+
+    from playwright.sync_api import TimeoutError as PlaywrightTimeout
 
     summary = ""
     details = ""
@@ -37,218 +106,208 @@ def _run_playwright_scan(resume_text: str, job_description: str, headless: bool)
     raw_html = ""
     error_msg: Optional[str] = None
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=headless)
-        try:
-            page = browser.new_page()
-            page.set_default_timeout(30000)
+    try:
+        page.set_default_timeout(30000)
 
-            #page.goto("https://www.jobscan.co/resume-scanner", wait_until="networkidle")
+        #page.goto("https://www.jobscan.co/resume-scanner", wait_until="networkidle")
+        with timed_navigation("JobScan"):
             page.goto("https://app.jobscan.co/dashboard", wait_until="networkidle")
 
-            # Optional login if credentials are provided.
-            if JOBSCAN_EMAIL and JOBSCAN_PASSWORD:
-                try:
-                    sign_in = page.query_selector(
-                        "a:has-text('Sign in'), a:has-text('Log in'), "
-                        "button:has-text('Sign in'), button:has-text('Log in')"
-                    )
-                    if sign_in and sign_in.is_visible():
-                        sign_in.click()
-                        page.wait_for_timeout(2000)
-                    email_el = page.query_selector(
-                        'input[type="email"], input[name*="email"], input[placeholder*="email"]'
-                    )
-                    pass_el = page.query_selector(
-                        'input[type="password"], input[name*="password"]'
-                    )
-                    if email_el and pass_el:
-                        email_el.fill(JOBSCAN_EMAIL)
-                        pass_el.fill(JOBSCAN_PASSWORD)
-                        submit = page.query_selector(
-                            'button[type="submit"], input[type="submit"], '
-                            "button:has-text('Sign in'), button:has-text('Log in')"
-                        )
-                        if submit:
-                            submit.click()
-                        page.wait_for_timeout(4000)
-                        #page.goto("https://www.jobscan.co/resume-scanner", wait_until="networkidle")
-                        page.goto("https://app.jobscan.co/dashboard", wait_until="networkidle")
-                except Exception:
-                    # If login fails, continue anonymously if possible.
-                    pass
-
-            # Find resume and job description textareas.
-            resume_selectors = [
-                'textarea[placeholder*="resume"]',
-                'textarea[placeholder*="Resume"]',
-                'textarea[name*="resume"]',
-                "#resume-input",
-                "[data-testid='resume-input']",
-                "textarea",
-            ]
-            job_desc_selectors = [
-                'textarea[placeholder*="job"]',
-                'textarea[placeholder*="Job"]',
-                'textarea[name*="description"]',
-                "#job-description",
-                "[data-testid='job-description']",
-            ]
-
-            resume_filled = False
-            for sel in resume_selectors:
-                try:
-                    el = page.wait_for_selector(sel, timeout=5000)
-                    if el:
-                        el.fill("")
-                        el.fill(resume_text[:15000])
-                        resume_filled = True
-                        break
-                except Exception:
-                    continue
-
-            if not resume_filled:
-                # Fallback: first textarea = resume, second = job description
-                textareas = page.query_selector_all("textarea")
-                if len(textareas) >= 1:
-                    textareas[0].fill("")
-                    textareas[0].fill(resume_text[:15000])
+        # Log in only when there is no saved session or it has expired.
+        if JOBSCAN_EMAIL and JOBSCAN_PASSWORD and _session_expired(page):
+            try:
+                _log_in(page)
+            except Exception:
+                # If login fails, continue anonymously if possible.
+                pass
+
+        # Find resume and job description textareas.
+        resume_selectors = [
+            'textarea[placeholder*="resume"]',
+            'textarea[placeholder*="Resume"]',
+            'textarea[name*="resume"]',
+            "#resume-input",
+            "[data-testid='resume-input']",
+            "textarea",
+        ]
+        job_desc_selectors = [
+            'textarea[placeholder*="job"]',
+            'textarea[placeholder*="Job"]',
+            'textarea[name*="description"]',
+            "#job-description",
+            "[data-testid='job-description']",
+        ]
+
+        resume_filled = False
+        for sel in resume_selectors:
+            try:
+                el = page.wait_for_selector(sel, timeout=5000)
+                if el:
+                    el.fill("")
+                    el.fill(resume_text[:15000])
                     resume_filled = True
-                if len(textareas) >= 2:
-                    textareas[1].fill("")
-                    textareas[1].fill(job_description[:15000])
-
-            if not resume_filled:
-                error_msg = "Could not find resume input on JobScan page"
-                return JobScanResult(
-                    match_score=None,
-                    summary="",
-                    details="",
-                    raw_html=page.content(),
-                    success=False,
-                    error=error_msg,
-                )
-
-            # Fill job description if still needed.
-            job_filled = False
-            for sel in job_desc_selectors:
-                try:
-                    el = page.query_selector(sel)
-                    if el:
-                        el.fill("")
-                        el.fill(job_description[:15000])
-                        job_filled = True
-                        break
-                except Exception:
-                    continue
-            if not job_filled and len(page.query_selector_all("textarea")) >= 2:
-                page.query_selector_all("textarea")[1].fill("")
-                page.query_selector_all("textarea")[1].fill(job_description[:15000])
-                job_filled = True
-
-            # Click scan / compare button.
-            scan_selectors = [
-                "button:has-text('Scan')",
-                "button:has-text('Compare')",
-                "button:has-text('Analyze')",
-                "[type='submit']",
-                "button[type='submit']",
-                "a:has-text('Scan')",
-                ".scan-button",
-            ]
-            clicked = False
-            for sel in scan_selectors:
-                try:
-                    btn = page.query_selector(sel)
-                    if btn and btn.is_visible():
-                        btn.click()
-                        clicked = True
-                        break
-                except Exception:
-                    continue
-            if not clicked:
-                error_msg = "Could not find Scan/Compare button"
-                return JobScanResult(
-                    match_score=None,
-                    summary=summary,
-                    details=details,
-                    raw_html=page.content(),
-                    success=False,
-                    error=error_msg,
-                )
-
-            # Wait for results.
-            page.wait_for_timeout(8000)
-            raw_html = page.content()
-
-            # Extract match score from a visible element.
-            score_el = page.query_selector(
-                "[class*='score'], [class*='match'], .percentage, [data-testid*='score']"
+                    break
+            except Exception:
+                continue
+
+        if not resume_filled:
+            # Fallback: first textarea = resume, second = job description
+            textareas = page.query_selector_all("textarea")
+            if len(textareas) >= 1:
+                textareas[0].fill("")
+                textareas[0].fill(resume_text[:15000])
+                resume_filled = True
+            if len(textareas) >= 2:
+                textareas[1].fill("")
+                textareas[1].fill(job_description[:15000])
+
+        if not resume_filled:
+            error_msg = "Could not find resume input on JobScan page"
+            return JobScanResult(
+                match_score=None,
+                summary="",
+                details="",
+                raw_html_key=BLOB_STORE.put(page.content()),
+                success=False,
+                error=error_msg,
             )
-            if score_el:
-                score_text = score_el.inner_text()
-                match = re.search(r"(\\d{1,3})\\s*%?", score_text)
-                if match:
-                    match_score = 0 #min(100, max(0, int(match.group(1))))
-
-            # Fallback: search in raw HTML.
-            if match_score is None:
-                match = re.search(r"(\\d{1,3})\\s*%\\s*(?:match|score)", raw_html, re.I)
-                if match:
-                    match_score = 0 #min(100, max(0, int(match.group(1))))
-
-            # Capture a large text block from the results area for human review.
-            result_selectors = [
-                "[class*='result']",
-                "[class*='report']",
-                "main",
-                ".content",
-            ]
-            for sel in result_selectors:
+
+        # Fill job description if still needed.
+        job_filled = False
+        for sel in job_desc_selectors:
+            try:
                 el = page.query_selector(sel)
                 if el:
-                    text = el.inner_text()
-                    if "match" in text.lower() or "keyword" in text.lower() or "%" in text:
-                        details = text[:8000]
-                        if match_score is None and "%" in text:
-                            m = re.search(r"(\\d{1,3})\\s*%", text)
-                            if m:
-                                match_score = 0 #min(100, max(0, int(m.group(1))))
-                        break
-
-            if match_score is not None:
-                summary = f"Match score: {match_score}%"
-            else:
-                summary = "Scan completed; match score could not be extracted automatically."
-
-        except PlaywrightTimeout as e:
-            error_msg = f"Timeout: {e}"
-        except Exception as e:
-            error_msg = str(e)
-        finally:
-            browser.close()
+                    el.fill("")
+                    el.fill(job_description[:15000])
+                    job_filled = True
+                    break
+            except Exception:
+                continue
+        if not job_filled and len(page.query_selector_all("textarea")) >= 2:
+            page.query_selector_all("textarea")[1].fill("")
+            page.query_selector_all("textarea")[1].fill(job_description[:15000])
+            job_filled = True
+
+        # Click scan / compare button.
+        scan_selectors = [
+            "button:has-text('Scan')",
+            "button:has-text('Compare')",
+            "button:has-text('Analyze')",
+            "[type='submit']",
+            "button[type='submit']",
+            "a:has-text('Scan')",
+            ".scan-button",
+        ]
+        clicked = False
+        for sel in scan_selectors:
+            try:
+                btn = page.query_selector(sel)
+                if btn and btn.is_visible():
+                    btn.click()
+                    clicked = True
+                    break
+            except Exception:
+                continue
+        if not clicked:
+            error_msg = "Could not find Scan/Compare button"
+            return JobScanResult(
+                match_score=None,
+                summary=summary,
+                details=details,
+                raw_html_key=BLOB_STORE.put(page.content()),
+                success=False,
+                error=error_msg,
+            )
+
+        # Wait for the results panel to appear and its text to settle.
+        wait_for_any_selector(page, [_SCORE_SELECTOR], "jobscan.results", _RESULTS_DEADLINE_MS)
+        wait_for_text_stable(page, _RESULTS_SELECTOR, "jobscan.results_settle", _SETTLE_DEADLINE_MS)
+        raw_html = page.content()
+
+        # Extract match score from a visible element.
+        score_el = page.query_selector(_SCORE_SELECTOR)
+        if score_el:
+            score_text = score_el.inner_text()
+            match = re.search(r"(\\d{1,3})\\s*%?", score_text)
+            if match:
+                match_score = 0 #min(100, max(0, int(match.group(1))))
+
+        # Fallback: search in raw HTML.
+        if match_score is None:
+            match = re.search(r"(\\d{1,3})\\s*%\\s*(?:match|score)", raw_html, re.I)
+            if match:
+                match_score = 0 #min(100, max(0, int(match.group(1))))
+
+        # Capture a large text block from the results area for human review.
+        result_selectors = [
+            "[class*='result']",
+            "[class*='report']",
+            "main",
+            ".content",
+        ]
+        for sel in result_selectors:
+            el = page.query_selector(sel)
+            if el:
+                text = el.inner_text()
+                if "match" in text.lower() or "keyword" in text.lower() or "%" in text:
+                    details = text[:8000]
+                    if match_score is None and "%" in text:
+                        m = re.search(r"(\\d{1,3})\\s*%", text)
+                        if m:
+                            match_score = 0 #min(100, max(0, int(m.group(1))))
+                    break
+
+        if match_score is not None:
+            summary = f"Match score: {match_score}%"
+        else:
+            summary = "Scan completed; match score could not be extracted automatically."
+
+    except PlaywrightTimeout as e:
+        error_msg = f"Timeout: {e}"
+    except Exception as e:
+        error_msg = str(e)
 
     return JobScanResult(
         match_score=match_score,
         summary=summary,
         details=details,
-        raw_html=raw_html,
+        raw_html_key=BLOB_STORE.put(raw_html),
         success=error_msg is None,
         error=error_msg,
     )
 
 
+def _run_playwright_scan(resume_text: str, job_description: str, headless: bool) -> JobScanResult:
+    """Playwright implementation of JobScan submission and result extraction.
+
+    Headless scans lease a page from the shared browser pool; a headed scan gets a
+    one-off single-browser pool so the window is visible.
+    """
+
+    pool = get_browser_pool() if headless else BrowserPool(size=1, headless=False)
+    storage_state = JOBSCAN_STORAGE_STATE if JOBSCAN_EMAIL and JOBSCAN_PASSWORD else None
+    try:
+        return pool.run(
+            lambda page: _scan_on_page(page, resume_text, job_description),
+            storage_state=storage_state,
+        )
+    finally:
+        if not headless:
+            pool.shutdown()
+
+
 def run_jobscan(resume_text: str, job_description: str, headless: bool = True) -> JobScanResult:
     """Run JobScan and handle missing Playwright gracefully."""
 
     try:
-        return _run_playwright_scan(resume_text, job_description, headless)
+        with SCAN_SECONDS.time(backend="jobscan"):
+            return _run_playwright_scan(resume_text, job_description, headless)
     except Exception as e:
         return JobScanResult(
             match_score=None,
             summary="",
             details="",
-            raw_html="",
             success=False,
             error=(
                 "JobScan automation unavailable: "
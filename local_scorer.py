@@ -0,0 +1,161 @@
+"""Offline resume/job-description match scoring (alternative to JobScan).
+
+The resume is tokenized once per resume text. Each batch of job descriptions becomes
+one sublinear term-frequency matrix over its keywords (unigrams and bigrams), and
+every listing is scored in a single vectorized pass. The weighting is fixed rather
+than derived from the batch (no IDF), so a score does not depend on which other
+descriptions were scored with it:
+
+- ``match_score``: share of the job's keyword weight that the resume covers
+- ``summary``: score plus cosine similarity and matched/top keyword counts
+- ``details``: matched keywords and the highest-weighted missing keywords (the gap)
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from config import LOCAL_SCORER_MAX_VOCAB, LOCAL_SCORER_TOP_KEYWORDS
+from jobscan_client import JobScanResult
+from metrics import SCAN_SECONDS
+
+
+# Part of the result-cache key: bump when a change alters scores, so cached ones are not reused.
+SCORE_VERSION = "2"
+
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+# Bigrams never span these, so "AWS, Docker" does not become "aws docker".
+_PHRASE_BREAK_RE = re.compile(r"[,;:()\[\]/|\n\u2022]|\.\s")
+
+# Common English words plus job-ad boilerplate that says nothing about skills.
+_STOPWORDS = frozenset(
+    """
+    a about above across after all also am an and any are as at be been being both but by can
+    could did do does doing for from had has have having he her here him his how i if in into is
+    it its just may me might more most must my no not of on or our out over own per same she
+    should so some such than that the their them then there these they this those through to too
+    under up us very was we were what when where which while who whom why will with within would
+    you your yours
+    ability able candidate candidates company day days etc excellent experience experienced
+    including job jobs looking need needs new opportunity opportunities plus position preferred
+    seeking
+    required requirement requirements responsibilities responsible role roles skills strong team
+    teams work working year years benefits salary apply applicants employer equal employment
+    """.split()
+)
+
+
+def _doc_terms(tokens: List[str]) -> Dict[str, int]:
+    """Term counts of one job, capped to its LOCAL_SCORER_MAX_VOCAB most frequent terms."""
+
+    counts: Dict[str, int] = {}
+    for term in tokens:
+        counts[term] = counts.get(term, 0) + 1
+    kept = sorted(counts, key=lambda t: (-counts[t], t))[:LOCAL_SCORER_MAX_VOCAB]
+    return {term: counts[term] for term in kept}
+
+
+def _tokens(text: str) -> List[str]:
+    words: List[str] = []
+    bigrams: List[str] = []
+    for phrase in _PHRASE_BREAK_RE.split((text or "").lower()):
+        phrase_words = [w.rstrip(".") for w in _TOKEN_RE.findall(phrase)]
+        phrase_words = [w for w in phrase_words if len(w) > 1 and w not in _STOPWORDS]
+        words.extend(phrase_words)
+        bigrams.extend(f"{a} {b}" for a, b in zip(phrase_words, phrase_words[1:]))
+    return words + bigrams
+
+
+class LocalScorer:
+    """Scores job descriptions against one resume; build once, reuse for every batch."""
+
+    def __init__(self, resume_text: str):
+        self.resume_terms = frozenset(_tokens(resume_text))
+
+    def score_many(self, descriptions: Sequence[str]) -> List[JobScanResult]:
+        """Score all ``descriptions`` in one batched NumPy pass.
+
+        Batches in a pipelined run are whatever happens to be queued and results are
+        cached, so nothing in a row may depend on the other rows: each job keeps its own
+        most frequent terms and the weighting is fixed (sublinear TF, no batch-wide IDF).
+        """
+
+        if not descriptions:
+            return []
+        docs = [_doc_terms(_tokens(d)) for d in descriptions]
+
+        # Columns: every kept term of the batch, alphabetical so ties always break the same way.
+        vocab_terms = sorted(set().union(*docs))
+        vocab = {term: i for i, term in enumerate(vocab_terms)}
+
+        counts = np.zeros((len(docs), len(vocab)), dtype=np.float64)
+        for row, doc in enumerate(docs):
+            if doc:
+                counts[row, [vocab[t] for t in doc]] = list(doc.values())
+        weights = np.log1p(counts)  # sublinear TF, shape (docs, vocab)
+
+        in_resume = np.array([t in self.resume_terms for t in vocab_terms], dtype=np.float64)
+        totals = weights.sum(axis=1)
+        covered = weights @ in_resume
+        coverage = np.divide(covered, totals, out=np.zeros_like(totals), where=totals > 0)
+
+        # The resume vector is compared over each job's own terms only, not the batch's.
+        resume_norms = np.sqrt((weights > 0) @ in_resume)
+        norms = np.linalg.norm(weights, axis=1) * resume_norms
+        cosine = np.divide(covered, norms, out=np.zeros_like(norms), where=norms > 0)
+
+        # Top keywords per job by weight, for the keyword-gap details.
+        k = min(LOCAL_SCORER_TOP_KEYWORDS, len(vocab_terms))
+        top = np.argsort(-weights, axis=1, kind="stable")[:, :k]
+
+        results = []
+        for row in range(len(docs)):
+            if totals[row] <= 0:
+                results.append(
+                    JobScanResult(
+                        match_score=None,
+                        summary="No scorable keywords in job description",
+                        details="",
+                        success=False,
+                        error="Empty keyword vector",
+                    )
+                )
+                continue
+            keywords = [vocab_terms[i] for i in top[row] if weights[row, i] > 0]
+            matched = [t for t in keywords if t in self.resume_terms]
+            missing = [t for t in keywords if t not in self.resume_terms]
+            score = int(round(float(coverage[row]) * 100))
+            results.append(
+                JobScanResult(
+                    match_score=score,
+                    summary=(
+                        f"Match score: {score}% (local keyword match; "
+                        f"{len(matched)}/{len(keywords)} top keywords found, "
+                        f"cosine {float(cosine[row]):.2f})"
+                    ),
+                    details=(
+                        "Matched keywords: " + (", ".join(matched) or "none") + "\n"
+                        "Missing keywords: " + (", ".join(missing) or "none")
+                    ),
+                    success=True,
+                )
+            )
+        return results
+
+
+@lru_cache(maxsize=4)
+def get_scorer(resume_text: str) -> LocalScorer:
+    """Scorer for ``resume_text``; the resume is tokenized only once per distinct text."""
+
+    return LocalScorer(resume_text)
+
+
+def score_descriptions(resume_text: str, descriptions: Sequence[str]) -> List[JobScanResult]:
+    """Score descriptions locally against ``resume_text``."""
+
+    with SCAN_SECONDS.time(backend="local"):
+        return get_scorer(resume_text).score_many(descriptions)
@@ -0,0 +1,247 @@
+"""Process-wide counters and histograms, exposed in Prometheus text format at /metrics.
+
+A small stdlib-only registry (no prometheus_client dependency): each metric keeps one
+series per label combination, guarded by its own lock so crawler, hydration and
+comparison threads can record concurrently. :func:`render` produces the text
+exposition format (version 0.0.4) that Prometheus scrapes.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans a sub-millisecond parse up to a slow JobScan scan.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        return "\n".join(lines + self.samples())
+
+
+class Counter(_Metric):
+    """Monotonically increasing count per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, k)} {_number(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """Observations bucketed by upper bound (cumulative), with running sum and count."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # Per series: [count per bucket (non-cumulative)..., sum, count]
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the wall-clock duration of the ``with`` block, even if it raises."""
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def totals(self) -> Dict[LabelValues, Tuple[float, int]]:
+        """``(sum, count)`` of every series, keyed by label values in ``labelnames`` order."""
+
+        with self._lock:
+            return {key: (s[-2], int(s[-1])) for key, s in self._series.items()}
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._series.items())
+        lines = []
+        names = self.labelnames + ("le",)
+        for key, series in items:
+            cumulative = 0.0
+            for bound, n in zip(self.buckets, series):
+                cumulative += n
+                bucket = _labels(names, key + (_number(bound),))
+                lines.append(f"{self.name}_bucket{bucket} {_number(cumulative)}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(series[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {_number(series[-1])}")
+        return lines
+
+
+REGISTRY: List[_Metric] = []
+
+
+def render() -> str:
+    """Every registered metric in Prometheus text exposition format."""
+
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+# --- Crawl ----------------------------------------------------------------------------
+
+HTTP_FETCH_SECONDS = Histogram(
+    "jobscan_http_fetch_seconds",
+    "Network time of crawler HTTP requests by HTTP status, or error (cache hits excluded).",
+    ("source", "outcome"),
+)
+RATE_LIMIT_WAIT_SECONDS = Histogram(
+    "jobscan_rate_limit_wait_seconds",
+    "Time requests spent waiting for per-host rate-limit budget.",
+    ("source", "host"),
+)
+PARSE_SECONDS = Histogram(
+    "jobscan_parse_seconds",
+    "HTML parse time per page type.",
+    ("page",),
+)
+LISTINGS_FOUND = Counter(
+    "jobscan_listings_found_total",
+    "Listings yielded by site searches (placeholders included), before deduplication.",
+    ("source",),
+)
+LISTINGS_DEDUPED = Counter(
+    "jobscan_listings_deduped_total",
+    "Listings dropped as duplicates (exact key, near-duplicate, or seen in an earlier run).",
+    ("source", "reason"),
+)
+LISTINGS_FAILED = Counter(
+    "jobscan_listings_failed_total",
+    "Failures per stage: search query, description fetch or comparison.",
+    ("source", "stage"),
+)
+CIRCUIT_OPENED = Counter(
+    "jobscan_circuit_opened_total",
+    "Times a source's circuit breaker opened (or reopened after a failed probe).",
+    ("source",),
+)
+CIRCUIT_REJECTED = Counter(
+    "jobscan_circuit_rejected_total",
+    "Requests skipped because the source's circuit breaker was open.",
+    ("source",),
+)
+FETCH_RETRIES = Counter(
+    "jobscan_fetch_retries_total",
+    "Crawler requests retried after a connection error, 429 or 5xx.",
+    ("source",),
+)
+FETCH_BACKOFF_SECONDS = Histogram(
+    "jobscan_fetch_backoff_seconds",
+    "Time crawler requests slept before a retry (backoff or Retry-After).",
+    ("source",),
+)
+REQUESTS_SAVED = Counter(
+    "jobscan_requests_saved_total",
+    "Upstream search requests avoided by the query planner (merged) or coalescing (memo, joined).",
+    ("source", "reason"),
+)
+
+# --- Browser and comparison ----------------------------------------------------------
+
+BROWSER_LAUNCH_SECONDS = Histogram(
+    "jobscan_browser_launch_seconds",
+    "Time to launch a pooled Chromium browser.",
+)
+BROWSER_NAVIGATION_SECONDS = Histogram(
+    "jobscan_browser_navigation_seconds",
+    "Playwright page.goto() time per site (LinkedIn, JobScan), with request blocking on or off.",
+    ("site", "blocking"),
+)
+PAGE_WAIT_SECONDS = Histogram(
+    "jobscan_page_wait_seconds",
+    "Condition-based browser waits per step (linkedin.render, jobscan.results, ...) and outcome.",
+    ("step", "outcome"),
+)
+BROWSER_REQUESTS_BLOCKED = Counter(
+    "jobscan_browser_requests_blocked_total",
+    "Browser requests aborted by request interception, by reason (resource type, tracker, third-party script).",
+    ("reason",),
+)
+BROWSER_BYTES_SAVED = Counter(
+    "jobscan_browser_bytes_saved_total",
+    "Estimated bytes not downloaded because their requests were blocked.",
+    ("reason",),
+)
+SCAN_SECONDS = Histogram(
+    "jobscan_scan_seconds",
+    "Comparison time: one JobScan scan, or one local scoring batch.",
+    ("backend",),
+)
@@ -0,0 +1,191 @@
+"""Cross-source near-duplicate detection for job listings.
+
+The same posting often shows up on Indeed, LinkedIn and BuiltIn with slightly different
+titles, so the exact (title, company, source) dedupe key keeps all of them. Here each
+description is reduced to a MinHash signature over word 5-shingles; LSH banding puts
+likely-similar signatures in a shared bucket, so candidate pairs come from bucket
+collisions instead of comparing every pair. Candidates whose estimated Jaccard
+similarity reaches NEAR_DUP_THRESHOLD are clustered (at most one listing per source),
+and only one representative per cluster is compared; it lists the others in
+``also_listed`` so the report can link them.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from config import NEAR_DUP_THRESHOLD
+from crawlers.base import JobListing
+from metrics import LISTINGS_DEDUPED
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+_SHINGLE = 5
+# Fewer shingles than this (search snippets, stubs) is too little text to fingerprint.
+_MIN_SHINGLES = 10
+
+# 128 hash functions in 16 bands of 8 rows: pairs at Jaccard ~0.7+ very likely share a
+# bucket; the estimated similarity is then checked against NEAR_DUP_THRESHOLD.
+_BANDS = 16
+_ROWS = 8
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(0x5EED)
+_A = _rng.integers(1, _PRIME, size=_BANDS * _ROWS, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, size=_BANDS * _ROWS, dtype=np.uint64)
+
+_stats = {"fingerprinted": 0, "clusters": 0, "collapsed": 0}
+_stats_lock = threading.Lock()
+
+
+def _signature(text: str) -> Optional[np.ndarray]:
+    words = _WORD_RE.findall((text or "").lower())
+    shingles = {" ".join(words[i : i + _SHINGLE]) for i in range(len(words) - _SHINGLE + 1)}
+    if len(shingles) < _MIN_SHINGLES:
+        return None
+    hashes = np.fromiter(
+        (zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles)
+    )
+    # (a * x + b) mod p for every hash function and shingle; the column minimum is the signature.
+    return ((_A[:, None] * hashes[None, :] + _B[:, None]) % _PRIME).min(axis=1)
+
+
+class _Clusters:
+    """Union-find over listing indices that refuses to put two listings of one source together."""
+
+    def __init__(self, listings: List[JobListing]):
+        self.parent = list(range(len(listings)))
+        self.sources = [{job.source} for job in listings]
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        ri, rj = self.find(i), self.find(j)
+        if ri == rj or self.sources[ri] & self.sources[rj]:
+            return
+        self.parent[rj] = ri
+        self.sources[ri] |= self.sources[rj]
+
+
+def collapse_duplicates(
+    listings: List[JobListing], threshold: float = NEAR_DUP_THRESHOLD
+) -> List[JobListing]:
+    """One listing per cross-source duplicate cluster, in first-seen order.
+
+    The representative is the member with the longest description; the other members'
+    (source, url) pairs go into its ``also_listed``.
+    """
+
+    signatures = [_signature(job.description) for job in listings]
+    buckets: Dict[tuple, List[int]] = defaultdict(list)
+    for i, sig in enumerate(signatures):
+        if sig is None:
+            continue
+        for band in range(_BANDS):
+            buckets[(band, sig[band * _ROWS : (band + 1) * _ROWS].tobytes())].append(i)
+
+    clusters = _Clusters(listings)
+    checked = set()
+    for members in buckets.values():
+        for a_pos, i in enumerate(members):
+            for j in members[a_pos + 1 :]:
+                if (i, j) in checked or listings[i].source == listings[j].source:
+                    continue
+                checked.add((i, j))
+                if float(np.mean(signatures[i] == signatures[j])) >= threshold:
+                    clusters.union(i, j)
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for i in range(len(listings)):
+        groups[clusters.find(i)].append(i)
+
+    out = []
+    for members in sorted(groups.values(), key=lambda m: m[0]):
+        rep = max(members, key=lambda i: (len(listings[i].description or ""), -i))
+        job = listings[rep]
+        job.also_listed = [(listings[i].source, listings[i].url) for i in members if i != rep]
+        for source, _ in job.also_listed:
+            LISTINGS_DEDUPED.inc(source=source, reason="near_duplicate")
+        out.append(job)
+
+    with _stats_lock:
+        _stats["fingerprinted"] += sum(sig is not None for sig in signatures)
+        _stats["clusters"] += sum(len(m) > 1 for m in groups.values())
+        _stats["collapsed"] += len(listings) - len(out)
+    return out
+
+
+class DuplicateIndex:
+    """Incremental variant of :func:`collapse_duplicates` for the pipelined run.
+
+    Listings arrive one at a time, so the first-seen listing of a cluster represents it
+    (it may already be comparing); later duplicates are attached to its ``also_listed``.
+    Once the representative's report row is built (:meth:`seal`), its ``also_listed`` is
+    final; a duplicate arriving after that is not attached (see :meth:`attached`).
+    """
+
+    def __init__(self, threshold: float = NEAR_DUP_THRESHOLD):
+        self.threshold = threshold
+        self._buckets: Dict[tuple, List[int]] = defaultdict(list)
+        self._reps: List[JobListing] = []
+        self._signatures: List[np.ndarray] = []
+        self._sealed: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def add(self, job: JobListing) -> Optional[JobListing]:
+        """Register ``job``; return the representative it duplicates, or None if it is new."""
+
+        sig = _signature(job.description)
+        if sig is None:
+            return None
+        keys = [(band, sig[band * _ROWS : (band + 1) * _ROWS].tobytes()) for band in range(_BANDS)]
+        with self._lock:
+            candidates = {i for key in keys for i in self._buckets.get(key, ())}
+            for i in sorted(candidates):
+                rep = self._reps[i]
+                taken = {rep.source} | {source for source, _ in rep.also_listed}
+                if job.source in taken:
+                    continue
+                if float(np.mean(self._signatures[i] == sig)) >= self.threshold:
+                    if id(rep) not in self._sealed:
+                        rep.also_listed.append((job.source, job.url))
+                    LISTINGS_DEDUPED.inc(source=job.source, reason="near_duplicate")
+                    with _stats_lock:
+                        _stats["fingerprinted"] += 1
+                        _stats["collapsed"] += 1
+                        _stats["clusters"] += len(rep.also_listed) == 1
+                    return rep
+            index = len(self._reps)
+            self._reps.append(job)
+            self._signatures.append(sig)
+            for key in keys:
+                self._buckets[key].append(index)
+        with _stats_lock:
+            _stats["fingerprinted"] += 1
+        return None
+
+    def seal(self, job: JobListing) -> Tuple[Tuple[str, str], ...]:
+        """Freeze ``job``'s duplicates for its report row and return them."""
+
+        with self._lock:
+            self._sealed.add(id(job))
+            return tuple(job.also_listed)
+
+    def attached(self, rep: JobListing, job: JobListing) -> bool:
+        """Whether :meth:`add` listed ``job`` under ``rep`` (False if ``rep`` was already sealed)."""
+
+        with self._lock:
+            return (job.source, job.url) in rep.also_listed
+
+
+def duplicate_stats() -> Dict[str, int]:
+    with _stats_lock:
+        return dict(_stats)
@@ -1,96 +1,876 @@
-"""Orchestrator: run crawlers across all job categories, then JobScan for each job."""
+"""Orchestrator: run crawlers across all job categories, then compare each job with the resume."""
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional
+import asyncio
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
-from config import JOB_CATEGORIES, MAX_JOBS_PER_CATEGORY_PER_SITE, MAX_JOBS_TOTAL, RESUME_TEXT
+from blob_store import BLOB_STORE
+from config import (
+    COMPARE_BATCH_SIZE,
+    COMPARE_WORKERS,
+    COMPARISON_BACKEND,
+    CRAWL_ENGINE,
+    CRAWL_WORKERS,
+    HYDRATE_WORKERS,
+    INCREMENTAL_NEW_ONLY,
+    JOB_INDEX_ENABLED,
+    MAX_JOBS_TOTAL,
+    NEAR_DUP_ENABLED,
+    PIPELINE_ENABLED,
+    PIPELINE_QUEUE_SIZE,
+    RESULT_CACHE_ENABLED,
+    RESUME_TEXT,
+)
 from crawlers import CRAWLERS
-from crawlers.base import JobListing
+from crawlers.base import JobListing, close_async_client, session_stats
+from crawlers.circuit_breaker import CIRCUIT_BREAKERS
+from crawlers.http_cache import HTTP_CACHE
+from crawlers.rate_limit import RATE_LIMITER
+from crawlers.query_planner import QUERY_PLANNER, PlannedQuery, planner_stats
+from crawlers.parsing import parse_stats
+from job_index import JOB_INDEX
 from jobscan_client import run_jobscan, JobScanResult
+from local_scorer import SCORE_VERSION, score_descriptions
+from metrics import LISTINGS_DEDUPED, LISTINGS_FAILED, LISTINGS_FOUND
+from near_duplicates import DuplicateIndex, collapse_duplicates, duplicate_stats
+from page_blocking import blocking_stats
+from page_waits import wait_counters
+from result_cache import RESULT_CACHE, result_key
 
+log = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True)
 class ReportRow:
     job_title: str
     company: str
     source: str
     comparison_result: Optional[JobScanResult]
     job_url: str = ""
+    # (source, url) of the same posting on other sites; it was compared only once.
+    also_listed: Tuple[Tuple[str, str], ...] = ()
+    # Set on a pipelined run's update row: this posting is a duplicate found after the
+    # (source, url) representative's row was sent; it repeats that row's comparison.
+    duplicate_of: Tuple[str, str] = ()
+
+
+class RunCancelled(Exception):
+    """Raised inside a run once its cancellation has been requested."""
+
+
+class RunProgress:
+    """Thread-safe per-stage counters and a cancellation flag for one run.
+
+    Counters come in ``<name>_done`` / ``<name>_total`` pairs: queries, descriptions
+    and scans.
+    """
+
+    def __init__(self):
+        self.stage = "queued"
+        self.counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+
+    def set_stage(self, stage: str) -> None:
+        self.check()
+        with self._lock:
+            self.stage = stage
+
+    def set_total(self, name: str, total: int) -> None:
+        with self._lock:
+            self.counts[f"{name}_total"] = total
+            self.counts.setdefault(f"{name}_done", 0)
+
+    def add_total(self, name: str, n: int = 1) -> None:
+        """Grow a total as work is discovered (the pipelined run has no totals up front)."""
+        with self._lock:
+            self.counts[f"{name}_total"] = self.counts.get(f"{name}_total", 0) + n
+            self.counts.setdefault(f"{name}_done", 0)
+
+    def advance(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counts[f"{name}_done"] = self.counts.get(f"{name}_done", 0) + n
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check(self) -> None:
+        """Raise RunCancelled if the run was cancelled; called between units of work."""
+        if self._cancelled.is_set():
+            raise RunCancelled()
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {"stage": self.stage, **self.counts}
+
+
+def _flatten(per_key: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+    """``{"host": {"requests": 3}}`` -> ``{"host requests": 3}``, so run deltas apply per counter."""
+
+    return {f"{key} {name}": value for key, values in sorted(per_key.items()) for name, value in values.items()}
+
+
+def stats_snapshot() -> Dict[str, Dict[str, float]]:
+    """Process-wide counters for the report's "Run statistics" section."""
+
+    return {
+        "HTTP cache": HTTP_CACHE.stats(),
+        "Result cache": RESULT_CACHE.stats(),
+        "Job index": JOB_INDEX.stats(),
+        "Page captures": BLOB_STORE.stats(),
+        "HTML parsing": parse_stats(),
+        "Connections": _flatten(session_stats()),
+        "Rate limiting": _flatten(RATE_LIMITER.stats()),
+        "Near duplicates": duplicate_stats(),
+        "Circuit breakers": CIRCUIT_BREAKERS.stats(),
+        "Query planner": planner_stats(),
+        "Browser requests": blocking_stats(),
+        "Page waits": wait_counters(),
+    }
+
+
+def stats_since(before: Dict[str, Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """Counters accumulated since ``before`` (an earlier :func:`stats_snapshot`)."""
+
+    return {
+        group: {k: v - before.get(group, {}).get(k, 0) for k, v in values.items()}
+        for group, values in stats_snapshot().items()
+    }
+
 
+def _dedupe_key(job: JobListing):
+    return (job.title.strip().lower(), job.company.strip().lower(), job.source)
 
-def crawl_all_sites() -> List[JobListing]:
-    """Run all crawlers for all job categories, dedupe by (title, company, source), cap total."""
+
+def _accept(job: JobListing, seen, out: List[JobListing]) -> bool:
+    """Add one search listing to a source's results (deduped); False once the source is full."""
+
+    LISTINGS_FOUND.inc(source=job.source)
+    key = _dedupe_key(job)
+    if key in seen:
+        LISTINGS_DEDUPED.inc(source=job.source, reason="exact")
+    else:
+        seen.add(key)
+        if job.title and "(unavailable)" not in job.title.lower():
+            out.append(job)
+    return len(out) < MAX_JOBS_TOTAL
+
+
+def _circuit_open(crawler) -> bool:
+    """True while the source's circuit breaker is skipping it; its remaining queries are dropped."""
+
+    return CIRCUIT_BREAKERS.get(crawler.source_name).is_open
+
+
+def _search_failed(crawler, query: str, e: Exception) -> None:
+    LISTINGS_FAILED.inc(source=crawler.source_name, stage="search")
+    log.warning("%s search for %r failed: %s", crawler.source_name, query, e)
+
+
+def _query_done(crawler, planned: PlannedQuery, progress: RunProgress) -> None:
+    QUERY_PLANNER.searched(crawler.source_name, planned)
+    progress.advance("queries")
+
+
+def _query_succeeded(crawler, planned: PlannedQuery, new: int, real: int) -> None:
+    """Feed the planner's skip rule, but only from searches that returned actual listings.
+
+    A blocked site or an open circuit breaker yields placeholders (or nothing); that says
+    nothing about whether the query finds new postings.
+    """
+
+    if real:
+        QUERY_PLANNER.record(crawler.source_name, planned, new)
+
+
+def _crawl_source(crawler, progress: RunProgress) -> List[JobListing]:
+    """Run one crawler over its planned queries (see crawlers.query_planner), deduping within the source.
+
+    Each search streams up to its planned number of listings (MAX_JOBS_PER_CATEGORY_PER_SITE
+    per category it covers) across result pages. A single source can never contribute
+    more than MAX_JOBS_TOTAL listings, so the worker stops pulling there instead of
+    fetching more pages or queries.
+    """
 
     seen = set()
     out: List[JobListing] = []
+    for planned in QUERY_PLANNER.plan(crawler):
+        if len(out) >= MAX_JOBS_TOTAL or _circuit_open(crawler):
+            break
+        progress.check()
+        before = len(out)
+        real = 0
+        try:
+            # search() is lazy: breaking out here means no further result pages are fetched.
+            for job in crawler.search(planned.query, max_results=planned.max_results):
+                real += not job.placeholder
+                if not _accept(job, seen, out):
+                    break
+        except Exception as e:
+            # If a query fails, keep what it yielded and let the remaining queries run.
+            _search_failed(crawler, planned.query, e)
+            continue
+        else:
+            _query_succeeded(crawler, planned, len(out) - before, real)
+        finally:
+            _query_done(crawler, planned, progress)
+    return out
 
-    for source_name, crawler in CRAWLERS.items():
-        for query in JOB_CATEGORIES:
-            if len(out) >= MAX_JOBS_TOTAL:
-                break
-            try:
-                listings = crawler.search(query, max_results=MAX_JOBS_PER_CATEGORY_PER_SITE)
-                for job in listings:
-                    key = (job.title.strip().lower(), job.company.strip().lower(), job.source)
-                    if key in seen:
-                        continue
-                    seen.add(key)
-                    if job.title and "(unavailable)" not in job.title.lower():
-                        out.append(job)
-                        if len(out) >= MAX_JOBS_TOTAL:
-                            break
-            except Exception:
-                # If a crawler fails, skip it so others can still run.
-                continue
-        if len(out) >= MAX_JOBS_TOTAL:
+
+async def _async_crawl_source(crawler, progress: RunProgress) -> List[JobListing]:
+    """Async variant of :func:`_crawl_source`."""
+
+    seen = set()
+    out: List[JobListing] = []
+    for planned in QUERY_PLANNER.plan(crawler):
+        if len(out) >= MAX_JOBS_TOTAL or _circuit_open(crawler):
             break
+        progress.check()
+        before = len(out)
+        real = 0
+        try:
+            search = crawler.async_search(planned.query, max_results=planned.max_results)
+            async with aclosing(search) as results:
+                async for job in results:
+                    real += not job.placeholder
+                    if not _accept(job, seen, out):
+                        break
+        except Exception as e:
+            _search_failed(crawler, planned.query, e)
+            continue
+        else:
+            _query_succeeded(crawler, planned, len(out) - before, real)
+        finally:
+            _query_done(crawler, planned, progress)
+    return out
+
 
+def _merge_sources(per_source: List[List[JobListing]]) -> List[JobListing]:
+    """Merge per-source results in CRAWLERS order, deduped and capped at MAX_JOBS_TOTAL."""
+
+    seen = set()
+    out: List[JobListing] = []
+    for listings in per_source:
+        for job in listings:
+            key = _dedupe_key(job)
+            if key in seen:
+                continue
+            seen.add(key)
+            out.append(job)
+            if len(out) >= MAX_JOBS_TOTAL:
+                return out
     return out
 
 
-def run_comparisons(
-    listings: List[JobListing],
-    resume_text: str = RESUME_TEXT,
-) -> List[ReportRow]:
-    """Run JobScan for each listing and build report rows."""
+def _crawler_for(job: JobListing):
+    for crawler in CRAWLERS.values():
+        if crawler.source_name == job.source:
+            return crawler
+    return None
 
-    """We'll skip the jobscan report for now until a future date"""
-    rows: List[ReportRow] = []
-    for job in listings:
-        desc = (job.description or "").strip()
-        """
+
+def _job_id(job: JobListing) -> str:
+    crawler = _crawler_for(job)
+    return crawler.job_id(job) if crawler else job.url
+
+
+def _hydrate_one(progress: RunProgress, job: JobListing) -> None:
+    progress.check()
+    crawler = _crawler_for(job)
+    try:
+        if crawler is not None:
+            crawler.hydrate(job)
+    except Exception as e:
+        # Keep the search snippet if the detail fetch fails.
+        LISTINGS_FAILED.inc(source=job.source, stage="description")
+        log.warning("%s description for %s failed: %s", job.source, job.url, e)
+    finally:
+        progress.advance("descriptions")
+
+
+def hydrate_descriptions(
+    listings: List[JobListing], progress: Optional[RunProgress] = None
+) -> List[JobListing]:
+    """Fetch full descriptions for deduped, capped listings (phase two of the crawl).
+
+    Runs on HYDRATE_WORKERS threads; per-host pacing comes from the rate limiter and
+    LinkedIn pages are bounded by the browser pool.
+    """
+
+    progress = progress or RunProgress()
+    progress.set_stage("descriptions")
+    progress.set_total("descriptions", len(listings))
+    hydrate = partial(_hydrate_one, progress)
+    if HYDRATE_WORKERS <= 1:
+        for job in listings:
+            hydrate(job)
+    else:
+        with ThreadPoolExecutor(max_workers=HYDRATE_WORKERS) as pool:
+            list(pool.map(hydrate, listings))
+    return listings
+
+
+async def _async_hydrate_one(progress: RunProgress, job: JobListing) -> None:
+    progress.check()
+    crawler = _crawler_for(job)
+    try:
+        if crawler is not None:
+            await crawler.async_hydrate(job)
+    except Exception as e:
+        LISTINGS_FAILED.inc(source=job.source, stage="description")
+        log.warning("%s description for %s failed: %s", job.source, job.url, e)
+    finally:
+        progress.advance("descriptions")
+
+
+async def async_hydrate_descriptions(
+    listings: List[JobListing], progress: Optional[RunProgress] = None
+) -> List[JobListing]:
+    """Async phase two: every detail fetch is a task on the running event loop."""
+
+    progress = progress or RunProgress()
+    progress.set_stage("descriptions")
+    progress.set_total("descriptions", len(listings))
+    await asyncio.gather(*(_async_hydrate_one(progress, job) for job in listings))
+    return listings
+
+
+def _update_job_index(listings: List[JobListing]) -> List[JobListing]:
+    """Record this run's postings in the job index (first/last seen).
+
+    With INCREMENTAL_NEW_ONLY, postings seen in an earlier run are dropped so only new
+    ones are compared and reported.
+    """
+
+    if not JOB_INDEX_ENABLED:
+        return listings
+    keyed = [(job.source, _job_id(job), job) for job in listings]
+    new = JOB_INDEX.record(keyed)
+    if not INCREMENTAL_NEW_ONLY:
+        return listings
+    fresh = []
+    for source, job_id, job in keyed:
+        if (source, job_id) in new:
+            fresh.append(job)
+        else:
+            LISTINGS_DEDUPED.inc(source=source, reason="seen_before")
+    return fresh
+
+
+def _finish_crawl(listings: List[JobListing]) -> List[JobListing]:
+    """Index every posting, then keep one representative per cross-source duplicate."""
+
+    listings = _update_job_index(listings)
+    return collapse_duplicates(listings) if NEAR_DUP_ENABLED else listings
+
+
+def _start_crawl(progress: Optional[RunProgress]) -> RunProgress:
+    progress = progress or RunProgress()
+    progress.set_stage("crawl")
+    progress.set_total("queries", sum(len(QUERY_PLANNER.plan(c)) for c in CRAWLERS.values()))
+    return progress
+
+
+async def async_crawl_all_sites(progress: Optional[RunProgress] = None) -> List[JobListing]:
+    """Crawl every source on one event loop and merge like :func:`crawl_all_sites`.
+
+    Sources run concurrently, then the detail pages of every surviving listing are
+    fetched as tasks on the same loop, so hundreds of requests are in flight without a
+    thread per request. Per-host pacing still comes from the shared rate limiter.
+    """
+
+    progress = _start_crawl(progress)
+    try:
+        per_source = await asyncio.gather(
+            *(_async_crawl_source(crawler, progress) for crawler in CRAWLERS.values())
+        )
+        listings = await async_hydrate_descriptions(_merge_sources(list(per_source)), progress)
+    finally:
+        await close_async_client()
+    return _finish_crawl(listings)
+
+
+def crawl_all_sites(progress: Optional[RunProgress] = None) -> List[JobListing]:
+    """Run all crawlers for all job categories, dedupe by (title, company, source), cap total.
+
+    After the descriptions are in, near-duplicate postings across sources are collapsed
+    to one listing each (NEAR_DUP_ENABLED), so the same job is compared only once.
+
+    Searches return stubs; full descriptions are fetched only for the deduped, capped
+    survivors (:func:`hydrate_descriptions`).
+
+    With CRAWL_WORKERS > 1 each source is crawled on its own worker thread. The
+    per-source results are merged in CRAWLERS order afterwards, so the dedupe and
+    the MAX_JOBS_TOTAL cap pick the same listings as a sequential crawl would.
+    CRAWL_ENGINE=async runs :func:`async_crawl_all_sites` instead.
+    """
+
+    if CRAWL_ENGINE == "async":
+        return asyncio.run(async_crawl_all_sites(progress))
+
+    progress = _start_crawl(progress)
+    crawl = partial(_crawl_source, progress=progress)
+    crawlers = list(CRAWLERS.values())
+    if CRAWL_WORKERS <= 1:
+        per_source = []
+        total = 0
+        for crawler in crawlers:
+            if total >= MAX_JOBS_TOTAL:
+                break
+            listings = crawl(crawler)
+            per_source.append(listings)
+            total += len(listings)
+    else:
+        with ThreadPoolExecutor(max_workers=min(CRAWL_WORKERS, len(crawlers))) as pool:
+            per_source = list(pool.map(crawl, crawlers))
+
+    return _finish_crawl(hydrate_descriptions(_merge_sources(per_source), progress))
+
+
+def _too_short_result() -> JobScanResult:
+    return JobScanResult(
+        match_score=None,
+        summary="Job description too short to scan",
+        details="",
+        success=False,
+        error="Description length < 50 characters",
+    )
+
+
+def _jobscan_each(
+    resume_text: str, descriptions: List[str], indices: List[int], progress: RunProgress
+) -> Iterator[Tuple[int, JobScanResult]]:
+    for i in indices:
+        progress.check()
+        yield i, run_jobscan(resume_text, descriptions[i], headless=True)
+
+
+def _iter_compare(
+    resume_text: str, descriptions: List[str], progress: RunProgress
+) -> Iterator[Tuple[int, JobScanResult]]:
+    """Yield ``(index, result)`` for every description as soon as its comparison is done.
+
+    COMPARISON_BACKEND picks the engine. Too-short descriptions and result-cache hits come
+    out first; the misses are then computed, and successful new results are stored for
+    the next run.
+    """
+
+    todo = []
+    for i, desc in enumerate(descriptions):
         if len(desc) < 50:
-            result = JobScanResult(
+            progress.advance("scans")
+            yield i, _too_short_result()
+        elif COMPARISON_BACKEND == "none":
+            progress.advance("scans")
+            yield i, JobScanResult(
                 match_score=None,
-                summary="Job description too short to scan",
+                summary="Comparison disabled (COMPARISON_BACKEND=none)",
                 details="",
-                raw_html="",
-                success=False,
-                error="Description length < 50 characters",
+                success=True,
             )
-        
         else:
-            result = run_jobscan(resume_text, desc, headless=True)
+            todo.append(i)
+
+    keys: Dict[int, str] = {}
+    if RESULT_CACHE_ENABLED:
+        backend = f"local/{SCORE_VERSION}" if COMPARISON_BACKEND == "local" else COMPARISON_BACKEND
+        misses = []
+        for i in todo:
+            keys[i] = result_key(backend, resume_text, descriptions[i])
+            cached = RESULT_CACHE.get(keys[i])
+            if cached is None:
+                misses.append(i)
+            else:
+                progress.advance("scans")
+                yield i, cached
+        todo = misses
+
+    if COMPARISON_BACKEND == "jobscan":
+        computed = _jobscan_each(resume_text, descriptions, todo, progress)
+    else:
+        # One batched NumPy pass over the uncached descriptions; scores do not depend on the batch.
+        computed = zip(todo, score_descriptions(resume_text, [descriptions[i] for i in todo]))
+
+    for i, result in computed:
+        if i in keys and result.success:
+            RESULT_CACHE.put(keys[i], result)
+        progress.advance("scans")
+        yield i, result
+
+
+def _start_scans(progress: Optional[RunProgress], total: int) -> RunProgress:
+    progress = progress or RunProgress()
+    progress.set_stage("scans")
+    progress.set_total("scans", total)
+    return progress
+
+
+def _report_row(
+    job: JobListing, result: JobScanResult, also_listed: Optional[Tuple[Tuple[str, str], ...]] = None
+) -> ReportRow:
+    if not result.success:
+        LISTINGS_FAILED.inc(source=job.source, stage="compare")
+    return ReportRow(
+        job_title=job.title,
+        company=job.company,
+        source=job.source,
+        comparison_result=result,
+        job_url=job.url or "",
+        also_listed=tuple(job.also_listed) if also_listed is None else also_listed,
+    )
+
+
+def _duplicate_row(job: JobListing, rep: JobListing, result: JobScanResult) -> ReportRow:
+    """Update row for a duplicate of ``rep`` found after ``rep``'s row was sent."""
+
+    return ReportRow(
+        job_title=job.title,
+        company=job.company,
+        source=job.source,
+        comparison_result=result,
+        job_url=job.url or "",
+        also_listed=((rep.source, rep.url or ""),),
+        duplicate_of=(rep.source, rep.url or ""),
+    )
+
+
+def merge_duplicate_rows(rows: List[ReportRow]) -> List[ReportRow]:
+    """Fold update rows (``duplicate_of``) into their representative's ``also_listed``."""
+
+    by_key = {(r.source, r.job_url): i for i, r in enumerate(rows) if not r.duplicate_of}
+    out = list(rows)
+    for row in rows:
+        i = by_key.get(row.duplicate_of) if row.duplicate_of else None
+        if i is not None:
+            rep = out[i]
+            out[i] = replace(rep, also_listed=rep.also_listed + ((row.source, row.job_url),))
+    return [r for r in out if not r.duplicate_of or r.duplicate_of not in by_key]
+
+
+def iter_comparisons(
+    listings: List[JobListing],
+    resume_text: str = RESUME_TEXT,
+    progress: Optional[RunProgress] = None,
+) -> Iterator[ReportRow]:
+    """Yield a report row per listing as soon as its comparison finishes (completion order)."""
+
+    progress = _start_scans(progress, len(listings))
+    descriptions = [(job.description or "").strip() for job in listings]
+    for i, result in _iter_compare(resume_text, descriptions, progress):
+        yield _report_row(listings[i], result)
+
+
+def run_comparisons(
+    listings: List[JobListing],
+    resume_text: str = RESUME_TEXT,
+    progress: Optional[RunProgress] = None,
+) -> List[ReportRow]:
+    """Compare each listing with the resume and build report rows in listing order.
+
+    COMPARISON_BACKEND picks the engine: "local" (offline keyword scoring, default),
+    "jobscan" (browser automation on app.jobscan.co) or "none".
+    """
+
+    progress = _start_scans(progress, len(listings))
+    descriptions = [(job.description or "").strip() for job in listings]
+    results: List[Optional[JobScanResult]] = [None] * len(listings)
+    for i, result in _iter_compare(resume_text, descriptions, progress):
+        results[i] = result
+    return [_report_row(job, result) for job, result in zip(listings, results)]
+
+
+# --- Pipelined run -----------------------------------------------------------------
+#
+# search producers --[hydrate queue]--> hydration workers --[compare queue]--> comparison
+# workers --[row queue]--> caller. Queues are bounded, so a fast stage blocks instead of
+# running ahead of a slow one, and comparisons start as soon as the first listing is
+# hydrated. End-to-end time tends towards the slowest stage instead of the sum.
+
+_END = object()  # end-of-stream marker, one per downstream worker
+
+
+class _Pipeline:
+    """Threads and bounded queues for one pipelined run (see :func:`iter_pipeline`)."""
+
+    def __init__(self, resume_text: str, progress: RunProgress):
+        self.resume_text = resume_text
+        self.progress = progress
+        self.hydrate_q: "queue.Queue" = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        self.compare_q: "queue.Queue" = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        self.rows_q: "queue.Queue" = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        self.duplicates = DuplicateIndex()
+        # Comparison of each representative whose row was sent, for late duplicates' rows.
+        self._results: Dict[int, JobScanResult] = {}
+        # Admission in CRAWLERS order (see _offer): sources before _turn have finished
+        # searching; stubs of later sources wait in _held until their turn.
+        self.admitted = 0
+        self._turn = 0
+        self._finished: Set[int] = set()
+        self._held: Dict[int, List[JobListing]] = {}
+        self.errors: List[BaseException] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    # Queue helpers: block with a short timeout so every wait also notices a stop.
+
+    def _stopped(self) -> bool:
+        return self._stop.is_set() or self.progress.cancelled
+
+    def _put(self, q: "queue.Queue", item) -> None:
+        while True:
+            if self._stopped():
+                raise RunCancelled()
+            try:
+                q.put(item, timeout=0.2)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, q: "queue.Queue"):
+        while True:
+            if self._stopped():
+                raise RunCancelled()
+            try:
+                return q.get(timeout=0.2)
+            except queue.Empty:
+                continue
+
+    def _items(self, q: "queue.Queue") -> Iterator:
+        while True:
+            item = self._get(q)
+            if item is _END:
+                return
+            yield item
+
+    def _batches(self, q: "queue.Queue", limit: int) -> Iterator[List]:
+        """Items of ``q`` grouped into batches of up to ``limit`` already-queued items."""
+
+        for item in self._items(q):
+            batch = [item]
+            while len(batch) < limit:
+                try:
+                    nxt = q.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is _END:
+                    yield batch
+                    return
+                batch.append(nxt)
+            yield batch
+
+    def _stage(self, target, workers: int, downstream: "queue.Queue", downstream_workers: int):
+        """Start ``workers`` threads; the last one to finish ends the downstream stream."""
+
+        remaining = [workers]
+
+        def run(*args):
+            try:
+                target(*args)
+            except RunCancelled:
+                pass
+            except BaseException as e:  # surfaced to the caller in iter_pipeline
+                self.errors.append(e)
+                self._stop.set()
+            finally:
+                with self._lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    try:
+                        for _ in range(downstream_workers):
+                            self._put(downstream, _END)
+                    except RunCancelled:
+                        pass
+
+        return run
+
+    # Stages.
+
+    def _send(self, jobs: List[JobListing]) -> None:
+        for job in jobs:
+            self.progress.add_total("descriptions")
+            self._put(self.hydrate_q, job)
+
+    def _offer(self, index: int, job: JobListing) -> bool:
+        """Admit a stub of source ``index``; False once MAX_JOBS_TOTAL listings are admitted.
+
+        Only the earliest unfinished source admits straight away; later sources' stubs
+        are held until every source before them has finished. The admitted set is then
+        the one :func:`_merge_sources` picks, whichever search finishes first.
         """
-        ### Temporary replacement until jobscan works ###
-        result = JobScanResult(
-                match_score=None,
-                summary="Jobscan not being used now",
-                details="",
-                raw_html="",
-                success=True,
-                error="Jobscan not being used now",
-            )
-        rows.append(
-            ReportRow(
-                job_title=job.title,
-                company=job.company,
-                source=job.source,
-                comparison_result=result,
-                job_url=job.url or "",
-            )
-        )
-    return rows
 
+        with self._lock:
+            if self.admitted >= MAX_JOBS_TOTAL:
+                return False
+            if index != self._turn:
+                self._held.setdefault(index, []).append(job)
+                return True
+            self.admitted += 1
+        self._send([job])
+        return True
+
+    def _source_done(self, index: int) -> None:
+        """Mark source ``index`` finished and admit the held stubs whose turn has come."""
+
+        admitted = []
+        with self._lock:
+            self._finished.add(index)
+            while self._turn in self._finished:
+                self._turn += 1
+                for job in self._held.pop(self._turn, []):
+                    if self.admitted >= MAX_JOBS_TOTAL:
+                        break
+                    self.admitted += 1
+                    admitted.append(job)
+        self._send(admitted)
+
+    def _search(self, crawlers: "queue.Queue") -> None:
+        """Search producer: crawl ``(index, crawler)`` items and offer new stubs for hydration."""
+
+        while True:
+            try:
+                index, crawler = crawlers.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                self._search_source(index, crawler)
+            finally:
+                self._source_done(index)
+
+    def _search_source(self, index: int, crawler) -> None:
+        seen = set()
+        out: List[JobListing] = []
+        for planned in QUERY_PLANNER.plan(crawler):
+            if len(out) >= MAX_JOBS_TOTAL or self.admitted >= MAX_JOBS_TOTAL:
+                break
+            if _circuit_open(crawler):
+                break
+            self.progress.check()
+            before = len(out)
+            real = 0
+            try:
+                for job in crawler.search(planned.query, max_results=planned.max_results):
+                    real += not job.placeholder
+                    added = len(out)
+                    more = _accept(job, seen, out)
+                    if len(out) > added and not self._offer(index, job):
+                        break
+                    if not more:
+                        break
+            except RunCancelled:
+                raise
+            except Exception as e:
+                _search_failed(crawler, planned.query, e)
+                continue
+            else:
+                _query_succeeded(crawler, planned, len(out) - before, real)
+            finally:
+                _query_done(crawler, planned, self.progress)
+
+    def _hydrate(self) -> None:
+        """Hydration worker: full description, job index, cross-source duplicate check."""
+
+        for job in self._items(self.hydrate_q):
+            _hydrate_one(self.progress, job)
+            if not _update_job_index([job]):
+                continue
+            rep = self.duplicates.add(job) if NEAR_DUP_ENABLED else None
+            if rep is not None:
+                if not self.duplicates.attached(rep, job):
+                    # rep's row already went out without this duplicate: send an update row.
+                    self._put(self.rows_q, _duplicate_row(job, rep, self._results[id(rep)]))
+                continue
+            self.progress.add_total("scans")
+            self._put(self.compare_q, job)
+
+    def _compare(self) -> None:
+        """Comparison worker: one scan at a time for JobScan, small batches for local scoring."""
+
+        limit = 1 if COMPARISON_BACKEND == "jobscan" else COMPARE_BATCH_SIZE
+        for batch in self._batches(self.compare_q, limit):
+            descriptions = [(job.description or "").strip() for job in batch]
+            for i, result in _iter_compare(self.resume_text, descriptions, self.progress):
+                job = batch[i]
+                self._results[id(job)] = result
+                self._put(self.rows_q, _report_row(job, result, self.duplicates.seal(job)))
+
+    def run(self) -> Iterator[ReportRow]:
+        crawlers: "queue.Queue" = queue.Queue()
+        for index, crawler in enumerate(CRAWLERS.values()):
+            crawlers.put((index, crawler))
+        search_workers = max(1, min(CRAWL_WORKERS, len(CRAWLERS)))
+        hydrate_workers = max(1, HYDRATE_WORKERS)
+        compare_workers = max(1, COMPARE_WORKERS)
+        stages = [
+            (self._search, (crawlers,), search_workers, self.hydrate_q, hydrate_workers),
+            (self._hydrate, (), hydrate_workers, self.compare_q, compare_workers),
+            (self._compare, (), compare_workers, self.rows_q, 1),
+        ]
+        threads = []
+        for target, args, workers, downstream, downstream_workers in stages:
+            run = self._stage(target, workers, downstream, downstream_workers)
+            threads += [
+                threading.Thread(target=run, args=args, daemon=True, name=f"pipeline-{target.__name__}")
+                for _ in range(workers)
+            ]
+        for t in threads:
+            t.start()
+        try:
+            yield from self._items(self.rows_q)
+        except RunCancelled:
+            if not self.errors:
+                raise
+        finally:
+            # Consumer finished or went away (e.g. a closed stream): stop every stage.
+            self._stop.set()
+        if self.errors:
+            raise self.errors[0]
+
+
+def iter_pipeline(
+    resume_text: str = RESUME_TEXT, progress: Optional[RunProgress] = None
+) -> Iterator[ReportRow]:
+    """Crawl, hydrate and compare concurrently; yield report rows as comparisons finish.
+
+    Stage concurrency: CRAWL_WORKERS search producers (one source each at a time),
+    HYDRATE_WORKERS description workers and COMPARE_WORKERS comparison workers, joined
+    by queues of PIPELINE_QUEUE_SIZE. Listings are deduped and capped (MAX_JOBS_TOTAL)
+    as they stream in, admitted in CRAWLERS order so the capped set is the one
+    :func:`crawl_all_sites` picks. The first-hydrated posting represents a cross-source
+    duplicate.
+    """
+
+    progress = _start_crawl(progress)
+    progress.set_stage("pipeline")
+    progress.set_total("descriptions", 0)
+    progress.set_total("scans", 0)
+    yield from _Pipeline(resume_text, progress).run()
+    progress.check()
+
+
+def iter_report_rows(
+    resume_text: str = RESUME_TEXT, progress: Optional[RunProgress] = None
+) -> Iterator[ReportRow]:
+    """Report rows for a full run: pipelined (PIPELINE_ENABLED), else crawl then compare.
+
+    The async crawl engine always runs the two phases in sequence.
+    """
+
+    if PIPELINE_ENABLED and CRAWL_ENGINE != "async":
+        yield from iter_pipeline(resume_text, progress)
+        return
+    progress = progress or RunProgress()
+    listings = crawl_all_sites(progress)
+    yield from iter_comparisons(listings, resume_text=resume_text, progress=progress)
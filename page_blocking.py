@@ -0,0 +1,181 @@
+"""Request interception for Playwright pages: skip the assets we never read.
+
+LinkedIn descriptions and JobScan scans only read text out of the DOM, yet every page
+load pulls in images, fonts, video and a handful of analytics scripts. Each browser-pool
+context routes its requests through a :class:`RequestBlocker`, which aborts:
+
+1. requests to BROWSER_DENY_DOMAINS (trackers), whatever their type;
+2. BROWSER_BLOCK_TYPES resource types (images, media, fonts);
+3. only with BROWSER_BLOCK_THIRD_PARTY_SCRIPTS (off by default), scripts served from
+   another site than the page, unless their domain is in BROWSER_ALLOW_DOMAINS. Login
+   and captcha providers (reCAPTCHA, Google or Auth0 sign-in) and script CDNs are third
+   party too, so this is opt-in.
+
+Documents are never blocked, so navigation itself cannot fail here. Aborted requests
+never report a size, so bytes saved are estimated from typical sizes per resource type.
+A BROWSER_BLOCK_CONTROL fraction of leases blocks nothing; navigation times are
+recorded with a ``blocking`` label, so page-ready times with and without blocking can
+be compared in the run statistics and on ``/metrics``.
+
+Note that Playwright turns off Chromium's HTTP cache for a context that has a route.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Sequence
+from urllib.parse import urlsplit
+
+from config import (
+    BROWSER_ALLOW_DOMAINS,
+    BROWSER_BLOCK_CONTROL,
+    BROWSER_BLOCK_THIRD_PARTY_SCRIPTS,
+    BROWSER_BLOCK_TYPES,
+    BROWSER_BLOCKING,
+    BROWSER_DENY_DOMAINS,
+)
+from metrics import BROWSER_BYTES_SAVED, BROWSER_NAVIGATION_SECONDS, BROWSER_REQUESTS_BLOCKED
+
+# Typical transfer size per resource type, for the bytes-saved estimate.
+_TYPICAL_BYTES = {
+    "image": 25_000,
+    "media": 500_000,
+    "font": 35_000,
+    "script": 60_000,
+    "stylesheet": 20_000,
+}
+_OTHER_BYTES = 2_000
+
+_STATS: Dict[str, float] = {"allowed": 0, "blocked": 0, "bytes saved (est.)": 0}
+_STATS_LOCK = threading.Lock()
+# Whether the lease running on this pool thread has blocking on (see timed_navigation).
+_LEASE = threading.local()
+
+
+def _host(url: str) -> str:
+    try:
+        return (urlsplit(url).hostname or "").lower()
+    except ValueError:
+        return ""
+
+
+def _matches(host: str, domains: Sequence[str]) -> bool:
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+def _site(host: str) -> str:
+    """Registrable domain, approximated by the last two labels ("www.linkedin.com" -> "linkedin.com")."""
+
+    return ".".join(host.split(".")[-2:])
+
+
+def _record(reason: Optional[str], resource_type: str) -> None:
+    saved = _TYPICAL_BYTES.get(resource_type, _OTHER_BYTES) if reason else 0
+    with _STATS_LOCK:
+        if reason is None:
+            _STATS["allowed"] += 1
+            return
+        _STATS["blocked"] += 1
+        _STATS[f"blocked {reason}"] = _STATS.get(f"blocked {reason}", 0) + 1
+        _STATS["bytes saved (est.)"] += saved
+    BROWSER_REQUESTS_BLOCKED.inc(reason=reason)
+    BROWSER_BYTES_SAVED.inc(saved, reason=reason)
+
+
+class RequestBlocker:
+    """Route handler deciding, per request, whether a pool page loads it."""
+
+    def __init__(
+        self,
+        enabled: bool = BROWSER_BLOCKING,
+        block_types: Sequence[str] = BROWSER_BLOCK_TYPES,
+        deny_domains: Sequence[str] = BROWSER_DENY_DOMAINS,
+        allow_domains: Sequence[str] = BROWSER_ALLOW_DOMAINS,
+        third_party_scripts: bool = BROWSER_BLOCK_THIRD_PARTY_SCRIPTS,
+        control: float = BROWSER_BLOCK_CONTROL,
+    ):
+        self.enabled = enabled
+        self.block_types = frozenset(t for t in block_types if t != "document")
+        self.deny_domains = tuple(deny_domains)
+        self.allow_domains = tuple(allow_domains)
+        self.third_party_scripts = third_party_scripts
+        self.control = control
+        self.active = enabled
+
+    def install(self, context) -> None:
+        """Route every request of ``context`` through :meth:`handle`."""
+
+        if self.enabled:
+            context.route("**/*", self.handle)
+
+    def start_lease(self) -> None:
+        """Decide whether the next lease blocks (BROWSER_BLOCK_CONTROL leases do not)."""
+
+        self.active = self.enabled and random.random() >= self.control
+        _LEASE.blocking = self.active
+
+    def reason(self, url: str, resource_type: str, page_url: str = "") -> Optional[str]:
+        """Why a request should be aborted, or None to let it through."""
+
+        if resource_type == "document":
+            return None
+        host = _host(url)
+        if _matches(host, self.deny_domains):
+            return "tracker"
+        if resource_type in self.block_types:
+            return resource_type
+        if (
+            self.third_party_scripts
+            and resource_type == "script"
+            and page_url
+            and _site(host) != _site(_host(page_url))
+            and not _matches(host, self.allow_domains)
+        ):
+            return "third-party script"
+        return None
+
+    def handle(self, route) -> None:
+        request = route.request
+        reason = None
+        if self.active:
+            try:
+                page_url = request.frame.url
+            except Exception:
+                # Service-worker and detached-frame requests have no usable frame.
+                page_url = ""
+            reason = self.reason(request.url, request.resource_type, page_url)
+        _record(reason, request.resource_type)
+        try:
+            if reason:
+                route.abort("blockedbyclient")
+            else:
+                route.continue_()
+        except Exception:
+            # The page navigated away or closed while the request was pending.
+            pass
+
+
+@contextmanager
+def timed_navigation(site: str) -> Iterator[None]:
+    """Time a page.goto() on a pool page, labelled by whether its lease blocks requests."""
+
+    blocking = "on" if getattr(_LEASE, "blocking", False) else "off"
+    with BROWSER_NAVIGATION_SECONDS.time(site=site, blocking=blocking):
+        yield
+
+
+def blocking_stats() -> Dict[str, float]:
+    """Requests allowed and blocked (per reason), estimated bytes saved, and page-ready times.
+
+    Ready times are flat counters ("<site> pages|ready seconds, blocking on|off"), so run
+    deltas stay meaningful; ready seconds / pages is the mean navigation time.
+    """
+
+    with _STATS_LOCK:
+        out = dict(_STATS)
+    for (site, blocking), (seconds, count) in sorted(BROWSER_NAVIGATION_SECONDS.totals().items()):
+        out[f"{site} pages, blocking {blocking}"] = count
+        out[f"{site} ready seconds, blocking {blocking}"] = seconds
+    return out
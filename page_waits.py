@@ -0,0 +1,104 @@
+"""Condition-based waits for Playwright pages.
+
+Each helper returns as soon as its condition holds (a selector appears or an element's
+text stops changing) and gives up at a per-step deadline instead of sleeping for a
+fixed time. Every wait is recorded under its step name, in the run statistics
+(:func:`wait_counters`) and the ``jobscan_page_wait_seconds`` histogram, so we can see
+how long pages actually take.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from metrics import PAGE_WAIT_SECONDS
+
+
+_TIMINGS: Dict[str, Dict[str, float]] = {}
+_TIMINGS_LOCK = threading.Lock()
+
+
+def _record(step: str, seconds: float, ok: bool) -> None:
+    with _TIMINGS_LOCK:
+        stats = _TIMINGS.setdefault(
+            step, {"count": 0, "timeouts": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+        )
+        stats["count"] += 1
+        stats["total_seconds"] += seconds
+        stats["max_seconds"] = max(stats["max_seconds"], seconds)
+        if not ok:
+            stats["timeouts"] += 1
+    PAGE_WAIT_SECONDS.observe(seconds, step=step, outcome="ok" if ok else "timeout")
+
+
+def wait_stats() -> Dict[str, Dict[str, float]]:
+    """Per-step wait count, timeouts, total and max seconds."""
+
+    with _TIMINGS_LOCK:
+        return {step: dict(s) for step, s in _TIMINGS.items()}
+
+
+def wait_counters() -> Dict[str, float]:
+    """Flat ``"<step> waits|timeouts|seconds"`` counters for the run statistics."""
+
+    with _TIMINGS_LOCK:
+        steps = sorted(_TIMINGS.items())
+    out: Dict[str, float] = {}
+    for step, s in steps:
+        out[f"{step} waits"] = s["count"]
+        out[f"{step} timeouts"] = s["timeouts"]
+        out[f"{step} seconds"] = s["total_seconds"]
+    return out
+
+
+def wait_for_any_selector(page, selectors: Iterable[str], step: str, deadline_ms: int):
+    """Wait until any of ``selectors`` is attached; return the element or None on deadline."""
+
+    start = time.monotonic()
+    el = None
+    try:
+        el = page.wait_for_selector(", ".join(selectors), state="attached", timeout=deadline_ms)
+    except Exception:
+        el = None
+    _record(step, time.monotonic() - start, el is not None)
+    return el
+
+
+def wait_for_text_stable(
+    page,
+    selector: str,
+    step: str,
+    deadline_ms: int,
+    quiet_ms: int = 400,
+    poll_ms: int = 100,
+) -> Optional[str]:
+    """Wait until the text of ``selector`` is non-empty and unchanged for ``quiet_ms``.
+
+    Returns the settled text, or the last text seen (possibly None) at the deadline.
+    """
+
+    start = time.monotonic()
+    deadline = start + deadline_ms / 1000.0
+    last: Optional[str] = None
+    stable_since = start
+    ok = False
+    while True:
+        try:
+            el = page.query_selector(selector)
+            text = el.inner_text() if el else None
+        except Exception:
+            text = None
+        now = time.monotonic()
+        if text != last:
+            last = text
+            stable_since = now
+        elif text and (now - stable_since) * 1000 >= quiet_ms:
+            ok = True
+            break
+        if now >= deadline:
+            break
+        page.wait_for_timeout(poll_ms)
+    _record(step, time.monotonic() - start, ok)
+    return last
@@ -0,0 +1,195 @@
+"""On-demand profiling of a single run: sampled stacks plus a per-source time breakdown.
+
+A profiled run (PROFILE_RUNS=1, or ``profile=1`` on a run request) starts a sampler
+thread that reads the stacks of the run's threads every PROFILE_INTERVAL_MS via
+``sys._current_frames()``. Sampled are the thread that started the run and every thread
+started while it is going (pipeline stages, hydration pools); threads that already
+existed (the web server, a warmed-up browser pool, other runs) are left out. Sampling
+is wall-clock, so a thread blocked on a socket counts like one burning CPU; threads
+parked on an idle queue or event are counted separately as idle.
+
+Per source, the network, rate-limit, retry-backoff, parse, browser and comparison seconds
+come from the deltas of the metrics.py histograms over the run. Those histograms are
+process-wide, so another run executing at the same time (RUN_CONCURRENCY > 1) shows up
+in this breakdown too; the sampled stacks do not have that problem. The raw samples are saved in
+folded-stack format ("frame;frame;frame count"), which flamegraph.pl and speedscope
+read directly.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from config import PROFILE_DIR, PROFILE_INTERVAL_MS, PROFILE_TOP
+from metrics import (
+    BROWSER_LAUNCH_SECONDS,
+    BROWSER_NAVIGATION_SECONDS,
+    FETCH_BACKOFF_SECONDS,
+    HTTP_FETCH_SECONDS,
+    PARSE_SECONDS,
+    RATE_LIMIT_WAIT_SECONDS,
+    SCAN_SECONDS,
+)
+
+Stack = Tuple[str, ...]
+
+_MAX_DEPTH = 128
+# A leaf frame in threading.py is a blocking wait (idle pool worker, queue get, join).
+_IDLE_MODULE = "threading:"
+
+# (column, histogram, label holding the source; None = one fixed row)
+_BREAKDOWN = (
+    ("network", HTTP_FETCH_SECONDS, "source"),
+    ("rate-limit wait", RATE_LIMIT_WAIT_SECONDS, "source"),
+    ("retry backoff", FETCH_BACKOFF_SECONDS, "source"),
+    ("parse", PARSE_SECONDS, "page"),
+    ("browser", BROWSER_NAVIGATION_SECONDS, "site"),
+    ("browser", BROWSER_LAUNCH_SECONDS, None),
+    ("compare", SCAN_SECONDS, "backend"),
+)
+BREAKDOWN_COLUMNS = ("network", "rate-limit wait", "retry backoff", "parse", "browser", "compare")
+_ROW_NAMES = {"jobscan": "JobScan", "local": "Local scorer"}
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _stack(frame) -> Stack:
+    names = []
+    while frame is not None and len(names) < _MAX_DEPTH:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    return tuple(reversed(names))
+
+
+def _idle(stack: Stack) -> bool:
+    return bool(stack) and stack[-1].startswith(_IDLE_MODULE)
+
+
+def _row(label: Optional[str], value: str) -> str:
+    if label is None:
+        return "Browser pool"
+    if label == "page":
+        value = value.split(".", 1)[0]  # "Indeed.search" -> "Indeed"
+    return _ROW_NAMES.get(value, value)
+
+
+def _source_seconds() -> Dict[str, Dict[str, float]]:
+    """Cumulative seconds per row (source) and column, summed across threads."""
+
+    out: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    for column, histogram, label in _BREAKDOWN:
+        index = histogram.labelnames.index(label) if label else None
+        for key, (seconds, _) in histogram.totals().items():
+            out[_row(label, key[index] if label else "")][column] += seconds
+    return out
+
+
+class RunProfile:
+    """Context manager that samples the current run's threads while its block runs."""
+
+    def __init__(
+        self,
+        name: str = "run",
+        interval: float = PROFILE_INTERVAL_MS / 1000,
+        directory: str = PROFILE_DIR,
+    ):
+        self.name = name
+        self.interval = max(0.001, interval)
+        self.directory = directory
+        self.samples: Counter = Counter()
+        self.idle = 0
+        self.wall_seconds = 0.0
+        self.path = ""
+        self._preexisting: Set[int] = set()
+        self._before: Dict[str, Dict[str, float]] = {}
+        self._after: Dict[str, Dict[str, float]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start = 0.0
+
+    def __enter__(self) -> "RunProfile":
+        owner = threading.get_ident()
+        self._preexisting = {t.ident for t in threading.enumerate()} - {owner}
+        self._before = _source_seconds()
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample, name="run-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.wall_seconds = time.perf_counter() - self._start
+        self._after = _source_seconds()
+        self.path = self.save()
+
+    def _sample(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == me or ident in self._preexisting:
+                    continue
+                stack = _stack(frame)
+                if _idle(stack):
+                    self.idle += 1
+                self.samples[stack] += 1
+
+    # Results.
+
+    @property
+    def busy(self) -> Counter:
+        return Counter({s: n for s, n in self.samples.items() if s and not _idle(s)})
+
+    def hot_functions(self, limit: int = PROFILE_TOP) -> List[Tuple[str, int, int]]:
+        """``(function, self samples, total samples)`` of busy samples, by self samples."""
+
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, n in self.busy.items():
+            own[stack[-1]] += n
+            for name in set(stack):
+                total[name] += n
+        return [(name, n, total[name]) for name, n in own.most_common(limit)]
+
+    def hot_stacks(self, limit: int = 5, depth: int = 6) -> List[Tuple[str, int]]:
+        """The most sampled busy call paths, innermost ``depth`` frames of each."""
+
+        paths: Counter = Counter()
+        for stack, n in self.busy.items():
+            paths[" > ".join(stack[-depth:])] += n
+        return paths.most_common(limit)
+
+    def breakdown(self) -> Dict[str, Dict[str, float]]:
+        """Seconds per source and column spent during the run (process-wide metric deltas)."""
+
+        out: Dict[str, Dict[str, float]] = {}
+        for row, columns in sorted(self._after.items()):
+            before = self._before.get(row, {})
+            delta = {c: columns.get(c, 0.0) - before.get(c, 0.0) for c in BREAKDOWN_COLUMNS}
+            if any(v > 0 for v in delta.values()):
+                out[row] = delta
+        return out
+
+    def save(self) -> str:
+        """Write the samples as folded stacks; return the file path ("" if it failed)."""
+
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.directory, f"{stamp}-{self.name}-{uuid.uuid4().hex[:6]}.folded")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                for stack, n in self.samples.most_common():
+                    f.write(f"{';'.join(stack)} {n}\n")
+        except OSError:
+            return ""
+        return path
@@ -0,0 +1,105 @@
+"""Persistent cache of comparison results keyed by resume + description content.
+
+A comparison is deterministic for a given (backend, resume, description), so the key is
+a SHA-256 of those three after whitespace/case normalization. Editing the resume
+changes every key (jobs re-scan); an unchanged rerun is served entirely from here.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict
+from typing import Dict, Optional
+
+from config import RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_PATH, RESULT_CACHE_TTL
+from jobscan_client import JobScanResult
+
+
+def _normalize(text: str) -> str:
+    return " ".join((text or "").split()).lower()
+
+
+def result_key(backend: str, resume_text: str, job_description: str) -> str:
+    h = hashlib.sha256()
+    for part in (backend, _normalize(resume_text), _normalize(job_description)):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class ResultCache:
+    """SQLite-backed ``JobScanResult`` store with TTL and a max entry count (LRU)."""
+
+    def __init__(
+        self,
+        path: str = RESULT_CACHE_PATH,
+        ttl: float = RESULT_CACHE_TTL,
+        max_entries: int = RESULT_CACHE_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stored": 0}
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, result TEXT NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[JobScanResult]:
+        """Cached result for ``key`` if present and younger than the TTL."""
+
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT result, created_at FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or time.time() - row[1] >= self.ttl:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            db.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            db.commit()
+        data = json.loads(row[0])
+        data.pop("raw_html", None)  # entries written before captures moved to the blob store
+        return JobScanResult(**data)
+
+    def put(self, key: str, result: JobScanResult) -> None:
+        now = time.time()
+        with self._lock:
+            self._stats["stored"] += 1
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO results (key, result, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, json.dumps(asdict(result)), now, now),
+            )
+            db.execute(
+                "DELETE FROM results WHERE key IN ("
+                " SELECT key FROM results ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+
+RESULT_CACHE = ResultCache()
@@ -0,0 +1,130 @@
+"""Background executor for crawl + compare runs.
+
+HTTP handlers submit a run and get its ID back immediately; the run executes on a
+small thread pool (RUN_CONCURRENCY). Clients poll the run's status and per-stage
+progress, fetch the finished report by ID, or cancel it.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+from config import RUN_CONCURRENCY, RUN_HISTORY, RUN_MAX_QUEUED
+from orchestrator import RunCancelled, RunProgress
+
+
+class QueueFull(Exception):
+    """Raised when RUN_MAX_QUEUED runs are already waiting."""
+
+
+@dataclass
+class Run:
+    id: str
+    progress: RunProgress = field(default_factory=RunProgress)
+    status: str = "queued"  # queued, running, done, failed, cancelled
+    report_html: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "run_id": self.id,
+            "status": self.status,
+            "progress": self.progress.snapshot(),
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class RunQueue:
+    """Runs ``job(progress) -> report_html`` callables in the background, tracked by ID."""
+
+    def __init__(
+        self,
+        concurrency: int = RUN_CONCURRENCY,
+        max_queued: int = RUN_MAX_QUEUED,
+        history: int = RUN_HISTORY,
+    ):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="run")
+        self._max_queued = max_queued
+        self._history = history
+        self._runs: "OrderedDict[str, Run]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, job: Callable[[RunProgress], str]) -> Run:
+        with self._lock:
+            queued = sum(1 for r in self._runs.values() if r.status == "queued")
+            if queued >= self._max_queued:
+                raise QueueFull(f"{queued} runs already queued")
+            run = Run(id=uuid.uuid4().hex[:12])
+            self._runs[run.id] = run
+            self._prune()
+        self._executor.submit(self._execute, run, job)
+        return run
+
+    def get(self, run_id: str) -> Optional[Run]:
+        with self._lock:
+            return self._runs.get(run_id)
+
+    def cancel(self, run_id: str) -> Optional[Run]:
+        """Request cancellation; a running job stops at its next progress check."""
+
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is not None and not run.finished:
+                run.progress.cancel()
+                if run.status == "queued":
+                    self._finish(run, "cancelled")
+        return run
+
+    def _execute(self, run: Run, job: Callable[[RunProgress], str]) -> None:
+        with self._lock:
+            # Checked and claimed under the lock cancel() takes, so a queued run that is
+            # cancelled can never start.
+            if run.status != "queued":
+                return
+            run.status = "running"
+            run.started_at = time.time()
+        try:
+            report = job(run.progress)
+        except RunCancelled:
+            status = "cancelled"
+        except Exception as e:
+            run.error = str(e)
+            status = "failed"
+        else:
+            run.report_html = report
+            status = "done"
+        with self._lock:
+            self._finish(run, status)
+
+    def _finish(self, run: Run, status: str) -> None:
+        """Mark ``run`` finished (called with the lock held)."""
+
+        run.status = status
+        run.progress.stage = status
+        run.finished_at = time.time()
+
+    def _prune(self) -> None:
+        """Forget the oldest finished runs beyond RUN_HISTORY (called with the lock held)."""
+
+        finished = [r.id for r in self._runs.values() if r.finished]
+        for run_id in finished[: max(0, len(self._runs) - self._history)]:
+            del self._runs[run_id]
+
+
+RUN_QUEUE = RunQueue()
@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+
+# Isolate the tests from local state and politeness delays before config is imported.
+os.environ.update(
+    JOBSCAN_DATA_DIR=tempfile.mkdtemp(prefix="jobscan-tests-"),
+    CRAWL_RATE="0",
+    BROWSER_POOL_WARMUP="0",
+)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,69 @@
+import pytest
+
+from crawlers import circuit_breaker
+from crawlers.circuit_breaker import CircuitBreaker, CircuitOpen
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _fail(breaker: CircuitBreaker, times: int) -> None:
+    for _ in range(times):
+        breaker.before_request()
+        breaker.record(ok=False)
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("Indeed", failures=3, cooldown=60, max_cooldown=600)
+    _fail(breaker, 2)
+    breaker.before_request()
+    breaker.record(ok=True)  # a success resets the count
+    _fail(breaker, 2)
+    assert not breaker.is_open
+
+    _fail(breaker, 1)
+
+    assert breaker.is_open
+    with pytest.raises(CircuitOpen):
+        breaker.before_request()
+    assert breaker.counts == {"failures": 5, "opened": 1, "skipped": 1, "retries": 0}
+
+
+def test_half_open_admits_one_probe_and_closes_on_success(clock):
+    breaker = CircuitBreaker("Indeed", failures=1, cooldown=60, max_cooldown=600)
+    _fail(breaker, 1)
+
+    clock[0] += 60
+    assert not breaker.is_open
+    breaker.before_request()  # the probe
+    assert breaker.state == "half-open"
+    with pytest.raises(CircuitOpen):
+        breaker.before_request()  # only one probe at a time
+
+    breaker.record(ok=True)
+    assert breaker.state == "closed"
+    breaker.before_request()
+
+
+def test_failed_probe_doubles_the_cooldown_up_to_the_cap(clock):
+    breaker = CircuitBreaker("Indeed", failures=1, cooldown=60, max_cooldown=200)
+    _fail(breaker, 1)
+
+    cooldowns = []
+    for _ in range(3):
+        clock[0] += breaker.cooldown
+        _fail(breaker, 1)  # the half-open probe fails
+        cooldowns.append(breaker.cooldown)
+        assert breaker.is_open
+
+    assert cooldowns == [120, 200, 200]
+
+    # Recovery resets the cool-down.
+    clock[0] += breaker.cooldown
+    breaker.before_request()
+    breaker.record(ok=True)
+    assert breaker.cooldown == 60
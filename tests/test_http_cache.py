@@ -0,0 +1,90 @@
+import os
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from crawlers import base, http_cache
+from crawlers.http_cache import HttpCache
+
+
+class DetailPage(BaseHTTPRequestHandler):
+    """A detail page with an ETag that answers conditional GETs with 304."""
+
+    etag = '"v1"'
+    requests = []
+
+    def do_GET(self):  # noqa: N802
+        self.requests.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = b"<html>full description</html>"
+        self.send_response(200)
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    DetailPage.requests = []
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), DetailPage)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}/viewjob?jk=1"
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = HttpCache(str(tmp_path / "http_cache.sqlite3"))
+    monkeypatch.setattr(base, "HTTP_CACHE", cache)
+    monkeypatch.setattr(base, "HTTP_CACHE_ENABLED", True)
+    return cache
+
+
+def test_fresh_entry_skips_the_network(server, cache):
+    first = base._fetch(server, cache=True)
+    second = base._fetch(server, cache=True)
+
+    assert first == second == "<html>full description</html>"
+    assert DetailPage.requests == [None]
+    assert cache.stats()["hits"] == 1
+
+
+def test_stale_entry_is_revalidated_with_a_conditional_get(server, cache, monkeypatch):
+    base._fetch(server, cache=True)
+    monkeypatch.setattr(http_cache, "HTTP_CACHE_TTL", 0)
+
+    body = base._fetch(server, cache=True)
+
+    assert body == "<html>full description</html>"
+    assert DetailPage.requests == [None, '"v1"']
+    assert cache.stats()["revalidated"] == 1
+    # The 304 refreshed the entry, so it is served from the cache again.
+    monkeypatch.setattr(http_cache, "HTTP_CACHE_TTL", 3600)
+    base._fetch(server, cache=True)
+    assert len(DetailPage.requests) == 2
+
+
+def test_evicts_least_recently_used_entries_by_size(tmp_path):
+    page = os.urandom(3000).hex()
+    size = len(zlib.compress((page + "a").encode()))
+    cache = HttpCache(str(tmp_path / "http_cache.sqlite3"), max_bytes=2 * size + size // 2)  # room for two
+    cache.store("a", page + "a", None, None)
+    cache.store("b", page + "b", None, None)
+    cache.get("a")  # "b" is now the least recently used
+
+    cache.store("c", page + "c", None, None)
+
+    assert cache.get("b") is None
+    assert cache.get("a").body == page + "a"
+    assert cache.get("c").body == page + "c"
+    assert cache.stats()["evicted"] == 1
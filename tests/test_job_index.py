@@ -0,0 +1,51 @@
+import pytest
+
+from crawlers.base import BaseCrawler, JobListing
+from job_index import JobIndex
+
+
+def _listing(description: str = "snippet", described: bool = False) -> JobListing:
+    return JobListing(
+        "Backend Engineer", "Acme", description, "https://www.indeed.com/viewjob?jk=abc", "Indeed",
+        described=described,
+    )
+
+
+@pytest.fixture
+def index(tmp_path):
+    return JobIndex(str(tmp_path / "job_index.sqlite3"))
+
+
+def test_reports_only_postings_seen_for_the_first_time(index):
+    first = index.record([("Indeed", "abc", _listing()), ("Indeed", "def", _listing())])
+    second = index.record([("Indeed", "abc", _listing()), ("BuiltIn", "abc", _listing())])
+
+    assert first == {("Indeed", "abc"), ("Indeed", "def")}
+    assert second == {("BuiltIn", "abc")}
+    assert index.stats() == {"known": 1, "new": 3, "descriptions_reused": 0}
+
+
+def test_stores_fetched_descriptions_for_reuse(index):
+    index.record([("Indeed", "abc", _listing("full description", described=True))])
+
+    assert index.description("Indeed", "abc") == "full description"
+
+
+def test_never_stores_a_search_snippet(index):
+    index.record([("Indeed", "abc", _listing("snippet"))])
+    assert index.description("Indeed", "abc") is None
+
+    # A later fetch fills it in; a later snippet does not overwrite it.
+    index.record([("Indeed", "abc", _listing("full description", described=True))])
+    index.record([("Indeed", "abc", _listing("snippet"))])
+    assert index.description("Indeed", "abc") == "full description"
+
+
+def test_failed_fetch_falling_back_to_the_snippet_is_not_described():
+    listing = _listing("snippet")
+    BaseCrawler._set_description(listing, None, "snippet")
+    assert not listing.described
+
+    BaseCrawler._set_description(listing, None, "full description")
+    assert listing.described
+    assert listing.description == "full description"
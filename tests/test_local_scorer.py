@@ -0,0 +1,29 @@
+from local_scorer import LocalScorer
+
+RESUME = "Senior software engineer. Python, Java, REST APIs, AWS, Docker, SQL, CI/CD, unit testing."
+
+JOB = (
+    "We are hiring a backend engineer to build REST APIs in Python and Go. You will run services "
+    "on AWS with Docker and Kubernetes, write unit tests, and own CI/CD pipelines. Kafka a plus."
+)
+OTHERS = [
+    "Frontend developer: React, TypeScript, CSS, accessibility, design systems, Figma handoff.",
+    "Data engineer: Spark, Airflow, Python, SQL warehouses, dbt models, AWS Glue and Redshift.",
+]
+
+
+def test_score_does_not_depend_on_batch():
+    scorer = LocalScorer(RESUME)
+
+    alone = scorer.score_many([JOB])[0]
+    batched = scorer.score_many([JOB, *OTHERS])[0]
+
+    assert alone == batched
+    assert scorer.score_many([OTHERS[0], JOB, OTHERS[1]])[1] == alone
+
+
+def test_empty_description_is_not_scored():
+    result = LocalScorer(RESUME).score_many(["   "])[0]
+
+    assert not result.success
+    assert result.match_score is None
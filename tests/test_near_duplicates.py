@@ -0,0 +1,77 @@
+from crawlers.base import JobListing
+from near_duplicates import DuplicateIndex, collapse_duplicates
+
+WORDS = [f"w{i}" for i in range(300)]
+
+
+def _text(changed: int = 0) -> str:
+    """The base description with its first ``changed`` words replaced (Jaccard ~0.8 at 30)."""
+
+    return " ".join([f"x{i}" for i in range(changed)] + WORDS[changed:])
+
+
+def _job(source: str, description: str) -> JobListing:
+    return JobListing("Backend Engineer", "Acme", description, f"https://{source}/1", source)
+
+
+def test_collapses_cross_source_copies_to_the_longest_description():
+    indeed = _job("Indeed", _text())
+    linkedin = _job("LinkedIn", _text() + " apply on our careers page")
+    other = _job("BuiltIn", " ".join(reversed(WORDS)))
+
+    out = collapse_duplicates([indeed, linkedin, other], threshold=0.8)
+
+    assert out == [linkedin, other]
+    assert linkedin.also_listed == [("Indeed", "https://Indeed/1")]
+
+
+def test_keeps_at_most_one_listing_per_source_in_a_cluster():
+    first = _job("Indeed", _text())
+    repost = _job("Indeed", _text(changed=1))
+    linkedin = _job("LinkedIn", _text(changed=2))
+
+    out = collapse_duplicates([first, repost, linkedin], threshold=0.8)
+
+    assert len(out) == 2
+    sources = [[job.source] + [s for s, _ in job.also_listed] for job in out]
+    assert all(len(cluster) == len(set(cluster)) for cluster in sources)
+    assert sorted(s for cluster in sources for s in cluster) == ["Indeed", "Indeed", "LinkedIn"]
+
+
+def test_threshold_decides_what_counts_as_a_duplicate():
+    def pair():
+        return [_job("Indeed", _text()), _job("LinkedIn", _text(changed=30))]
+
+    assert len(collapse_duplicates(pair(), threshold=0.75)) == 1
+    assert len(collapse_duplicates(pair(), threshold=0.9)) == 2
+
+
+def test_short_snippets_are_not_fingerprinted():
+    out = collapse_duplicates([_job("Indeed", "Python AWS"), _job("LinkedIn", "Python AWS")])
+
+    assert len(out) == 2
+
+
+def test_duplicate_index_attaches_to_the_first_seen_listing():
+    index = DuplicateIndex(threshold=0.8)
+    first = _job("Indeed", _text())
+    copy = _job("LinkedIn", _text(changed=1))
+
+    assert index.add(first) is None
+    assert index.add(copy) is first
+    assert index.attached(first, copy)
+    assert first.also_listed == [("LinkedIn", "https://LinkedIn/1")]
+
+
+def test_duplicate_found_after_seal_is_not_attached():
+    index = DuplicateIndex(threshold=0.8)
+    first = _job("Indeed", _text())
+    index.add(first)
+    assert index.seal(first) == ()
+
+    late = _job("LinkedIn", _text(changed=1))
+
+    # Still reported as a duplicate of first, but its row has already gone out.
+    assert index.add(late) is first
+    assert not index.attached(first, late)
+    assert first.also_listed == []
@@ -0,0 +1,20 @@
+from page_blocking import RequestBlocker
+
+PAGE = "https://app.jobscan.co/dashboard"
+
+
+def test_default_blocks_trackers_and_heavy_resource_types_only():
+    blocker = RequestBlocker(deny_domains=["doubleclick.net"], block_types=["image", "media", "font"])
+
+    assert blocker.reason("https://stats.g.doubleclick.net/collect", "xhr", PAGE) == "tracker"
+    assert blocker.reason("https://cdn.jobscan.co/logo.png", "image", PAGE) == "image"
+    assert blocker.reason("https://www.google.com/recaptcha/api.js", "script", PAGE) is None
+    assert blocker.reason(PAGE, "document") is None
+
+
+def test_third_party_script_blocking_is_opt_in_and_honours_the_allow_list():
+    blocker = RequestBlocker(third_party_scripts=True, allow_domains=["licdn.com"])
+
+    assert blocker.reason("https://cdn.example.net/app.js", "script", PAGE) == "third-party script"
+    assert blocker.reason("https://static.licdn.com/app.js", "script", PAGE) is None
+    assert blocker.reason("https://www.jobscan.co/app.js", "script", PAGE) is None
@@ -0,0 +1,51 @@
+import pytest
+
+import orchestrator
+from crawlers.base import JobListing
+from orchestrator import RunProgress, _Pipeline
+
+
+def _stub(source: str, n: int) -> JobListing:
+    return JobListing(f"Engineer {n}", "Acme", "", f"https://{source}/{n}", source)
+
+
+def _admitted(pipeline: _Pipeline):
+    out = []
+    while not pipeline.hydrate_q.empty():
+        job = pipeline.hydrate_q.get_nowait()
+        out.append((job.source, job.url.rsplit("/", 1)[-1]))
+    return out
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    monkeypatch.setattr(orchestrator, "MAX_JOBS_TOTAL", 4)
+    return _Pipeline("resume", RunProgress())
+
+
+def test_later_sources_wait_for_earlier_ones(pipeline):
+    # Source 1 (LinkedIn) answers first; its stubs are held until source 0 finishes.
+    assert pipeline._offer(1, _stub("LinkedIn", 0))
+    assert pipeline._offer(1, _stub("LinkedIn", 1))
+    pipeline._source_done(1)
+    assert _admitted(pipeline) == []
+
+    assert pipeline._offer(0, _stub("Indeed", 0))
+    assert _admitted(pipeline) == [("Indeed", "0")]
+    pipeline._source_done(0)
+
+    assert _admitted(pipeline) == [("LinkedIn", "0"), ("LinkedIn", "1")]
+
+
+def test_budget_goes_to_sources_in_order(pipeline):
+    for n in range(3):
+        pipeline._offer(1, _stub("LinkedIn", n))
+    for n in range(3):
+        assert pipeline._offer(0, _stub("Indeed", n))
+    pipeline._source_done(0)
+    pipeline._source_done(1)
+
+    # MAX_JOBS_TOTAL=4: all of Indeed, then LinkedIn's first stub only.
+    assert _admitted(pipeline) == [("Indeed", "0"), ("Indeed", "1"), ("Indeed", "2"), ("LinkedIn", "0")]
+    assert pipeline.admitted == 4
+    assert not pipeline._offer(2, _stub("BuiltIn", 0))
@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+
+import orchestrator
+from crawlers.base import BaseCrawler, JobListing
+from crawlers.query_planner import PlannedQuery, QueryPlanner, SingleFlight, request_key
+
+CATEGORIES = ["python developer", "senior python developer", "java developer", "backend developer"]
+
+
+class FakeCrawler(BaseCrawler):
+    source_name = "Fake"
+
+    def __init__(self, boolean_or=False, ignores_query=False):
+        self.boolean_or = boolean_or
+        self.ignores_query = ignores_query
+
+    def _page_request(self, query, page):
+        return "https://example.com/jobs", {"q": "jobs" if self.ignores_query else query, "p": page}
+
+    def _parse_page(self, html, query, url):
+        return []
+
+    def fetch_description(self, listing):
+        return ""
+
+
+def test_folds_narrower_categories_into_broader_ones():
+    plan = QueryPlanner(merge_max=1).plan(FakeCrawler(), CATEGORIES, per_category=5)
+
+    assert plan == [
+        PlannedQuery("python developer", ("python developer", "senior python developer"), 10),
+        PlannedQuery("java developer", ("java developer",), 5),
+        PlannedQuery("backend developer", ("backend developer",), 5),
+    ]
+
+
+def test_or_merges_queries_on_sites_with_boolean_search():
+    plan = QueryPlanner(merge_max=2).plan(FakeCrawler(boolean_or=True), CATEGORIES, per_category=5)
+
+    assert [(p.query, p.max_results) for p in plan] == [
+        ('"python developer" OR "java developer"', 15),
+        ("backend developer", 5),
+    ]
+
+
+def test_queries_with_the_same_first_page_are_collapsed():
+    plan = QueryPlanner(merge_max=1).plan(FakeCrawler(ignores_query=True), CATEGORIES, per_category=5)
+
+    assert len(plan) == 1
+    assert plan[0].categories == tuple(
+        ["python developer", "senior python developer", "java developer", "backend developer"]
+    )
+    assert request_key("https://x/jobs", {"b": 2, "a": 1}) == request_key("https://x/jobs", {"a": 1, "b": 2})
+
+
+def test_skips_a_query_that_keeps_finding_nothing_new():
+    planner = QueryPlanner(merge_max=1)
+    crawler = FakeCrawler()
+    java = planner.plan(crawler, CATEGORIES)[1]
+
+    for _ in range(3):
+        planner.searched("Fake", java)
+        planner.record("Fake", java, new_listings=0)
+
+    assert java not in planner.plan(crawler, CATEGORIES)
+    assert planner.stats()["skipped"] == 1
+
+
+def test_single_flight_joins_a_fetch_in_flight():
+    flights = SingleFlight(ttl=0)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "page"
+
+    results = []
+    owner = threading.Thread(target=lambda: results.append(flights.fetch("k", "Fake", fetch)))
+    owner.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(flights.fetch("k", "Fake", fetch)))
+    follower.start()
+    while flights.stats()["joined in flight"] == 0:
+        time.sleep(0.01)
+    release.set()
+    owner.join(5)
+    follower.join(5)
+
+    assert results == ["page", "page"]
+    assert len(calls) == 1
+    # ttl=0: nothing is memoized, so the next call fetches again.
+    assert flights.fetch("k", "Fake", fetch) == "page"
+    assert len(calls) == 2
+
+
+def test_single_flight_memoizes_for_the_ttl():
+    flights = SingleFlight(ttl=60)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return "page"
+
+    assert [flights.fetch("k", "Fake", fetch) for _ in range(3)] == ["page"] * 3
+    assert len(calls) == 1
+    assert flights.stats() == {"fetched": 1, "memo hits": 2, "joined in flight": 0}
+
+
+def test_async_single_flight_joins_concurrent_callers_and_shares_errors():
+    flights = SingleFlight(ttl=0)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "page"
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("blocked")
+
+    async def main():
+        pages = await asyncio.gather(*(flights.afetch("k", "Fake", fetch) for _ in range(5)))
+        errors = await asyncio.gather(
+            *(flights.afetch("e", "Fake", failing) for _ in range(3)), return_exceptions=True
+        )
+        return pages, errors
+
+    pages, errors = asyncio.run(main())
+
+    assert pages == ["page"] * 5
+    assert [str(e) for e in errors] == ["blocked"] * 3
+    assert len(calls) == 2
+    assert flights.stats()["joined in flight"] == 6
+
+
+def test_blocked_searches_do_not_count_toward_skipping(monkeypatch):
+    planner = QueryPlanner(merge_max=1)
+    monkeypatch.setattr(orchestrator, "QUERY_PLANNER", planner)
+    crawler = FakeCrawler()
+
+    def unavailable(query, max_results):
+        placeholder = JobListing("(Fake unavailable)", "", "blocked", "https://example.com", "Fake")
+        placeholder.placeholder = True
+        yield placeholder
+
+    monkeypatch.setattr(crawler, "search", unavailable)
+    plan = planner.plan(crawler)
+    for _ in range(3):
+        orchestrator._crawl_source(crawler, orchestrator.RunProgress())
+
+    assert planner.plan(crawler) == plan
+    assert planner.stats()["queries"] == 3 * len(plan)
+    assert planner.stats()["skipped"] == 0
@@ -0,0 +1,61 @@
+import pytest
+
+from crawlers import rate_limit
+from crawlers.rate_limit import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    return clock
+
+
+def test_bucket_waits_for_the_next_token(clock):
+    bucket = TokenBucket(rate=2.0, burst=1)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.5)
+    # A concurrent caller queues up behind the first waiter.
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_bucket_credits_idle_time_up_to_burst(clock):
+    bucket = TokenBucket(rate=1.0, burst=3)
+    for _ in range(3):
+        assert bucket.reserve() == 0.0
+
+    clock.now += 10  # refills to the burst size, not 10 tokens
+    for _ in range(3):
+        assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_zero_rate_never_waits(clock):
+    bucket = TokenBucket(rate=0, burst=1)
+
+    assert [bucket.reserve() for _ in range(5)] == [0.0] * 5
+
+
+def test_hosts_have_separate_buckets(clock, monkeypatch):
+    monkeypatch.setattr(rate_limit, "CRAWL_RATE", 1.0)
+    monkeypatch.setattr(rate_limit, "CRAWL_BURST", 1)
+    monkeypatch.setattr(rate_limit.time, "sleep", lambda seconds: None)
+    limiter = RateLimiter()
+
+    assert limiter.acquire("www.indeed.com") == 0.0
+    assert limiter.acquire("www.indeed.com") == pytest.approx(1.0)
+    # A throttled host does not slow down another one.
+    assert limiter.acquire("builtin.com") == 0.0
+
+    stats = limiter.stats()
+    assert stats["www.indeed.com"] == {"requests": 2, "waits": 1, "wait_seconds": pytest.approx(1.0)}
+    assert stats["builtin.com"] == {"requests": 1, "waits": 0, "wait_seconds": 0.0}
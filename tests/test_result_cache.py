@@ -0,0 +1,54 @@
+import pytest
+
+import result_cache
+from jobscan_client import JobScanResult
+from result_cache import ResultCache, result_key
+
+RESUME = "Senior Python engineer. AWS, Docker, PostgreSQL."
+JOB = "Backend engineer: Python services on AWS."
+
+
+def _result(score: int) -> JobScanResult:
+    return JobScanResult(match_score=score, summary=f"Match score: {score}%", details="", success=True)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(result_cache.time, "time", lambda: now[0])
+    return now
+
+
+def test_key_depends_on_resume_but_not_on_whitespace_or_case():
+    key = result_key("local/2", RESUME, JOB)
+
+    assert result_key("local/2", "  senior python ENGINEER.\nAWS,  docker, postgresql. ", JOB) == key
+    assert result_key("local/2", RESUME + " Kubernetes.", JOB) != key
+    assert result_key("jobscan", RESUME, JOB) != key
+
+
+def test_entries_expire_after_the_ttl(tmp_path, clock):
+    cache = ResultCache(str(tmp_path / "results.sqlite3"), ttl=60, max_entries=10)
+    cache.put("k", _result(70))
+
+    clock[0] += 59
+    assert cache.get("k") == _result(70)
+    clock[0] += 1
+    assert cache.get("k") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "stored": 1}
+
+
+def test_keeps_only_the_most_recently_used_entries(tmp_path, clock):
+    cache = ResultCache(str(tmp_path / "results.sqlite3"), ttl=3600, max_entries=2)
+    cache.put("a", _result(1))
+    clock[0] += 1
+    cache.put("b", _result(2))
+    clock[0] += 1
+    cache.get("a")  # "b" is now the least recently used
+    clock[0] += 1
+
+    cache.put("c", _result(3))
+
+    assert cache.get("b") is None
+    assert cache.get("a") == _result(1)
+    assert cache.get("c") == _result(3)
@@ -0,0 +1,27 @@
+import threading
+
+from run_queue import RunQueue
+
+
+def test_run_cancelled_while_queued_never_starts():
+    queue = RunQueue(concurrency=1, max_queued=5, history=10)
+    release = threading.Event()
+    started = []
+
+    def job(name):
+        def run(progress):
+            started.append(name)
+            release.wait(5)
+            return f"<p>{name}</p>"
+
+        return run
+
+    first = queue.submit(job("first"))
+    second = queue.submit(job("second"))
+    assert queue.cancel(second.id).status == "cancelled"
+    release.set()
+    queue._executor.shutdown(wait=True)
+
+    assert started == ["first"]
+    assert first.status == "done" and first.report_html == "<p>first</p>"
+    assert second.status == "cancelled" and second.started_at is None